@@ -15,11 +15,11 @@ check_file "crawling.py"
 check_file "main.py"
 
 # Run crawling.py
-python3 crawling.py
+python3 main.py crawl
 status=$?
 if [ $status -eq 0 ]; then
     echo "Crawling completed successfully. Starting main.py..."
-    python3 main.py
+    python3 main.py all
 else
     echo "Crawling failed (exit code: $status). Exiting."
     exit $status
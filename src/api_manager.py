@@ -3,9 +3,11 @@ import random
 import dc_api
 from openai import AsyncOpenAI
 import torch
-from transformers import AutoTokenizer, AutoModelForCausalLM
 import asyncio
 
+from config import LLM_QUANTIZATION
+from model_registry import load_causal_lm
+
 class DcApiManager:
     def __init__(self, board_id, username, password):
         """
@@ -148,16 +150,13 @@ class llamaManager:
         """
         self.model_name = model_name
         self.generation_config = generation_config or {}
-        # 로컬 llama 모델 로드
-        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-        self.tokenizer.pad_token = self.tokenizer.eos_token
-        self.model = AutoModelForCausalLM.from_pretrained(
+        # 로컬 llama 모델 로드 (LLM_QUANTIZATION=int8 이면 CPU 에서 int8 로 양자화)
+        self.tokenizer, self.model = load_causal_lm(
             self.model_name,
-            torch_dtype=torch.bfloat16 if torch.cuda.is_available() else torch.float32,
-            device_map="auto"
+            torch.bfloat16 if torch.cuda.is_available() else torch.float32,
+            LLM_QUANTIZATION,
         )
-        self.model.config.pad_token_id = self.tokenizer.pad_token_id
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.device = self.model.device
 
     async def generate_content(self, prompt: str) -> str:
         """
@@ -0,0 +1,126 @@
+import torch
+
+from config import SUBJECT_DRAFT_MODEL
+
+# 보조 디코딩 방식
+#   prompt-lookup: 프롬프트에 이미 나온 n-gram 을 후보로 제안 (추가 모델 없음)
+#   draft: 같은 토크나이저를 쓰는 작은 모델이 후보를 제안
+ASSIST_MODES = ["prompt-lookup", "draft"]
+# prompt-lookup 이 한 번에 제안할 최대 토큰 수
+PROMPT_LOOKUP_TOKENS = 10
+
+
+def load_draft_model():
+    from transformers import AutoModelForCausalLM
+    model = AutoModelForCausalLM.from_pretrained(SUBJECT_DRAFT_MODEL, torch_dtype=torch.bfloat16, device_map="auto")
+    model.generation_config.pad_token_id = model.generation_config.eos_token_id
+    return model
+
+
+def assist_kwargs(mode: str) -> dict:
+    """
+    보조 디코딩 방식에 맞는 generate 인자를 반환합니다.
+
+    transformers 의 보조 디코딩은 배치 크기 1 만 지원하므로 호출하는 쪽에서 한 프롬프트씩 생성해야 합니다.
+
+    :param mode: ASSIST_MODES 중 하나 (None 이면 빈 딕셔너리)
+    :return: generate 에 넘길 인자 딕셔너리
+    """
+    if mode is None:
+        return {}
+    if mode == "prompt-lookup":
+        return {"prompt_lookup_num_tokens": PROMPT_LOOKUP_TOKENS}
+    if mode == "draft":
+        from model_registry import registry
+        return {"assistant_model": registry.get("llama-draft")}
+    raise ValueError(f"Unknown assist mode: {mode} (choose from {', '.join(ASSIST_MODES)})")
+
+
+class ForwardCounter:
+    def __init__(self, *models):
+        """
+        모델의 forward 호출 횟수를 셉니다. with 블록 안에서만 훅이 등록됩니다.
+
+        생성 토큰 수와 본 모델 forward 수의 차이가 수락된 후보 토큰 수입니다.
+        prompt-lookup 은 후보를 제안하는 모델이 없으므로 with 블록 동안 후보 생성기를 감싸 제안된 토큰 수(proposed)를 셉니다.
+
+        :param models: 호출 횟수를 셀 모델들 (None 은 무시)
+        """
+        self.models = [m for m in models if m is not None]
+        self.counts = [0] * len(self.models)
+        self.proposed = 0
+        self._handles = []
+        self._lookup_cls = None
+
+    def __enter__(self):
+        for i, model in enumerate(self.models):
+            self._handles.append(model.register_forward_hook(self._hook(i)))
+        from transformers.generation.candidate_generator import PromptLookupCandidateGenerator
+        original = PromptLookupCandidateGenerator.get_candidates
+
+        def get_candidates(generator, input_ids, **kwargs):
+            candidates, logits = original(generator, input_ids, **kwargs)
+            self.proposed += candidates.shape[-1] - input_ids.shape[-1]
+            return candidates, logits
+
+        self._lookup_cls, self._lookup_original = PromptLookupCandidateGenerator, original
+        PromptLookupCandidateGenerator.get_candidates = get_candidates
+        return self
+
+    def __exit__(self, *exc):
+        for handle in self._handles:
+            handle.remove()
+        self._handles = []
+        if self._lookup_cls is not None:
+            self._lookup_cls.get_candidates = self._lookup_original
+            self._lookup_cls = None
+
+    def _hook(self, i: int):
+        def hook(module, args, output):
+            self.counts[i] += 1
+        return hook
+
+
+class AssistStats:
+    def __init__(self, mode: str):
+        """
+        보조 디코딩 통계를 누적합니다.
+
+        :param mode: 보조 디코딩 방식 (None 이면 일반 디코딩)
+        """
+        self.mode = mode
+        self.tokens = 0
+        self.target_forwards = 0
+        self.draft_forwards = 0
+        self.proposed = 0
+        self.seconds = 0.0
+
+    def add(self, new_tokens: int, counter: ForwardCounter, seconds: float) -> None:
+        """
+        generate 한 번의 결과를 더합니다.
+
+        :param new_tokens: 생성된 토큰 수
+        :param counter: generate 동안 사용한 ForwardCounter (본 모델, [보조 모델] 순서)
+        :param seconds: 걸린 시간
+        """
+        self.tokens += new_tokens
+        self.target_forwards += counter.counts[0]
+        self.draft_forwards += sum(counter.counts[1:])
+        self.proposed += counter.proposed
+        self.seconds += seconds
+
+    def report(self) -> str:
+        speed = self.tokens / self.seconds if self.seconds else 0.0
+        text = f"{self.mode or 'baseline'}: {self.tokens} tokens in {self.seconds:.1f}s ({speed:.1f} tokens/s)"
+        if self.mode is None or not self.target_forwards:
+            return text
+        # 보조 디코딩은 본 모델 forward 한 번마다 "수락된 후보 + 1" 개의 토큰을 확정합니다.
+        accepted = max(self.tokens - self.target_forwards, 0)
+        text += f", {self.tokens / self.target_forwards:.2f} tokens per target forward, {accepted} draft tokens accepted"
+        if self.proposed:
+            # prompt-lookup: 후보 생성기가 제안한 토큰 수 대비
+            text += f" of {self.proposed} proposed ({min(accepted / self.proposed, 1.0):.1%} acceptance)"
+        elif self.draft_forwards:
+            # 보조 모델 forward 한 번이 후보 토큰 하나를 제안합니다.
+            text += f" ({accepted / self.draft_forwards:.1%} acceptance)"
+        return text
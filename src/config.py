@@ -49,3 +49,47 @@ DEFAULT_BOT_SETTINGS = {
     'password': _get_env('BOT_PASSWORD'),
     'persona': _get_env('BOT_PERSONA')
 }
+
+# 감정 분류 캐시 설정
+EMOTION_CACHE_PATH = _get_env('EMOTION_CACHE_PATH', os.path.join(os.path.dirname(__file__), 'resource', 'cache', 'emotions.db'))
+EMOTION_CACHE_MAX_ENTRIES = int(_get_env('EMOTION_CACHE_MAX_ENTRIES', '2000000'))
+
+# 감정 분류 백엔드 설정 (torch, torch-int8, onnx)
+EMOTION_BACKEND = _get_env('EMOTION_BACKEND', 'torch')
+# 변환/양자화한 모델 파일을 저장할 디렉토리
+MODEL_CACHE_DIR = _get_env('MODEL_CACHE_DIR', os.path.join(os.path.dirname(__file__), 'resource', 'cache', 'models'))
+# 코퍼스 토큰화 결과(메모리 맵)를 저장할 디렉토리
+TOKEN_CACHE_DIR = _get_env('TOKEN_CACHE_DIR', os.path.join(os.path.dirname(__file__), 'resource', 'cache', 'tokens'))
+
+# 주제 분리 프롬프트 한 개에 쓸 최대 토큰 수 (지시문 포함, 생성 토큰 제외)
+SUBJECT_PROMPT_TOKENS = int(_get_env('SUBJECT_PROMPT_TOKENS', '3072'))
+# 주제 분리 시 generate 한 번에 함께 처리할 프롬프트 수
+SUBJECT_GEN_BATCH_SIZE = int(_get_env('SUBJECT_GEN_BATCH_SIZE', '4'))
+# 주제 추출에 실패한 게시글을 더 작은 묶음으로 다시 시도할 횟수
+SUBJECT_MAX_RETRIES = int(_get_env('SUBJECT_MAX_RETRIES', '2'))
+# subjects --mode embed 에서 사용할 한국어 문장 인코더
+SUBJECT_EMBED_MODEL = _get_env('SUBJECT_EMBED_MODEL', 'jhgan/ko-sroberta-multitask')
+# 주제 분리 묶음별 결과 캐시 (중단 후 재실행 시 끝난 묶음은 건너뜀)
+SUBJECT_CACHE_PATH = _get_env('SUBJECT_CACHE_PATH', os.path.join(os.path.dirname(__file__), 'resource', 'cache', 'subjects.db'))
+# subjects --assist draft 에서 사용할 초안 모델 (Llama 3.2 와 같은 토크나이저를 써야 함)
+SUBJECT_DRAFT_MODEL = _get_env('SUBJECT_DRAFT_MODEL', 'meta-llama/Llama-3.2-1B-Instruct')
+# 로컬 Llama 가중치 양자화 (none, int8: CPU 전용 int8 동적 양자화)
+LLM_QUANTIZATION = _get_env('LLM_QUANTIZATION', 'none')
+
+# 크롤링 백엔드 (http: aiohttp, dc_api: dc_api 모바일 API, selenium: Firefox WebDriver)
+CRAWL_BACKEND = _get_env('CRAWL_BACKEND', 'http')
+# 크롤링 시 동시에 진행할 최대 요청 수
+CRAWL_CONCURRENCY = int(_get_env('CRAWL_CONCURRENCY', '4'))
+# 크롤링 시 호스트별 초당 최대 요청 수 (사이트 부하 제한)
+CRAWL_RATE_PER_HOST = float(_get_env('CRAWL_RATE_PER_HOST', '2'))
+# 크롤링 요청 하나의 제한 시간(초)
+CRAWL_TIMEOUT = float(_get_env('CRAWL_TIMEOUT', '20'))
+# 크롤링 시 HTML 을 파싱할 프로세스 수
+CRAWL_PARSE_WORKERS = int(_get_env('CRAWL_PARSE_WORKERS', '2'))
+# 파싱을 기다리는 응답 큐 크기 (가득 차면 요청을 멈춤)
+CRAWL_QUEUE_SIZE = int(_get_env('CRAWL_QUEUE_SIZE', '32'))
+# 수집한 게시글 색인과 크롤링 커서 (중단 후 재실행 시 이어서 수집)
+CRAWL_STATE_PATH = _get_env('CRAWL_STATE_PATH', os.path.join(os.path.dirname(__file__), 'resource', 'cache', 'crawl.db'))
+# 크롤러가 받은 원본 응답을 압축 저장할 캐시 (crawl --replay 로 네트워크 없이 재실행)
+CRAWL_CACHE_DIR = _get_env('CRAWL_CACHE_DIR', os.path.join(os.path.dirname(__file__), 'resource', 'cache', 'http'))
+CRAWL_CACHE_ENABLED = _get_env('CRAWL_CACHE_ENABLED', 'True') == 'True'
@@ -0,0 +1,95 @@
+import os
+import pandas as pd
+
+# CSV 컬럼 타입을 명시하여 pandas 의 타입 추론 비용과 NaN 변환을 피합니다.
+CONTENTS_DTYPES = {"id": "int64", "title": str, "contents": str, "date": str}
+REPLY_DTYPES = {"id": "int64", "reply_id": str, "reply_content": str, "reply_date": str}
+
+
+class Corpus:
+    def __init__(self, contents_df: pd.DataFrame, replies_df: pd.DataFrame):
+        """
+        게시글/댓글 코퍼스를 초기화합니다.
+
+        댓글은 게시글 ID 별 행 인덱스 배열로 한 번만 묶어두므로,
+        게시글마다 reply.csv 전체를 다시 훑지 않습니다.
+
+        :param contents_df: contents.csv 데이터프레임
+        :param replies_df: reply.csv 데이터프레임
+        """
+        self.contents_df = contents_df.reset_index(drop=True)
+        self.replies_df = replies_df.reset_index(drop=True)
+        self.reply_index = self.replies_df.groupby("id", sort=False).indices
+
+    def __len__(self) -> int:
+        return len(self.contents_df)
+
+    def reply_rows(self, post_id):
+        """
+        게시글에 달린 댓글의 행 인덱스 배열을 반환합니다.
+
+        :param post_id: 게시글 ID
+        :return: replies_df 의 행 인덱스 배열 (댓글이 없으면 빈 리스트)
+        """
+        return self.reply_index.get(post_id, [])
+
+    def replies_of(self, post_id) -> list:
+        """
+        게시글에 달린 댓글 내용 목록을 반환합니다.
+
+        :param post_id: 게시글 ID
+        :return: 댓글 내용 목록 (reply.csv 순서)
+        """
+        rows = self.reply_rows(post_id)
+        if len(rows) == 0:
+            return []
+        return self.replies_df["reply_content"].to_numpy()[rows].tolist()
+
+    def iter_post_rows(self):
+        """
+        게시글 행과 해당 댓글 행 인덱스를 순회합니다.
+
+        :return: (게시글 행, post_id, 댓글 행 인덱스 배열) 튜플 제너레이터
+        """
+        for i, pid in enumerate(self.contents_df["id"].to_numpy()):
+            pid = int(pid)
+            yield i, pid, self.reply_index.get(pid, [])
+
+    def iter_posts(self, start: int = 0, stop: int = None):
+        """
+        게시글과 해당 댓글 목록을 순회합니다.
+
+        :param start: 시작 행
+        :param stop: 끝 행 (미포함, None 이면 끝까지)
+        :return: (post_id, 게시글 내용, 댓글 내용 목록) 튜플 제너레이터
+        """
+        reply_contents = self.replies_df["reply_content"].to_numpy()
+        ids = self.contents_df["id"].to_numpy()
+        contents = self.contents_df["contents"].to_numpy()
+        stop = len(ids) if stop is None else min(stop, len(ids))
+        for i in range(start, stop):
+            pid = int(ids[i])
+            rows = self.reply_index.get(pid)
+            replies = reply_contents[rows].tolist() if rows is not None else []
+            yield pid, contents[i], replies
+
+
+def load_corpus(base: str = None, contents_path: str = None, reply_path: str = None) -> Corpus:
+    """
+    contents.csv 와 reply.csv 를 한 번만 읽어 코퍼스를 만듭니다.
+
+    :param base: resource 디렉토리를 포함한 기준 경로 (기본값: src 디렉토리)
+    :param contents_path: 게시글 CSV 경로 (기본값: <base>/resource/contents.csv)
+    :param reply_path: 댓글 CSV 경로 (기본값: <base>/resource/reply.csv)
+    :return: Corpus 객체
+    """
+    base = base or os.path.dirname(__file__)
+    contents_df = pd.read_csv(
+        contents_path or os.path.join(base, "resource/contents.csv"),
+        encoding="utf8", dtype=CONTENTS_DTYPES, keep_default_na=False,
+    )
+    replies_df = pd.read_csv(
+        reply_path or os.path.join(base, "resource/reply.csv"),
+        encoding="utf8", dtype=REPLY_DTYPES, keep_default_na=False,
+    )
+    return Corpus(contents_df, replies_df)
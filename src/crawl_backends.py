@@ -0,0 +1,369 @@
+import os
+import time
+import asyncio
+import logging
+from urllib.parse import urlsplit
+
+from crawl_parser import ListRow, Article, RawPage, find_comment_token, has_rendered_comments
+
+#기본 URL
+BASE = "https://gall.dcinside.com"
+COMMENT_URL = BASE + "/board/comment/"
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64; rv:127.0) Gecko/20100101 Firefox/127.0"
+
+# 크롤링 백엔드
+#   http: aiohttp 로 데스크톱 페이지를 직접 요청 (댓글은 댓글 API 로 요청)
+#   dc_api: dc_api 라이브러리의 board()/document()/comments() (모바일 페이지)
+#   selenium: Firefox WebDriver (스크립트 실행이 필요할 때의 대안, 요청 하나씩 처리)
+CRAWL_BACKENDS = ["http", "dc_api", "selenium"]
+# 일시적 오류(429, 5xx, 연결 오류) 재시도 횟수
+MAX_ATTEMPTS = 3
+# dc_api 백엔드에서 목록 한 페이지로 묶을 게시글 수
+DC_API_PAGE_SIZE = 50
+# selenium 백엔드에서 페이지 로드 후 스크립트(댓글 등)가 끝나기를 기다리는 시간(초)
+SELENIUM_SETTLE_SECONDS = 3
+
+
+class HostRateLimiter:
+    def __init__(self, rate: float, clock=time.monotonic):
+        """
+        호스트별로 요청 간격을 1 / rate 초 이상으로 유지합니다.
+
+        요청마다 다음 시작 시각을 미리 예약하므로 대기하는 동안 잠금을 잡고 있지 않습니다.
+
+        :param rate: 호스트별 초당 최대 요청 수 (0 이하이면 제한 없음)
+        :param clock: 현재 시각 함수 (테스트용)
+        """
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.clock = clock
+        self._next = {}
+
+    def reserve(self, url: str) -> float:
+        """
+        요청 시각을 예약하고 기다려야 할 시간을 반환합니다.
+
+        :param url: 요청 URL (호스트 단위로 제한)
+        :return: 대기 시간(초)
+        """
+        if not self.interval:
+            return 0.0
+        host = urlsplit(url).netloc
+        now = self.clock()
+        at = max(now, self._next.get(host, now))
+        self._next[host] = at + self.interval
+        return at - now
+
+    async def wait(self, url: str) -> None:
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class HtmlBackend:
+    """
+    데스크톱 페이지 HTML 을 가져오는 백엔드의 공통 부분입니다. 하위 클래스는 _fetch 를 구현합니다.
+
+    백엔드는 파싱하지 않고 RawPage 를 반환하며, 파싱은 crawl_parser.parse_raw 가 파서 프로세스에서 합니다.
+    cache 가 있으면 받은 응답을 모두 저장하므로 나중에 ReplayBackend 로 네트워크 없이 다시 실행할 수 있습니다.
+    """
+    name = "html"
+    # 댓글 API (POST) 를 요청할 수 있는지 여부
+    supports_post = False
+
+    def __init__(self, cache=None):
+        self.requests = 0
+        self.cache = cache
+
+    async def fetch(self, url: str, data: dict = None, wait_class: str = None) -> str:
+        body = await self._fetch(url, data, wait_class)
+        if self.cache is not None:
+            self.cache.put(url, data, body)
+        return body
+
+    async def _fetch(self, url: str, data: dict = None, wait_class: str = None) -> str:
+        raise NotImplementedError
+
+    def list_url(self, board_id: str, page: int) -> str:
+        return BASE + f'/board/lists/?id={board_id}&page={page}'
+
+    async def fetch_list(self, board_id: str, page: int) -> RawPage:
+        return RawPage("list", None, await self.fetch(self.list_url(board_id, page)), None)
+
+    async def fetch_article(self, board_id: str, row: ListRow) -> RawPage:
+        html = await self.fetch(BASE + row.href, wait_class="write_div")
+        # 데스크톱 게시글 페이지의 댓글은 스크립트가 채우므로, 렌더링되지 않았으면 댓글 API 응답을 함께 가져옵니다.
+        token = find_comment_token(html)
+        if not self.supports_post or has_rendered_comments(html) or token is None:
+            return RawPage("article", row.gall_id, html, None)
+        data = {"id": board_id, "no": row.gall_id, "cmt_id": board_id, "cmt_no": row.gall_id,
+                "e_s_n_o": token, "comment_page": "1", "sort": "", "_GALLTYPE_": "G"}
+        return RawPage("article", row.gall_id, html, await self.fetch(COMMENT_URL, data=data))
+
+    async def close(self) -> None:
+        pass
+
+    def report(self) -> str:
+        text = f"{self.name}: {self.requests} requests"
+        if self.cache is not None:
+            text += f", response cache {self.cache.report()}"
+        return text
+
+
+class HttpBackend(HtmlBackend):
+    name = "http"
+    supports_post = True
+
+    def __init__(self, concurrency: int, rate: float, timeout: float, cache=None):
+        """
+        aiohttp 로 페이지를 요청합니다.
+
+        :param concurrency: 동시에 진행할 최대 요청 수
+        :param rate: 호스트별 초당 최대 요청 수
+        :param timeout: 요청 하나의 제한 시간(초)
+        :param cache: 응답을 저장할 response_cache.ResponseCache (선택적)
+        """
+        super().__init__(cache)
+        import aiohttp
+        self._aiohttp = aiohttp
+        self.semaphore = asyncio.Semaphore(max(1, concurrency))
+        self.limiter = HostRateLimiter(rate)
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session = None
+
+    def _get_session(self):
+        if self._session is None:
+            self._session = self._aiohttp.ClientSession(headers={"User-Agent": USER_AGENT}, timeout=self.timeout)
+        return self._session
+
+    async def _fetch(self, url: str, data: dict = None, wait_class: str = None) -> str:
+        """
+        페이지를 요청합니다. data 가 있으면 form POST 로 요청합니다.
+
+        429/5xx 와 연결 오류는 지수 백오프로 MAX_ATTEMPTS 번까지 재시도합니다.
+        """
+        aiohttp = self._aiohttp
+        headers = {"X-Requested-With": "XMLHttpRequest", "Referer": BASE} if data is not None else None
+        async with self.semaphore:
+            for attempt in range(MAX_ATTEMPTS):
+                await self.limiter.wait(url)
+                try:
+                    method = self._get_session().post if data is not None else self._get_session().get
+                    async with method(url, data=data, headers=headers) as resp:
+                        self.requests += 1
+                        resp.raise_for_status()
+                        return await resp.text()
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    retryable = not isinstance(e, aiohttp.ClientResponseError) or e.status == 429 or e.status >= 500
+                    if not retryable or attempt + 1 == MAX_ATTEMPTS:
+                        raise
+                    logging.warning(f"요청 실패, 재시도합니다 ({attempt + 1}/{MAX_ATTEMPTS}): {url} → {e}")
+                    await asyncio.sleep(2 ** attempt)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+def create_driver():
+    """
+    Firefox WebDriver 를 생성합니다.
+
+    :return: (driver, service, options) 튜플
+    """
+    from selenium import webdriver
+    from selenium.webdriver.firefox.options import Options
+    from selenium.webdriver.firefox.service import Service
+    from webdriver_manager.firefox import GeckoDriverManager
+
+    # 로그 설정
+    os.environ["MOZ_LOG"] = "socket,nsHttp:5"  # 로그을 콘솔에 출력하도록 설정
+    # MOZ_LOG_FILE 환경 변수를 제거하여 로그 파일 생성을 중지합니다.
+    os.environ.pop("MOZ_LOG_FILE", None)  # 로그 파일 생성을 중지
+
+    # 현재 설치된 브라우저 버전에 맞는 드라이버 버전 지정
+    ser = Service(GeckoDriverManager().install())
+    options = Options()
+    # 필요에 따라 headless 모드나 다른 옵션을 추가할 수 있습니다.
+    # options.add_argument("--headless")
+    options.binary_location = '/usr/bin/firefox'
+    driver = webdriver.Firefox(service=ser, options=options)
+    return driver, ser, options
+
+
+class SeleniumBackend(HtmlBackend):
+    name = "selenium"
+
+    def __init__(self, rate: float, timeout: float, cache=None):
+        """
+        Firefox WebDriver 하나로 페이지를 차례로 엽니다. 댓글까지 스크립트로 렌더링된 HTML 을 얻습니다.
+
+        :param rate: 초당 최대 페이지 로드 수
+        :param timeout: 요소가 나타날 때까지 기다릴 최대 시간(초)
+        :param cache: 응답을 저장할 response_cache.ResponseCache (선택적)
+        """
+        super().__init__(cache)
+        self.limiter = HostRateLimiter(rate)
+        self.timeout = timeout
+        self.driver = None
+        self._lock = asyncio.Lock()
+
+    def _driver_alive(self) -> bool:
+        """
+        드라이버 세션이 아직 응답하는지 확인합니다.
+
+        :return: 세션이 살아 있으면 True
+        """
+        from selenium.common.exceptions import WebDriverException
+        try:
+            self.driver.current_url
+            return True
+        except (WebDriverException, OSError):
+            # 세션이 없어졌거나(InvalidSessionIdException) 브라우저 프로세스가 죽어 연결 자체가 실패한 경우
+            return False
+
+    def _get(self, url: str, wait_class: str) -> str:
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
+        if self.driver is None:
+            self.driver, _, _ = create_driver()
+        try:
+            self.driver.get(url)
+            time.sleep(SELENIUM_SETTLE_SECONDS)
+            if wait_class:
+                WebDriverWait(self.driver, self.timeout).until(
+                    EC.presence_of_element_located((By.CLASS_NAME, wait_class))
+                )
+            return self.driver.page_source
+        except TimeoutException:
+            # 페이지 로드/요소 대기 시간 초과는 일반적인 요청 실패입니다. 드라이버는 그대로 씁니다.
+            raise
+        except WebDriverException:
+            # 세션이 죽은 경우에만 다음 요청에서 드라이버를 새로 만듭니다.
+            if not self._driver_alive():
+                print(f"[WARNING] Selenium session died while loading {url}, restarting driver")
+                try:
+                    self.driver.quit()
+                except Exception:
+                    pass
+                self.driver = None
+            raise
+
+    async def _fetch(self, url: str, data: dict = None, wait_class: str = None) -> str:
+        if data is not None:
+            raise ValueError("selenium backend does not support POST requests")
+        async with self._lock:
+            await self.limiter.wait(url)
+            self.requests += 1
+            return await asyncio.to_thread(self._get, url, wait_class)
+
+    async def close(self) -> None:
+        if self.driver is not None:
+            await asyncio.to_thread(self.driver.quit)
+            self.driver = None
+
+
+class ReplayBackend(HtmlBackend):
+    name = "replay"
+    supports_post = True
+    # 캐시에 없는 응답은 다시 요청해도 없으므로 목록 페이지를 재시도하지 않습니다.
+    list_retries = 0
+
+    def __init__(self, cache):
+        """
+        응답 캐시에 저장된 페이지만으로 크롤링을 다시 실행합니다. 네트워크 요청은 하지 않습니다.
+
+        요청마다 가장 최근에 저장된 응답을 사용하므로 파서 변경 확인이나 벤치마크를 같은 입력으로 반복할 수 있습니다.
+
+        :param cache: response_cache.ResponseCache
+        """
+        super().__init__(cache)
+
+    async def fetch(self, url: str, data: dict = None, wait_class: str = None) -> str:
+        body = self.cache.get(url, data)
+        if body is None:
+            raise KeyError(f"not in response cache: {url}")
+        self.requests += 1
+        return body
+
+    def report(self) -> str:
+        return f"{self.name}: {self.requests} cached responses ({self.cache.report()})"
+
+
+class DcApiBackend:
+    name = "dc_api"
+
+    def __init__(self, concurrency: int, rate: float, page_size: int = DC_API_PAGE_SIZE):
+        """
+        dc_api 의 비동기 board()/document()/comments() 로 게시글을 수집합니다.
+
+        dc_api 목록은 페이지 번호 대신 최신 글부터 이어지는 반복자이므로,
+        읽은 목록을 page_size 개씩 묶어 데스크톱 목록 페이지처럼 다룹니다.
+
+        :param concurrency: 동시에 조회할 최대 게시글 수
+        :param rate: 초당 최대 게시글 조회 수
+        :param page_size: 목록 한 페이지로 묶을 게시글 수
+        """
+        import dc_api
+        self.api = dc_api.API()
+        self.semaphore = asyncio.Semaphore(max(1, concurrency))
+        self.limiter = HostRateLimiter(rate)
+        self.page_size = page_size
+        self.requests = 0
+        self._rows = []
+        self._board = None
+        self._exhausted = False
+
+    async def fetch_list(self, board_id: str, page: int) -> RawPage:
+        if self._board is None:
+            self._board = self.api.board(board_id=board_id, num=-1).__aiter__()
+        while not self._exhausted and len(self._rows) < page * self.page_size:
+            try:
+                index = await self._board.__anext__()
+            except StopAsyncIteration:
+                self._exhausted = True
+                break
+            # 데스크톱 목록과 같은 형식의 날짜 (YY.MM.DD)
+            self._rows.append(ListRow(str(index.id), index.title, index.time.strftime("%y.%m.%d"), None))
+        return RawPage("parsed", None, None, self._rows[(page - 1) * self.page_size:page * self.page_size])
+
+    async def fetch_article(self, board_id: str, row: ListRow) -> RawPage:
+        async with self.semaphore:
+            await self.limiter.wait("dc_api")
+            self.requests += 1
+            doc = await self.api.document(board_id=board_id, document_id=row.gall_id)
+            if doc is None:
+                raise ValueError(f"document {row.gall_id} not found")
+            replies = [(comm.author, comm.contents, comm.time.strftime("%m.%d %H:%M:%S"))
+                       async for comm in self.api.comments(board_id=board_id, document_id=row.gall_id, num=-1)]
+        return RawPage("parsed", row.gall_id, None, Article(doc.contents, replies))
+
+    async def close(self) -> None:
+        await self.api.close()
+
+    def report(self) -> str:
+        return f"{self.name}: {self.requests} documents"
+
+
+def load_crawl_backend(name: str, concurrency: int, rate: float, timeout: float, cache=None):
+    """
+    크롤링 백엔드를 생성합니다.
+
+    :param name: CRAWL_BACKENDS 중 하나 또는 "replay" (cache 에서 재실행)
+    :param concurrency: 동시에 진행할 최대 요청 수 (selenium 은 항상 1)
+    :param rate: 호스트별 초당 최대 요청 수
+    :param timeout: 요청 제한 시간(초)
+    :param cache: 응답 캐시 (http, selenium 은 받은 응답을 저장, dc_api 는 HTML 이 없으므로 사용하지 않음)
+    """
+    if name == "replay":
+        return ReplayBackend(cache)
+    if name == "http":
+        return HttpBackend(concurrency, rate, timeout, cache)
+    if name == "dc_api":
+        return DcApiBackend(concurrency, rate)
+    if name == "selenium":
+        return SeleniumBackend(rate, timeout, cache)
+    raise ValueError(f"Unknown crawl backend: {name} (choose from {', '.join(CRAWL_BACKENDS)})")
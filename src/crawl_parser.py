@@ -0,0 +1,148 @@
+import re
+import html as html_lib
+import json
+from collections import namedtuple
+from lxml import html as lxml_html
+
+# 목록 페이지의 게시글 한 줄 (date 는 gall_date 셀의 날짜, 예: "25.06.13", "06.13")
+ListRow = namedtuple("ListRow", ["gall_id", "title", "date", "href"])
+# 게시글 본문과 댓글 목록 (댓글은 (작성자, 내용, 작성일) 튜플)
+Article = namedtuple("Article", ["contents", "replies"])
+# 백엔드가 가져온 파싱 전 응답
+#   kind: "list" (목록 HTML), "article" (게시글 HTML, extra 는 댓글 API 응답 또는 None),
+#         "parsed" (dc_api 처럼 이미 구조화된 결과, extra 가 결과)
+RawPage = namedtuple("RawPage", ["kind", "gall_id", "html", "extra"])
+
+# 사용자들이 쓴 글이 목적이므로 광고/설문/공지 줄은 제외합니다.
+NOTICE_IDS = {"설문", "AD", "공지"}
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_COMMENT_TOKEN_RE = re.compile(r'id="e_s_n_o"[^>]*?value="([^"]*)"')
+_FULL_DATE_RE = re.compile(r"^\d{2}(\d{2})-(\d{2})-(\d{2})")
+
+
+def _has_class(name: str) -> str:
+    # class 속성에 name 이 단어로 포함되어 있는지 검사하는 XPath 조건 (CSS 의 .name 과 같음)
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def _first(node, xpath: str):
+    found = node.xpath(xpath)
+    return found[0] if found else None
+
+
+def _row_date(cell) -> str:
+    # 오늘 글은 "11:45" 처럼 시각만 표시되므로 title 속성(2025-06-13 11:45:16)의 날짜를 사용합니다.
+    # 그래야 저장된 응답을 다른 날 재실행해도 같은 결과가 나옵니다.
+    text = cell.text_content().strip()
+    match = _FULL_DATE_RE.match(cell.get("title") or "")
+    if ":" in text and match:
+        return ".".join(match.groups())
+    return text
+
+
+def parse_list_page(html: str) -> list:
+    """
+    갤러리 목록 페이지에서 게시글 줄을 추출합니다.
+
+    :param html: 목록 페이지 HTML
+    :return: ListRow 목록 (페이지 순서, 광고/설문/공지 제외)
+    """
+    if not html or not html.strip():
+        return []
+    # 게시글 목록을 담고 있는 tbody.listwrap2 내부의 tr 태그를 모두 선택
+    body = _first(lxml_html.fromstring(html), f"//tbody[{_has_class('listwrap2')}]")
+    if body is None:
+        return []
+    rows = []
+    for article in body.iter("tr"):
+        num = _first(article, f".//td[{_has_class('gall_num')}]")
+        date = _first(article, f".//td[{_has_class('gall_date')}]")
+        # 제목과 종류 추출 (gall_tit 셀 안의 첫 번째 <a>)
+        subj_cell = _first(article, f".//td[{_has_class('gall_tit')} and {_has_class('ub-word')}]")
+        if num is None or date is None or subj_cell is None:
+            continue
+        link = _first(subj_cell, ".//a[@href]")
+        if link is None:
+            continue
+        gall_id = num.text_content().strip()
+        if gall_id in NOTICE_IDS:
+            continue
+        href = _first(article, ".//a[@href]").get("href")
+        rows.append(ListRow(gall_id, link.text_content().strip(), _row_date(date), href))
+    return rows
+
+
+def parse_article(html: str, gall_id: str) -> Article:
+    """
+    게시글 페이지에서 본문과 (페이지에 렌더링된) 댓글을 추출합니다.
+
+    :param html: 게시글 페이지 HTML
+    :param gall_id: 게시글 번호
+    :return: Article (본문 영역이 없으면 ValueError)
+    """
+    doc = lxml_html.fromstring(html) if html and html.strip() else None
+    body = None if doc is None else _first(doc, f"//div[{_has_class('write_div')}]")
+    if body is None:
+        raise ValueError(f"write_div not found in post {gall_id}")
+    replies = []
+    # 댓글 리스트를 직접 찾아서 순회 (댓글돌이 등 형식이 다른 항목은 건너뜀)
+    for comment in doc.xpath(f"//*[@id='comment_wrap_{gall_id}']//li[{_has_class('ub-content')}]"):
+        name = _first(comment, f".//span[{_has_class('nickname')}]")
+        date = _first(comment, f".//span[{_has_class('date_time')}]")
+        text = _first(comment, f".//p[{_has_class('usertxt')}]")
+        if name is not None and date is not None and text is not None:
+            replies.append((name.text_content().strip(), text.text_content().strip(), date.text_content().strip()))
+    return Article(body.text_content(), replies)
+
+
+def find_comment_token(html: str) -> str:
+    """
+    게시글 페이지에서 댓글 API 요청에 필요한 e_s_n_o 값을 찾습니다.
+    파싱 전 (가져오는 단계) 에 호출하므로 정규식으로 찾습니다.
+
+    :return: e_s_n_o 값 (없으면 None)
+    """
+    match = _COMMENT_TOKEN_RE.search(html)
+    return match.group(1) if match else None
+
+
+def has_rendered_comments(html: str) -> bool:
+    return 'class="usertxt' in html
+
+
+def parse_comment_json(text: str) -> list:
+    """
+    데스크톱 댓글 API (/board/comment/) 응답을 댓글 튜플 목록으로 변환합니다.
+
+    :param text: JSON 응답
+    :return: (작성자, 내용, 작성일) 튜플 목록
+    """
+    data = json.loads(text) if text.strip() else {}
+    replies = []
+    for comment in data.get("comments") or []:
+        # 댓글돌이 등 시스템 항목은 번호가 0 입니다.
+        if not str(comment.get("no", "0")).strip("0") or not comment.get("memo"):
+            continue
+        memo = html_lib.unescape(_TAG_RE.sub("", comment["memo"])).strip()
+        replies.append((comment.get("name", "").strip(), memo, comment.get("reg_date", "").strip()))
+    return replies
+
+
+def parse_raw(raw: RawPage):
+    """
+    백엔드가 가져온 응답을 파싱합니다. 파서 프로세스 풀에서 실행됩니다.
+
+    :param raw: RawPage
+    :return: "list" 는 ListRow 목록, "article" 은 Article, "parsed" 는 extra 그대로
+    """
+    if raw.kind == "list":
+        return parse_list_page(raw.html)
+    if raw.kind == "article":
+        article = parse_article(raw.html, raw.gall_id)
+        if raw.extra is not None and not article.replies:
+            return Article(article.contents, parse_comment_json(raw.extra))
+        return article
+    if raw.kind == "parsed":
+        return raw.extra
+    raise ValueError(f"Unknown page kind: {raw.kind}")
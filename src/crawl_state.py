@@ -0,0 +1,165 @@
+import os
+import csv
+import sys
+import time
+import sqlite3
+
+
+# out_dir 에 함께 저장하는 파일로, 그 디렉토리의 CSV 가 어느 갤러리에서 수집됐는지 기록합니다.
+BOARD_MARKER = "board.txt"
+
+
+class CrawlState:
+    def __init__(self, db_file: str, board_id: str, out_dir: str):
+        """
+        수집한 게시글 번호 색인과 크롤링 커서를 디스크에 저장하는 상태를 초기화합니다.
+
+        게시글 번호는 열 때 한 번 메모리의 set 으로 읽으므로 수집 여부 확인은 O(1) 이고,
+        페이지를 기록할 때마다 커밋하므로 중단 후 다시 실행해도 이미 받은 게시글을 다시 요청하지 않습니다.
+        색인과 커서는 갤러리와 결과 디렉토리별로 따로 저장하므로, 같은 갤러리를 다른 out_dir 에 수집하면 처음부터 수집합니다.
+
+        :param db_file: SQLite 파일 경로
+        :param board_id: 갤러리 ID
+        :param out_dir: contents.csv / reply.csv 를 저장하는 디렉토리
+        """
+        self.db_file = db_file
+        self.board_id = board_id
+        self.out_dir = os.path.abspath(out_dir)
+        db_dir = os.path.dirname(os.path.abspath(db_file))
+        os.makedirs(db_dir, exist_ok=True)
+        self.conn = sqlite3.connect(db_file, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(crawled_posts)")]
+        if columns and "out_dir" not in columns:
+            # 결과 디렉토리 없이 갤러리로만 구분하던 색인은 어느 CSV 에 해당하는지 알 수 없으므로 버립니다.
+            print(f"[WARNING] Dropping crawl index without output directories: {db_file}")
+            self.conn.execute("DROP TABLE crawled_posts")
+            self.conn.execute("DROP TABLE IF EXISTS crawl_cursors")
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS crawled_posts (
+                board_id TEXT,
+                out_dir TEXT,
+                post_id INTEGER,
+                crawled REAL,
+                PRIMARY KEY (board_id, out_dir, post_id)
+            ) WITHOUT ROWID
+        ''')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS crawl_cursors (
+                board_id TEXT,
+                out_dir TEXT,
+                start_date TEXT,
+                end_date TEXT,
+                page INTEGER,
+                updated REAL,
+                PRIMARY KEY (board_id, out_dir, start_date, end_date)
+            )
+        ''')
+        self.conn.commit()
+        rows = self.conn.execute("SELECT post_id FROM crawled_posts WHERE board_id = ? AND out_dir = ?",
+                                 (board_id, self.out_dir))
+        self.seen = {post_id for (post_id,) in rows}
+
+    def __contains__(self, post_id) -> bool:
+        return int(post_id) in self.seen
+
+    def __len__(self) -> int:
+        return len(self.seen)
+
+    def add(self, post_ids: list) -> None:
+        """
+        게시글 번호를 수집 완료로 기록합니다. CSV 에 쓴 뒤 호출합니다.
+
+        :param post_ids: 게시글 번호 목록
+        """
+        now = time.time()
+        ids = [int(p) for p in post_ids]
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO crawled_posts (board_id, out_dir, post_id, crawled) VALUES (?, ?, ?, ?)",
+            [(self.board_id, self.out_dir, p, now) for p in ids],
+        )
+        self.conn.commit()
+        self.seen.update(ids)
+
+    def csv_board(self) -> str:
+        """
+        out_dir 의 CSV 를 수집한 갤러리 ID 를 반환합니다.
+
+        :return: 갤러리 ID (기록이 없으면 None)
+        """
+        marker = os.path.join(self.out_dir, BOARD_MARKER)
+        if not os.path.exists(marker):
+            return None
+        with open(marker, encoding='utf8') as f:
+            return f.read().strip() or None
+
+    def mark_board(self) -> None:
+        """
+        out_dir 의 CSV 가 이 갤러리의 것임을 기록합니다.
+
+        CSV 가 아직 없을 때만 기록하므로, 출처를 알 수 없는 기존 CSV 나 다른 갤러리의 CSV 에는 표시하지 않습니다.
+        """
+        if self.csv_board() is not None or os.path.exists(os.path.join(self.out_dir, "contents.csv")):
+            return
+        os.makedirs(self.out_dir, exist_ok=True)
+        with open(os.path.join(self.out_dir, BOARD_MARKER), "w", encoding='utf8') as f:
+            f.write(self.board_id + "\n")
+
+    def import_csv(self) -> int:
+        """
+        색인이 비어 있을 때 out_dir 의 기존 contents.csv 에서 게시글 번호를 가져옵니다.
+        (색인 도입 전에 수집한 글이나 색인 DB 를 옮긴 경우 다시 받지 않도록)
+
+        게시글 번호는 갤러리마다 따로 매겨지므로 BOARD_MARKER 로 이 갤러리의 CSV 임이 확인된 경우에만 가져옵니다.
+
+        :return: 가져온 게시글 수
+        """
+        contents_csv = os.path.join(self.out_dir, "contents.csv")
+        if self.seen or not os.path.exists(contents_csv):
+            return 0
+        board = self.csv_board()
+        if board != self.board_id:
+            print(f"[WARNING] Not importing {contents_csv}: "
+                  f"{'written for ' + board if board else 'unknown board'}, expected {self.board_id}")
+            return 0
+        csv.field_size_limit(sys.maxsize)
+        with open(contents_csv, newline='', encoding='utf8') as f:
+            ids = [row[0] for row in csv.reader(f) if row and row[0].strip().isdigit()]
+        if ids:
+            self.add(ids)
+        return len(ids)
+
+    def cursor(self, start: str, end: str) -> int:
+        """
+        같은 기간의 이전 실행이 기록한 다음 목록 페이지를 반환합니다.
+
+        :param start: 수집 시작일 (YYYY.MM.DD)
+        :param end: 수집 종료일 (YYYY.MM.DD)
+        :return: 페이지 번호 (없으면 None)
+        """
+        row = self.conn.execute(
+            "SELECT page FROM crawl_cursors WHERE board_id = ? AND out_dir = ? AND start_date = ? AND end_date = ?",
+            (self.board_id, self.out_dir, start, end),
+        ).fetchone()
+        return row[0] if row else None
+
+    def save_cursor(self, start: str, end: str, page: int) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO crawl_cursors (board_id, out_dir, start_date, end_date, page, updated) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (self.board_id, self.out_dir, start, end, page, time.time()),
+        )
+        self.conn.commit()
+
+    def clear_cursor(self, start: str, end: str) -> None:
+        self.conn.execute(
+            "DELETE FROM crawl_cursors WHERE board_id = ? AND out_dir = ? AND start_date = ? AND end_date = ?",
+            (self.board_id, self.out_dir, start, end),
+        )
+        self.conn.commit()
+
+    def report(self) -> str:
+        return f"{len(self.seen)} posts indexed for {self.board_id} in {self.out_dir}"
+
+    def close(self) -> None:
+        self.conn.close()
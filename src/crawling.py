@@ -1,60 +1,34 @@
-#selenium 라이브러리
-from selenium import webdriver
-from selenium.webdriver.firefox.options import Options
-from selenium.webdriver.firefox.service import Service
-from webdriver_manager.firefox import GeckoDriverManager
-
-#추가 조작 라이브러리
-import time
-from bs4 import BeautifulSoup
-from time import sleep
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-
-#기타 라이브러리
-import pandas as pd
 import os
-from selenium.common.exceptions import WebDriverException
 import csv
+import time
+import asyncio
 import traceback
-
-# 로그 설정
-os.environ["MOZ_LOG"] = "socket,nsHttp:5"  # 로그을 콘솔에 출력하도록 설정
-# MOZ_LOG_FILE 환경 변수를 제거하여 로그 파일 생성을 중지합니다.
-os.environ.pop("MOZ_LOG_FILE", None)  # 로그 파일 생성을 중지
-
-os.makedirs("resource", exist_ok=True)
-
-# 현재 설치된 브라우저 버전에 맞는 드라이버 버전 지정
-ser = Service(GeckoDriverManager().install())
-options = Options()
-# 필요에 따라 headless 모드나 다른 옵션을 추가할 수 있습니다.
-# options.add_argument("--headless")
-options.binary_location = '/usr/bin/firefox'
-driver = webdriver.Firefox(service=ser, options=options)
-
-# 수집할 기간 설정 (시작일 ≤ 종료일)
-start_date = time.strptime("2025.6.10","%Y.%m.%d")
-end_date   = time.strptime("2025.6.12","%Y.%m.%d")
-
-
-#수집한 정보를 저장하는 리스트
-c_gall_no_list = []
-title_list = [] #제목
-contents_list = [] #게시글 내용
-contents_date_list = []
-
-#수집한 정보를 저장하는 리스트
-gall_no_list = [] #글 번호
-reply_id = [] #답글 아이디
-reply_content = [] #답글 내용
-reply_date = [] #답글 등록 일자
-
-#기본 URL
-BASE = "http://gall.dcinside.com"
-
-def parse_date(txt):
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from config import (CRAWL_BACKEND, CRAWL_CONCURRENCY, CRAWL_RATE_PER_HOST, CRAWL_TIMEOUT,
+                    CRAWL_PARSE_WORKERS, CRAWL_QUEUE_SIZE, CRAWL_STATE_PATH, CRAWL_CACHE_DIR, CRAWL_CACHE_ENABLED)
+from crawl_backends import load_crawl_backend
+from crawl_state import CrawlState
+from response_cache import ResponseCache
+from crawl_parser import parse_raw
+
+# 기본 수집 대상 갤러리와 기간 (시작일 ≤ 종료일)
+DEFAULT_BOARD_ID = "programming"
+DEFAULT_START_DATE = "2025.6.10"
+DEFAULT_END_DATE = "2025.6.12"
+DEFAULT_OUT_DIR = os.path.join(os.path.dirname(__file__), "resource")
+# 연속으로 이만큼 빈 목록 페이지가 나오면 목록 끝으로 보고 종료합니다. (읽지 못한 페이지는 세지 않습니다)
+MAX_EMPTY_PAGES = 3
+# 목록 페이지를 읽지 못하면 이만큼 다시 시도합니다 (대기 시간은 LIST_RETRY_DELAY 초부터 두 배씩 늘어남).
+LIST_RETRIES = 3
+LIST_RETRY_DELAY = 2.0
+# 기록을 기다리며 동시에 진행할 목록 페이지 수 (게시글 요청/파싱이 페이지 경계에서 멈추지 않도록)
+PIPELINE_PAGES = 2
+
+
+def parse_date(txt, start_date):
     normalized = txt.strip()
     # 시간 형식만 들어오면 오늘 날짜로 처리
     if ':' in normalized and not any(sep in normalized for sep in ['.', '/']):
@@ -72,171 +46,335 @@ def parse_date(txt):
     mm = mm.zfill(2); dd = dd.zfill(2)
     return time.strptime(f"{year}.{mm}.{dd}", "%Y.%m.%d")
 
-# 크롤 시작 페이지를 최신 글(1번 페이지)부터 순차 조회하도록 수정
-start_page = 1
-Flag = True
-
-# -- CSV 파일 열기 및 헤더 삽입 (append 모드) --
-contents_csv = "resource/contents.csv"
-need_header = not os.path.exists(contents_csv) or os.path.getsize(contents_csv) == 0
-contents_f = open(contents_csv, "a", newline='', encoding='utf8')
-contents_writer = csv.writer(contents_f)
-
-
-if need_header:
-    contents_writer.writerow(["id","title","contents","date"])
-
-reply_csv = "resource/reply.csv"
-need_header2 = not os.path.exists(reply_csv) or os.path.getsize(reply_csv) == 0
-reply_f = open(reply_csv, "a", newline='', encoding='utf8')
-reply_writer = csv.writer(reply_f)
-
-
-if need_header2:
-    reply_writer.writerow(["id","reply_id","reply_content","reply_date"])
-
-
-if __name__ == "__main__":
-    print(f"[INFO] 크롤링을 시작합니다. 기간: {time.strftime('%Y.%m.%d', start_date)} ~ {time.strftime('%Y.%m.%d', end_date)}")
-    print(f"[DEBUG] 크롤링 시작 페이지: {start_page}")
-    print(f"[DEBUG] 크롤링 대상 URL: {BASE}/board/lists/?id=programming&page={start_page}")
-    # 크롤링 시작
-    while Flag:  # 게시글의 페이지마다 loop를 수행
-        base_url = BASE + '/board/lists/?id=programming&page=' + str(start_page)
-        print(base_url)
 
+def open_csv_writers(out_dir: str):
+    """
+    contents.csv / reply.csv 를 append 모드로 열고 필요하면 헤더를 씁니다.
+
+    :param out_dir: CSV 를 저장할 디렉토리
+    :return: (contents 파일, contents writer, reply 파일, reply writer) 튜플
+    """
+    os.makedirs(out_dir, exist_ok=True)
+
+    contents_csv = os.path.join(out_dir, "contents.csv")
+    need_header = not os.path.exists(contents_csv) or os.path.getsize(contents_csv) == 0
+    contents_f = open(contents_csv, "a", newline='', encoding='utf8')
+    contents_writer = csv.writer(contents_f)
+    if need_header:
+        contents_writer.writerow(["id","title","contents","date"])
+
+    reply_csv = os.path.join(out_dir, "reply.csv")
+    need_header2 = not os.path.exists(reply_csv) or os.path.getsize(reply_csv) == 0
+    reply_f = open(reply_csv, "a", newline='', encoding='utf8')
+    reply_writer = csv.writer(reply_f)
+    if need_header2:
+        reply_writer.writerow(["id","reply_id","reply_content","reply_date"])
+
+    return contents_f, contents_writer, reply_f, reply_writer
+
+
+async def find_first_page(too_new, first: int = 1) -> int:
+    """
+    목록 페이지를 갤로핑 후 이진 탐색하여 수집 기간과 겹치는 첫 페이지를 찾습니다.
+
+    목록은 최신 글부터 나오므로 "페이지의 모든 글이 종료일보다 최신" 이라는 조건은
+    앞쪽 페이지에서만 참이고 한 번 거짓이 되면 이후로 계속 거짓입니다.
+    첫 페이지부터 1, 2, 4, 8... 페이지를 확인해 조건이 거짓인 페이지를 찾고 (갤로핑),
+    마지막으로 참이었던 페이지와의 사이를 이진 탐색하므로 O(log n) 번만 페이지를 읽습니다.
+
+    :param too_new: 페이지 번호를 받아 그 페이지의 모든 글이 종료일보다 최신이면 True 를 반환하는 코루틴 함수
+    :param first: 탐색을 시작할 페이지
+    :return: 조건이 처음으로 거짓인 페이지 번호
+    """
+    if not await too_new(first):
+        return first
+    lo, step = first, 1
+    hi = first + step
+    while await too_new(hi):
+        lo = hi
+        step *= 2
+        hi = first + step
+    # too_new(lo) 는 참, too_new(hi) 는 거짓
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if await too_new(mid):
+            lo = mid
+        else:
+            hi = mid
+    return hi
+
+
+async def crawl_async(backend, board_id: str, start_date, end_date, out_dir: str,
+                      parse_workers: int = None, queue_size: int = None, seek: bool = True,
+                      state=None, resume: bool = True) -> int:
+    """
+    갤러리 목록을 최신 글(1번 페이지)부터 순차 조회하며 기간 내 게시글과 댓글을 CSV 에 저장합니다.
+
+    가져오기와 파싱을 나눈 생산자/소비자 파이프라인입니다.
+    1. 게시글 요청(생산자)은 받은 HTML 을 크기가 queue_size 인 큐에 넣습니다.
+       큐가 차면 파서가 따라올 때까지 요청을 멈춥니다.
+    2. 파서 작업(소비자)은 큐에서 꺼낸 HTML 을 파서 프로세스 풀에서 파싱합니다.
+    3. 목록 페이지는 최대 PIPELINE_PAGES 개까지 동시에 진행하고, 결과는 목록 순서대로 기록합니다.
+
+    seek 이면 순차 조회 전에 find_first_page 로 기간과 겹치는 첫 목록 페이지를 찾아 그 페이지부터 시작합니다.
+    state 가 있으면 이미 수집한 게시글은 요청하지 않고, 목록 페이지를 기록할 때마다 커서(다음 페이지)를 저장하여
+    같은 기간을 다시 실행하면 커서부터 이어서 수집합니다.
+    목록 페이지는 실패하면 LIST_RETRIES 번까지 다시 시도하고, 그래도 읽지 못하면 건너뛰지 않고 그 페이지에서 멈춥니다.
+
+    :param backend: crawl_backends 의 백엔드
+    :param board_id: 갤러리 ID
+    :param start_date: 수집 시작일 (time.struct_time)
+    :param end_date: 수집 종료일 (time.struct_time)
+    :param out_dir: contents.csv / reply.csv 를 저장할 디렉토리
+    :param parse_workers: 파서 프로세스 수 (기본값: CRAWL_PARSE_WORKERS, 0 이면 스레드에서 파싱)
+    :param queue_size: 파싱을 기다리는 응답 큐 크기 (기본값: CRAWL_QUEUE_SIZE)
+    :param seek: 기간과 겹치는 첫 목록 페이지를 먼저 탐색할지 여부
+    :param state: crawl_state.CrawlState (None 이면 이번 실행 안에서만 중복을 확인)
+    :param resume: state 에 저장된 같은 기간의 커서부터 이어서 수집할지 여부
+    :return: 수집한 게시글 수
+    """
+    parse_workers = CRAWL_PARSE_WORKERS if parse_workers is None else parse_workers
+    queue_size = queue_size or CRAWL_QUEUE_SIZE
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=queue_size)
+    executor = None
+    if parse_workers > 0:
+        executor = ProcessPoolExecutor(max_workers=parse_workers, mp_context=multiprocessing.get_context("spawn"))
+
+    async def parse(raw):
+        return await loop.run_in_executor(executor, parse_raw, raw)
+
+    async def parser():
+        while True:
+            raw, future = await queue.get()
+            try:
+                future.set_result(await parse(raw))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                queue.task_done()
+
+    async def fetch(row, future):
         try:
-            driver.get(base_url)
-            sleep(3)
-            page_source = driver.page_source
-        except WebDriverException as e:
-            print(f"[ERROR] WebDriver error on list page: {e}")
-            traceback.print_exc()
-            driver.quit()
-            driver = webdriver.Firefox(service=ser, options=options)
-            continue
+            raw = await backend.fetch_article(board_id, row)
         except Exception as e:
-            print(f"[ERROR] 리스트 페이지 로딩 실패: {e}")
-            traceback.print_exc()
-            continue
-
-        soup = BeautifulSoup(page_source, "html.parser")
-        # 게시글 목록을 담고 있는 tbody.listwrap2 내부의 tr 태그를 모두 선택
-        body = soup.find('tbody', class_='listwrap2')
-        if not body:
-            start_page += 1
-            continue
-        article_list = body.find_all('tr')
-        if not article_list:
-            start_page += 1
-            continue
-
-        # 페이지단위 날짜 필터 (0번 = 가장 오래된, -1번 = 가장 최신)
-        oldest_date = parse_date(article_list[0].find("td",{"class":"gall_date"}).text)
-        newest_date = parse_date(article_list[-1].find("td",{"class":"gall_date"}).text)
-        print(f"[DEBUG] Page {start_page}: oldest={time.strftime('%Y.%m.%d', oldest_date)}, newest={time.strftime('%Y.%m.%d', newest_date)}")
-
-        # 페이지 내 모든 글이 기간 이전(너무 오래된) → 크롤 종료
-        if newest_date < start_date:
-            print("수집을 종료합니다.")
-            break
-        # 페이지 내 모든 글이 기간 이후(너무 최신) → 다음 페이지로
-        if oldest_date > end_date:
-            start_page += 1
-            continue
-
-        for article in article_list:
-            art_date = parse_date(article.find("td",{"class":"gall_date"}).text)
-            # 개별 글이 수집 기간 외면 스킵
-            if art_date < start_date or art_date > end_date:
+            future.set_exception(e)
+            return
+        await queue.put((raw, future))
+
+    contents_f, contents_writer, reply_f, reply_writer = open_csv_writers(out_dir)
+    #수집한 게시글 번호 (요청을 시작한 글) 와 실제로 저장한 글 수
+    scheduled = set()
+    saved = 0
+    window = (time.strftime('%Y.%m.%d', start_date), time.strftime('%Y.%m.%d', end_date))
+    # 실패한 글이 있는 페이지 이후로는 커서를 옮기지 않습니다 (다음 실행에서 다시 시도)
+    cursor_blocked = False
+
+    async def write_page(page, targets, futures):
+        nonlocal saved, cursor_blocked
+        articles = await asyncio.gather(*futures, return_exceptions=True)
+        written = []
+        for row, article in zip(targets, articles):
+            if isinstance(article, Exception):
+                print(f"[ERROR] 게시글 로딩 실패: {row.gall_id} → {article}")
+                scheduled.discard(row.gall_id)
+                cursor_blocked = True
                 continue
-            
-            # 제목과 종류 추출 (gall_subject 셀 안의 첫 번째 <a>)
-            subj_cell = article.find("td", class_=lambda v: v and "gall_tit ub-word" in v)
-            if not subj_cell:
+            # 게시글의 작성 날짜
+            c_date = "20" + row.date.replace('/', '.')
+            contents_writer.writerow([row.gall_id, row.title, article.contents, c_date])
+            for user_name, user_reply, user_reply_date in article.replies:
+                reply_writer.writerow([row.gall_id, user_name, user_reply, user_reply_date])
+            saved += 1
+            written.append(row.gall_id)
+            print(f"[INFO] Saved post → id: {row.gall_id}, title: {row.title}, replies: {len(article.replies)}")
+        contents_f.flush()
+        reply_f.flush()
+        if state is not None:
+            state.add(written)
+            if not cursor_blocked:
+                state.save_cursor(*window, page + 1)
+
+    # 탐색 중에 읽은 목록 페이지는 순차 조회에서 다시 요청하지 않습니다.
+    probed = {}
+
+    async def list_rows(page):
+        if page in probed:
+            return probed.pop(page)
+        return await parse(await backend.fetch_list(board_id, page))
+
+    async def load_list(page):
+        # 다시 시도해도 읽지 못하면 None
+        retries = getattr(backend, "list_retries", LIST_RETRIES)
+        for attempt in range(retries + 1):
+            try:
+                return await list_rows(page)
+            except Exception as e:
+                if attempt == retries:
+                    print(f"[ERROR] 리스트 페이지 로딩 실패: page={page} → {e}")
+                    traceback.print_exc()
+                    return None
+                delay = LIST_RETRY_DELAY * 2 ** attempt
+                print(f"[WARNING] 리스트 페이지 로딩 실패: page={page} → {e} ({delay:.0f}초 후 다시 시도)")
+                await asyncio.sleep(delay)
+
+    async def too_new(page):
+        try:
+            probed[page] = rows = await list_rows(page)
+        except Exception as e:
+            # 확인할 수 없는 페이지에서는 탐색을 멈추고 순차 조회에 맡깁니다.
+            print(f"[ERROR] 리스트 페이지 탐색 실패: page={page} → {e}")
+            return False
+        # 빈 페이지는 목록의 끝
+        return bool(rows) and min(parse_date(row.date, start_date) for row in rows) > end_date
+
+    parsers = [asyncio.create_task(parser()) for _ in range(max(1, parse_workers))]
+    in_flight = deque()
+    fetchers = []
+    page = 1
+    empty_pages = 0
+    list_failed = False
+    try:
+        cursor = state.cursor(*window) if state is not None and resume else None
+        if cursor:
+            page = cursor
+            print(f"[INFO] 이전 실행의 커서부터 이어서 수집합니다: page={page} ({state.report()})")
+        if seek:
+            page = await find_first_page(too_new, page)
+            print(f"[INFO] 기간과 겹치는 첫 목록 페이지: {page} (목록 페이지 {len(probed)}개 확인)")
+            probed = {p: rows for p, rows in probed.items() if p >= page}
+        while True:  # 게시글의 페이지마다 loop를 수행
+            rows = await load_list(page)
+            if rows is None:
+                # 읽지 못한 페이지를 건너뛰면 그 페이지의 글을 잃으므로 여기서 멈추고 커서를 이 페이지에 남깁니다.
+                print(f"[ERROR] 목록 페이지 {page} 를 읽지 못해 수집을 중단합니다. 다음 실행에서 이 페이지부터 이어서 수집합니다.")
+                list_failed = True
+                break
+            if not rows:
+                empty_pages += 1
+                if empty_pages >= MAX_EMPTY_PAGES:
+                    print("[INFO] 더 이상 게시글이 없어 수집을 종료합니다.")
+                    break
+                page += 1
                 continue
-            link = subj_cell.find("a", href=True)
-            if not link:
+            empty_pages = 0
+
+            # 페이지단위 날짜 필터
+            dates = [parse_date(row.date, start_date) for row in rows]
+            oldest_date, newest_date = min(dates), max(dates)
+            print(f"[DEBUG] Page {page}: oldest={time.strftime('%Y.%m.%d', oldest_date)}, newest={time.strftime('%Y.%m.%d', newest_date)}")
+
+            # 페이지 내 모든 글이 기간 이전(너무 오래된) → 크롤 종료
+            if newest_date < start_date:
+                print("수집을 종료합니다.")
+                break
+            # 페이지 내 모든 글이 기간 이후(너무 최신) → 다음 페이지로
+            if oldest_date > end_date:
+                page += 1
                 continue
-            title = link.text.strip()
-            
-            #head = subj_cell.get_text(strip=True).replace(title, "").strip()
-            
-            
-            
-            gall_id = article.find("td",{"class" : "gall_num"}).text.strip() #글 id 추출
-
-            if gall_id not in ['설문','AD','공지']: #사용자들이 쓴 글이 목적이므로 광고/설문/공지 제외
-                    
-                # 게시글 번호
-                gall_id = article.find("td",{"class" : "gall_num"}).text
-
-                # 중복 방지: 저장 직후 체크
-                if gall_id in c_gall_no_list:
-                    continue
-                
-                #각 게시글의 주소를 찾기 -> 내용 + 댓글 수집 목적
-                tag = article.find('a',href = True)
-                content_url = BASE + tag['href']
-                
-                #게시글 load
-                try:
-                    driver.get(content_url)
-                    sleep(3)
-                    print(f"Loading content: {content_url}")
-                    WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located((By.CLASS_NAME, "write_div"))
-                    )
-                    contents_soup = BeautifulSoup(driver.page_source, "html.parser")
-                    contents = contents_soup.find('div', {"class": "write_div"}).text
-                except Exception as e:
-                    print(f"[ERROR] 게시글 로딩 실패: {content_url} → {e}")
-                    traceback.print_exc()
-                    continue
-
-                #게시글의 작성 날짜
-                raw = article.find("td",{"class":"gall_date"}).text
-                c_date = "20" + raw.replace('/', '.')
-
-                #게시글 제목과 내용을 수집
-                c_gall_no_list.append(gall_id)
-                title_list.append(title)
-                contents_list.append(contents)
-                contents_date_list.append(c_date)
-                
-                # 즉시 contents.csv에 기록
-                contents_writer.writerow([gall_id, title, contents, c_date])
-                contents_f.flush()
-                print(f"[INFO] Saved post → id: {gall_id}, title: {title}")
-
-                # 댓글 리스트를 직접 찾아서 순회
-                comments = contents_soup.select(f"#comment_wrap_{gall_id} li.ub-content")
-                for comment in comments:
-                    try:
-                        user_name       = comment.find("span", class_="nickname").text.strip()
-                        user_reply_date = comment.find("span", class_="date_time").text.strip()
-                        user_reply      = comment.find("p", class_="usertxt").text.strip()
-                        reply_writer.writerow([gall_id, user_name, user_reply, user_reply_date])
-                        reply_f.flush()
-                        print(f"[INFO] Saved reply → post_id: {gall_id}, reply_id: {user_name}")
-                    except Exception as e:
-                        print(f"[ERROR] 댓글 파싱 실패: post_id={gall_id} → {e}")
-                        traceback.print_exc()
-                        continue
-
-        #다음 게시글 목록 페이지로 넘어가기
-        start_page += 1
-        
-
-    # 파일 닫기
-    contents_f.close()
-    reply_f.close()
-    # 크롤링 드라이버 종료
-    driver.quit()
-    
-    print(f"[INFO] 크롤링 완료. 수집된 게시글 수: {len(c_gall_no_list)}")
-    print(f"[INFO] 게시글 정보 저장 위치: {contents_csv}")
-    print(f"[INFO] 댓글 정보 저장 위치: {reply_csv}")
+
+            # 개별 글이 수집 기간 외이거나 이미 수집했으면 스킵
+            targets = [row for row, date in zip(rows, dates)
+                       if start_date <= date <= end_date and row.gall_id not in scheduled
+                       and (state is None or row.gall_id not in state)]
+            scheduled.update(row.gall_id for row in targets)
+            futures = [loop.create_future() for _ in targets]
+            fetchers.extend(asyncio.create_task(fetch(row, future)) for row, future in zip(targets, futures))
+            in_flight.append((page, targets, futures))
+            while len(in_flight) > PIPELINE_PAGES:
+                await write_page(*in_flight.popleft())
+
+            #다음 게시글 목록 페이지로 넘어가기
+            page += 1
+
+        while in_flight:
+            await write_page(*in_flight.popleft())
+        if list_failed:
+            cursor_blocked = True
+        # 기간을 끝까지 수집했으면 커서를 지웁니다.
+        if state is not None and not cursor_blocked:
+            state.clear_cursor(*window)
+    finally:
+        for task in fetchers + parsers:
+            task.cancel()
+        await asyncio.gather(*fetchers, *parsers, return_exceptions=True)
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        # 파일 닫기
+        contents_f.close()
+        reply_f.close()
+        await backend.close()
+
+    print(f"[INFO] 게시글 정보 저장 위치: {contents_f.name}")
+    print(f"[INFO] 댓글 정보 저장 위치: {reply_f.name}")
+    return saved
+
+
+def crawl(board_id: str = DEFAULT_BOARD_ID, start: str = DEFAULT_START_DATE, end: str = DEFAULT_END_DATE,
+          out_dir: str = DEFAULT_OUT_DIR, backend: str = None, concurrency: int = None, rate: float = None,
+          parse_workers: int = None, seek: bool = True, resume: bool = True, replay: bool = False) -> int:
+    """
+    기간 내 게시글과 댓글을 수집하여 CSV 에 저장합니다.
+
+    :param board_id: 갤러리 ID
+    :param start: 수집 시작일 (YYYY.M.D)
+    :param end: 수집 종료일 (YYYY.M.D)
+    :param out_dir: contents.csv / reply.csv 를 저장할 디렉토리
+    :param backend: 크롤링 백엔드 (기본값: CRAWL_BACKEND, http / dc_api / selenium)
+    :param concurrency: 동시에 진행할 최대 요청 수 (기본값: CRAWL_CONCURRENCY)
+    :param rate: 호스트별 초당 최대 요청 수 (기본값: CRAWL_RATE_PER_HOST, 0 이면 제한 없음)
+    :param parse_workers: 파서 프로세스 수 (기본값: CRAWL_PARSE_WORKERS)
+    :param seek: 기간과 겹치는 첫 목록 페이지를 먼저 탐색할지 여부
+    :param resume: 같은 기간을 중단했던 페이지부터 이어서 수집할지 여부 (수집 색인은 항상 사용)
+    :param replay: 네트워크 없이 응답 캐시만으로 수집과 파싱을 다시 실행합니다.
+                   결과는 out_dir/replay 에 새로 쓰고, 수집 색인과 커서는 사용하지 않습니다.
+    :return: 수집한 게시글 수
+    """
+    backend = backend or CRAWL_BACKEND
+    concurrency = concurrency or CRAWL_CONCURRENCY
+    rate = CRAWL_RATE_PER_HOST if rate is None else rate
+    start_date = time.strptime(start, "%Y.%m.%d")
+    end_date = time.strptime(end, "%Y.%m.%d")
+    print(f"[INFO] 크롤링을 시작합니다. 기간: {time.strftime('%Y.%m.%d', start_date)} ~ {time.strftime('%Y.%m.%d', end_date)}")
+    print(f"[INFO] 백엔드: {backend}, 동시 요청 {concurrency}, 호스트별 초당 {rate}회")
+
+    cache = ResponseCache(CRAWL_CACHE_DIR) if CRAWL_CACHE_ENABLED or replay else None
+    if replay:
+        backend, state = "replay", None
+        out_dir = os.path.join(out_dir, "replay")
+        for name in ["contents.csv", "reply.csv"]:
+            if os.path.exists(os.path.join(out_dir, name)):
+                os.remove(os.path.join(out_dir, name))
+        print(f"[INFO] 응답 캐시({CRAWL_CACHE_DIR})에서 재실행합니다. 결과 저장 위치: {out_dir}")
+    else:
+        state = CrawlState(CRAWL_STATE_PATH, board_id, out_dir)
+        imported = state.import_csv()
+        if imported:
+            print(f"[INFO] 기존 contents.csv 의 게시글 {imported}개를 수집 색인에 추가했습니다.")
+        board = state.csv_board()
+        if board is not None and board != board_id:
+            print(f"[WARNING] {out_dir} 에는 {board} 갤러리의 CSV 가 있습니다. {board_id} 의 게시글이 같은 CSV 에 추가됩니다.")
+        state.mark_board()
+
+    async def run():
+        fetcher = load_crawl_backend(backend, concurrency, rate, CRAWL_TIMEOUT, cache)
+        count = await crawl_async(fetcher, board_id, start_date, end_date, out_dir, parse_workers,
+                                  seek=seek, state=state, resume=resume)
+        return count, fetcher.report()
+
+    started = time.perf_counter()
+    try:
+        count, report = asyncio.run(run())
+    finally:
+        if state is not None:
+            state.close()
+        if cache is not None:
+            cache.close()
+    elapsed = time.perf_counter() - started
+    print(f"[INFO] 크롤링 완료. 수집된 게시글 수: {count} ({elapsed:.1f}s, {count / elapsed if elapsed else 0:.2f} posts/s, {report})")
     print("[INFO] 크롤링이 완료되었습니다.")
+    return count
 
 
+if __name__ == "__main__":
+    crawl()
@@ -0,0 +1,175 @@
+import os
+import time
+import logging
+import torch
+
+# 감정 분류 백엔드 종류
+BACKENDS = ("torch", "torch-int8", "onnx")
+ONNX_INPUT_NAMES = ["input_ids", "attention_mask", "token_type_ids"]
+
+
+class TorchBackend:
+    def __init__(self, model, device, name: str = "torch"):
+        """
+        PyTorch 모델을 감정 분류 백엔드로 감쌉니다.
+
+        :param model: AutoModelForSequenceClassification 모델
+        :param device: 입력 텐서를 올릴 장치
+        :param name: 백엔드 이름
+        """
+        self.model = model.eval()
+        self.device = device
+        self.name = name
+
+    def __call__(self, inputs) -> torch.Tensor:
+        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        with torch.inference_mode():
+            return self.model(**inputs).logits.float()
+
+
+class OnnxBackend:
+    def __init__(self, onnx_path: str, num_threads: int = 0):
+        """
+        onnxruntime 세션을 감정 분류 백엔드로 사용합니다.
+
+        :param onnx_path: ONNX 모델 파일 경로
+        :param num_threads: intra-op 스레드 수 (0 이면 onnxruntime 기본값)
+        """
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        self.name = "onnx"
+
+    def __call__(self, inputs) -> torch.Tensor:
+        feeds = {k: inputs[k].cpu().numpy().astype("int64") for k in self.input_names if k in inputs}
+        (logits,) = self.session.run(["logits"], feeds)
+        return torch.from_numpy(logits).float()
+
+
+class _LogitsOnly(torch.nn.Module):
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask, token_type_ids):
+        return self.model(input_ids=input_ids, attention_mask=attention_mask, token_type_ids=token_type_ids).logits
+
+
+def export_onnx(model, tokenizer, out_dir: str) -> str:
+    """
+    분류 모델을 ONNX 로 내보낸 뒤 int8 가중치로 동적 양자화합니다.
+
+    :param model: fp32 PyTorch 분류 모델
+    :param tokenizer: 분류 모델의 토크나이저
+    :param out_dir: 결과 파일을 저장할 디렉토리
+    :return: 양자화된 ONNX 모델 경로
+    """
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    os.makedirs(out_dir, exist_ok=True)
+    fp32_path = os.path.join(out_dir, "model.onnx")
+    int8_path = os.path.join(out_dir, "model.int8.onnx")
+
+    sample = tokenizer(["감정 분석 예시 문장", "짧은 댓글"], padding=True, return_tensors="pt")
+    args = tuple(sample[k].cpu() for k in ONNX_INPUT_NAMES)
+    dynamic_axes = {k: {0: "batch", 1: "sequence"} for k in ONNX_INPUT_NAMES}
+    dynamic_axes["logits"] = {0: "batch"}
+    wrapper = _LogitsOnly(model.cpu().eval())
+    with torch.inference_mode():
+        torch.onnx.export(
+            wrapper, args, fp32_path,
+            input_names=ONNX_INPUT_NAMES,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=17,
+        )
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    logging.info(f"ONNX 모델을 내보냈습니다: {int8_path}")
+    return int8_path
+
+
+def quantize_torch(model, out_dir: str):
+    """
+    nn.Linear 가중치를 int8 로 동적 양자화합니다. 양자화된 모델은 저장해 두고 다음 실행부터 그대로 불러옵니다.
+
+    :param model: fp32 PyTorch 분류 모델
+    :param out_dir: 양자화 결과를 저장할 디렉토리 (모델 ID/리비전별)
+    :return: 양자화된 모델
+    """
+    import copy
+
+    path = os.path.join(out_dir, "model.int8.pt")
+    if os.path.exists(path):
+        # 양자화 모듈 구조까지 필요하므로 모듈 전체를 저장합니다. 이 캐시에서 직접 만든 파일만 읽습니다.
+        return torch.load(path, weights_only=False).eval()
+    os.makedirs(out_dir, exist_ok=True)
+    qmodel = torch.ao.quantization.quantize_dynamic(
+        copy.deepcopy(model).cpu().eval(), {torch.nn.Linear}, dtype=torch.qint8
+    )
+    tmp_path = path + ".tmp"
+    torch.save(qmodel, tmp_path)
+    os.replace(tmp_path, path)
+    logging.info(f"int8 양자화 모델을 저장했습니다: {path}")
+    return qmodel
+
+
+def load_emotion_backend(name: str, model, tokenizer, device, cache_dir: str, num_threads: int = 0):
+    """
+    이름에 해당하는 감정 분류 백엔드를 준비합니다. 필요한 변환은 처음 한 번만 수행합니다.
+
+    :param name: "torch", "torch-int8", "onnx" 중 하나
+    :param model: fp32 PyTorch 분류 모델
+    :param tokenizer: 분류 모델의 토크나이저
+    :param device: torch 백엔드에서 사용할 장치
+    :param cache_dir: 변환 결과를 저장할 디렉토리 (모델 ID/리비전마다 달라야 합니다)
+    :param num_threads: onnxruntime intra-op 스레드 수 (0 이면 기본값)
+    :return: 입력 텐서 딕셔너리를 받아 로짓을 반환하는 백엔드 객체
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown emotion backend: {name} (choose from {', '.join(BACKENDS)})")
+    if name == "torch":
+        return TorchBackend(model, device)
+    if name == "torch-int8":
+        return TorchBackend(quantize_torch(model, os.path.join(cache_dir, "torch-int8")), torch.device("cpu"), name)
+    onnx_path = os.path.join(cache_dir, "onnx", "model.int8.onnx")
+    if not os.path.exists(onnx_path):
+        onnx_path = export_onnx(model, tokenizer, os.path.join(cache_dir, "onnx"))
+        model.to(device)
+    return OnnxBackend(onnx_path, num_threads)
+
+
+def check_parity(reference, candidate, batches: list) -> dict:
+    """
+    두 백엔드의 예측 라벨 일치율과 처리 속도를 비교합니다.
+
+    :param reference: 기준 백엔드 (fp32)
+    :param candidate: 비교할 백엔드
+    :param batches: 토크나이저 출력(텐서 딕셔너리) 배치 목록
+    :return: 일치율, 최대 로짓 차이, 백엔드별 초당 처리 텍스트 수를 담은 딕셔너리
+    """
+    total = agree = 0
+    max_diff = 0.0
+    elapsed = {"reference": 0.0, "candidate": 0.0}
+    for inputs in batches:
+        t0 = time.perf_counter()
+        ref = reference(inputs)
+        t1 = time.perf_counter()
+        cand = candidate(inputs)
+        t2 = time.perf_counter()
+        elapsed["reference"] += t1 - t0
+        elapsed["candidate"] += t2 - t1
+        agree += (ref.argmax(dim=1) == cand.argmax(dim=1)).sum().item()
+        total += ref.shape[0]
+        max_diff = max(max_diff, (ref - cand).abs().max().item())
+    return {
+        "samples": total,
+        "agreement": agree / total if total else 1.0,
+        "max_logit_diff": max_diff,
+        "reference_texts_per_sec": total / elapsed["reference"] if elapsed["reference"] else 0.0,
+        "candidate_texts_per_sec": total / elapsed["candidate"] if elapsed["candidate"] else 0.0,
+    }
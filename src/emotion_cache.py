@@ -0,0 +1,156 @@
+import os
+import re
+import json
+import time
+import array
+import sqlite3
+import hashlib
+import logging
+import unicodedata
+
+
+def normalize_text(text) -> str:
+    """
+    캐시 키 계산을 위해 텍스트를 정규화합니다.
+
+    :param text: 원본 텍스트
+    :return: NFC 정규화 후 공백을 단일 공백으로 정리한 텍스트
+    """
+    text = unicodedata.normalize("NFC", str(text))
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+class EmotionCache:
+    def __init__(self, db_file: str, model_id: str, biases: dict = None, max_entries: int = 1_000_000):
+        """
+        감정 분류 결과를 디스크에 저장하는 캐시를 초기화합니다.
+
+        키는 정규화된 텍스트, 모델 ID, 로짓 보정값을 함께 해시한 값이므로
+        모델이나 보정값이 바뀌면 기존 결과를 재사용하지 않습니다.
+
+        :param db_file: SQLite 파일 경로
+        :param model_id: 분류 모델 식별자 (백엔드 포함)
+        :param biases: 라벨 인덱스별 로짓 보정값
+        :param max_entries: 최대 저장 항목 수 (초과 시 오래 사용되지 않은 항목부터 삭제)
+        """
+        self.db_file = db_file
+        self.max_entries = max_entries
+        self.namespace = json.dumps(
+            {"model": model_id, "biases": {str(k): v for k, v in sorted((biases or {}).items())}},
+            sort_keys=True,
+        )
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+        db_dir = os.path.dirname(os.path.abspath(db_file))
+        os.makedirs(db_dir, exist_ok=True)
+        self.conn = sqlite3.connect(db_file, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS emotion_cache (
+                key TEXT PRIMARY KEY,
+                label TEXT,
+                logits BLOB,
+                last_used REAL
+            )
+        ''')
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_emotion_cache_last_used ON emotion_cache(last_used)")
+        self.conn.commit()
+
+    def key(self, text) -> str:
+        """
+        텍스트의 캐시 키를 계산합니다.
+
+        :param text: 원본 텍스트
+        :return: sha256 16진수 문자열
+        """
+        h = hashlib.sha256(self.namespace.encode("utf8"))
+        h.update(b"\0")
+        h.update(normalize_text(text).encode("utf8"))
+        return h.hexdigest()
+
+    def get_many(self, keys: list) -> dict:
+        """
+        여러 키의 캐시 결과를 조회합니다.
+
+        :param keys: 캐시 키 목록
+        :return: {키: (라벨, 로짓 리스트)} 딕셔너리 (캐시에 없는 키는 제외)
+        """
+        found = {}
+        unique = list(dict.fromkeys(keys))
+        for start in range(0, len(unique), 500):
+            chunk = unique[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT key, label, logits FROM emotion_cache WHERE key IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+            for key, label, blob in rows:
+                found[key] = (label, array.array("f", blob).tolist())
+        if found:
+            now = time.time()
+            self.conn.executemany(
+                "UPDATE emotion_cache SET last_used = ? WHERE key = ?",
+                [(now, k) for k in found],
+            )
+            self.conn.commit()
+        for k in keys:
+            if k in found:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return found
+
+    def put_many(self, items: list) -> None:
+        """
+        분류 결과를 저장하고 필요하면 오래된 항목을 삭제합니다.
+
+        :param items: (키, 라벨, 로짓 리스트) 튜플 목록
+        """
+        if not items:
+            return
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO emotion_cache (key, label, logits, last_used) VALUES (?, ?, ?, ?)",
+            [(k, label, array.array("f", logits).tobytes(), now) for k, label, logits in items],
+        )
+        self.conn.commit()
+        self._evict()
+
+    def _evict(self) -> None:
+        count = self.conn.execute("SELECT COUNT(*) FROM emotion_cache").fetchone()[0]
+        excess = count - self.max_entries
+        if excess <= 0:
+            return
+        self.conn.execute('''
+            DELETE FROM emotion_cache WHERE key IN (
+                SELECT key FROM emotion_cache ORDER BY last_used ASC LIMIT ?
+            )
+        ''', (excess,))
+        self.conn.commit()
+        self.evicted += excess
+        logging.info(f"감정 캐시 항목 {excess}개를 삭제했습니다.")
+
+    def stats(self) -> dict:
+        """
+        캐시 사용 통계를 반환합니다.
+
+        :return: hits, misses, hit_rate, entries, evicted 를 담은 딕셔너리
+        """
+        total = self.hits + self.misses
+        entries = self.conn.execute("SELECT COUNT(*) FROM emotion_cache").fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": entries,
+            "evicted": self.evicted,
+        }
+
+    def report(self) -> str:
+        s = self.stats()
+        return (f"hits={s['hits']} misses={s['misses']} hit_rate={s['hit_rate']:.1%} "
+                f"entries={s['entries']}/{self.max_entries} evicted={s['evicted']}")
+
+    def close(self) -> None:
+        self.conn.close()
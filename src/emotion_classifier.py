@@ -0,0 +1,228 @@
+import os
+import re
+import torch
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+from config import EMOTION_CACHE_PATH, EMOTION_CACHE_MAX_ENTRIES, MODEL_CACHE_DIR
+from emotion_cache import EmotionCache
+from emotion_store import EMOTION_LABELS
+from emotion_backend import load_emotion_backend
+from token_cache import TokenizedTexts
+from prepared_models import load_prepared
+
+EMOTION_MODEL_ID = "rkdaldus/ko-sent5-classification"
+# Hugging Face 리비전 (브랜치, 태그 또는 커밋 해시)
+EMOTION_MODEL_REVISION = "main"
+# 감정 분류 배치 크기 (CPU 기준)
+EMOTION_BATCH_SIZE = 32
+# 긍정 감정 강화 (Happy, Tender)
+POSITIVE_BIASES = {2: 0.1, 3: 0.1}
+
+
+def load_kobert_tokenizer():
+    """
+    koBERT 토크나이저만 로드합니다. (분류 모델 없이 토큰화만 필요한 경우)
+    """
+    try:
+        return AutoTokenizer.from_pretrained("monologg/kobert", trust_remote_code=True)
+    except ImportError as e:
+        print(f"[ERROR] Missing dependency: {e}")
+        print("Please install required packages:\n    pip install protobuf sentencepiece")
+        raise
+
+
+def load_kobert(device):
+    tokenizer = load_kobert_tokenizer()
+    # `main.py prepare` 로 변환해 둔 가중치가 있으면 메모리 맵으로 바로 올립니다.
+    model = load_prepared("kobert", AutoModelForSequenceClassification, EMOTION_MODEL_ID,
+                          revision=EMOTION_MODEL_REVISION) \
+        or AutoModelForSequenceClassification.from_pretrained(EMOTION_MODEL_ID, revision=EMOTION_MODEL_REVISION)
+    model.to(device)
+    return tokenizer, model, dict(EMOTION_LABELS)
+
+
+def model_revision(model) -> str:
+    # 허브에서 받은 경우 (또는 prepare 때 기록한) 실제 커밋 해시를, 아니면 지정한 리비전을 사용합니다.
+    return getattr(model.config, "_commit_hash", None) or EMOTION_MODEL_REVISION
+
+
+def backend_cache_dir(model) -> str:
+    """
+    백엔드 변환 결과(int8 모델, ONNX)를 저장할 디렉토리를 모델 ID/리비전별로 정합니다.
+    모델이 바뀌면 다른 디렉토리를 쓰므로 이전 모델의 변환 결과를 불러오지 않습니다.
+
+    :param model: 로드된 분류 모델
+    :return: 캐시 디렉토리 경로
+    """
+    key = re.sub(r"[^\w.-]", "_", f"{EMOTION_MODEL_ID}@{model_revision(model)}")
+    return os.path.join(MODEL_CACHE_DIR, "kobert", key)
+
+
+def _apply_positive_bias(logits: torch.Tensor) -> torch.Tensor:
+    for pos_idx, bias in POSITIVE_BIASES.items():
+        logits[:, pos_idx] += bias
+    return logits
+
+
+class EmotionClassifier:
+    def __init__(self, device, backend: str = "torch", num_threads: int = 0):
+        """
+        koBERT 감정 분류기를 초기화합니다.
+
+        :param device: 모델을 올릴 장치
+        :param backend: 감정 분류 백엔드 이름 (torch, torch-int8, onnx)
+        :param num_threads: onnx 백엔드 intra-op 스레드 수 (0 이면 기본값)
+        """
+        self.device = device
+        self.tokenizer, self.model, self.labels = load_kobert(device)
+        self.backend = load_emotion_backend(
+            backend, self.model, self.tokenizer, device, backend_cache_dir(self.model), num_threads
+        )
+
+    @property
+    def model_key(self) -> str:
+        # 리비전이 바뀌면 이전 모델의 분류 결과를 캐시에서 돌려주지 않도록 키에 포함합니다.
+        return f"{EMOTION_MODEL_ID}@{model_revision(self.model)}@{self.backend.name}"
+
+    def open_cache(self) -> EmotionCache:
+        return EmotionCache(EMOTION_CACHE_PATH, self.model_key, POSITIVE_BIASES, EMOTION_CACHE_MAX_ENTRIES)
+
+    def infer_logits(self, texts: list, batch_size: int = EMOTION_BATCH_SIZE) -> list:
+        """
+        텍스트 목록의 (보정된) 로짓을 배치로 계산합니다.
+
+        :param texts: 분류할 텍스트 목록
+        :param batch_size: 한 번의 forward 에 넣을 텍스트 수
+        :return: 입력 순서와 같은 순서의 로짓 리스트 목록
+        """
+        return self.infer_logits_from_ids(self.tokenizer(texts, truncation=True)["input_ids"], batch_size)
+
+    def infer_logits_from_ids(self, seqs: list, batch_size: int = EMOTION_BATCH_SIZE) -> list:
+        """
+        토큰화된 입력의 (보정된) 로짓을 배치로 계산합니다.
+
+        토큰 길이 순으로 정렬한 뒤 배치마다 해당 배치의 최대 길이까지만 패딩하므로,
+        짧은 댓글이 긴 게시글 길이만큼 패딩되지 않습니다.
+
+        :param seqs: 특수 토큰을 포함한 토큰 ID 시퀀스 목록 (리스트 또는 int32 배열)
+        :param batch_size: 한 번의 forward 에 넣을 텍스트 수
+        :return: 입력 순서와 같은 순서의 로짓 리스트 목록
+        """
+        pad_id = self.tokenizer.pad_token_id or 0
+        order = sorted(range(len(seqs)), key=lambda i: len(seqs[i]))
+
+        results = [None] * len(seqs)
+        with torch.inference_mode():
+            for start in range(0, len(order), batch_size):
+                idxs = order[start:start + batch_size]
+                width = max(len(seqs[i]) for i in idxs)
+                input_ids = torch.full((len(idxs), width), pad_id, dtype=torch.long)
+                attention_mask = torch.zeros((len(idxs), width), dtype=torch.long)
+                for row, i in enumerate(idxs):
+                    n = len(seqs[i])
+                    input_ids[row, :n] = torch.as_tensor(seqs[i], dtype=torch.long)
+                    attention_mask[row, :n] = 1
+                inputs = {
+                    "input_ids": input_ids,
+                    "attention_mask": attention_mask,
+                    "token_type_ids": torch.zeros_like(input_ids),
+                }
+                logits = _apply_positive_bias(self.backend(inputs))
+                for i, row in zip(idxs, logits.tolist()):
+                    results[i] = row
+        return results
+
+    def label_of(self, logits: list) -> str:
+        return self.labels[max(range(len(logits)), key=logits.__getitem__)]
+
+    def get_emotions(self, texts, batch_size: int = EMOTION_BATCH_SIZE, cache: EmotionCache = None,
+                     token_ids: list = None) -> list:
+        """
+        여러 텍스트의 감정을 배치로 분류합니다.
+
+        :param texts: 분류할 텍스트 목록
+        :param batch_size: 한 번의 forward 에 넣을 텍스트 수
+        :param cache: 감정 분류 캐시 (선택적)
+        :param token_ids: texts 와 같은 순서의 토큰 ID 시퀀스 목록 (주어지면 다시 토큰화하지 않음)
+        :return: 입력 순서와 같은 순서의 감정 라벨 목록
+        """
+        return self.classify(texts, batch_size, cache, token_ids)[0]
+
+    def classify(self, texts, batch_size: int = EMOTION_BATCH_SIZE, cache: EmotionCache = None,
+                 token_ids: list = None) -> tuple:
+        """
+        여러 텍스트의 감정 라벨과 (보정된) 로짓을 배치로 계산합니다.
+
+        캐시가 주어지면 캐시에 없는 텍스트만 모델에 보내고 결과를 캐시에 저장합니다.
+
+        :param texts: 분류할 텍스트 목록
+        :param batch_size: 한 번의 forward 에 넣을 텍스트 수
+        :param cache: 감정 분류 캐시 (선택적)
+        :param token_ids: texts 와 같은 순서의 토큰 ID 시퀀스 목록 (주어지면 다시 토큰화하지 않음)
+        :return: (감정 라벨 목록, 로짓 리스트 목록) 튜플, 입력 순서와 같은 순서
+        """
+        texts = list(texts)
+        if not texts:
+            return [], []
+        if cache is None:
+            if token_ids is not None:
+                logits = self.infer_logits_from_ids(token_ids, batch_size)
+            else:
+                logits = self.infer_logits(texts, batch_size)
+            return [self.label_of(row) for row in logits], logits
+
+        keys = [cache.key(t) for t in texts]
+        found = cache.get_many(keys)
+        # 같은 텍스트(예: "ㅋㅋ")가 여러 번 나와도 한 번만 추론
+        missing = {}
+        for i, k in enumerate(keys):
+            if k not in found and k not in missing:
+                missing[k] = i
+        if missing:
+            miss_keys = list(missing)
+            if token_ids is not None:
+                logits = self.infer_logits_from_ids([token_ids[missing[k]] for k in miss_keys], batch_size)
+            else:
+                logits = self.infer_logits([texts[missing[k]] for k in miss_keys], batch_size)
+            new_items = []
+            for k, row in zip(miss_keys, logits):
+                label = self.label_of(row)
+                found[k] = (label, row)
+                new_items.append((k, label, row))
+            cache.put_many(new_items)
+        return [found[k][0] for k in keys], [found[k][1] for k in keys]
+
+
+# 멀티 프로세스 분류용 워커 상태 (워커 프로세스마다 한 번만 초기화)
+_worker_classifier = None
+_worker_cache = None
+_worker_tokens = {}
+
+
+def init_worker(backend: str, num_threads: int, token_prefixes: dict = None) -> None:
+    """
+    워커 프로세스에서 분류기를 한 번 로드합니다.
+
+    :param backend: 감정 분류 백엔드 이름
+    :param num_threads: 워커당 intra-op 스레드 수
+    :param token_prefixes: {섹션 이름: 토큰 캐시 파일 접두사} (메모리 맵으로 열어 프로세스 간 페이지 공유)
+    """
+    global _worker_classifier, _worker_cache, _worker_tokens
+    torch.set_num_threads(num_threads)
+    _worker_classifier = EmotionClassifier(torch.device("cpu"), backend, num_threads)
+    _worker_cache = _worker_classifier.open_cache()
+    _worker_tokens = {name: TokenizedTexts(prefix) for name, prefix in (token_prefixes or {}).items()}
+
+
+def classify_in_worker(texts: list, refs: list = None) -> tuple:
+    """
+    워커 프로세스에서 텍스트 묶음을 분류합니다.
+
+    :param texts: 분류할 텍스트 목록
+    :param refs: texts 와 같은 순서의 (섹션 이름, 행) 목록 (토큰 캐시 사용 시)
+    :return: (로짓 리스트 목록, 캐시 hits, 캐시 misses) 튜플
+    """
+    hits, misses = _worker_cache.hits, _worker_cache.misses
+    token_ids = [_worker_tokens[name][row] for name, row in refs] if refs is not None else None
+    _, logits = _worker_classifier.classify(texts, cache=_worker_cache, token_ids=token_ids)
+    return logits, _worker_cache.hits - hits, _worker_cache.misses - misses
@@ -0,0 +1,174 @@
+import os
+import csv
+import glob
+import numpy as np
+
+EMOTION_HEADER = ["post_id", "post_emotion", "reply_emotions"]
+# 분류 모델 출력 인덱스별 감정 라벨 (확률 벡터의 열 순서)
+EMOTION_LABELS = {0:"Angry",1:"Fear",2:"Happy",3:"Tender",4:"Sad"}
+NUM_EMOTIONS = len(EMOTION_LABELS)
+
+
+def read_emotion_rows(path: str) -> dict:
+    """
+    emotions.csv 에 이미 기록된 결과를 읽습니다.
+
+    같은 게시글이 여러 번 기록되어 있으면 마지막 행이 우선합니다.
+    파일은 수정하지 않으며, 열 수가 모자란 (잘린) 행은 건너뜁니다.
+
+    :param path: emotions.csv 경로
+    :return: {post_id: (게시글 감정, 댓글 감정 리스트)} 딕셔너리
+    """
+    rows = {}
+    if not os.path.exists(path):
+        return rows
+    with open(path, newline='', encoding="utf8") as f:
+        reader = csv.reader(f)
+        for row in reader:
+            if len(row) < len(EMOTION_HEADER) or row[0] == EMOTION_HEADER[0]:
+                continue
+            pid, post_emotion, reply_emotions = int(row[0]), row[1], row[2]
+            rows[pid] = (post_emotion, reply_emotions.split("|") if reply_emotions else [])
+    return rows
+
+
+def write_emotion_rows(path: str, rows: dict) -> None:
+    """
+    결과 전체를 임시 파일에 쓴 뒤 원자적으로 교체합니다.
+
+    :param path: emotions.csv 경로
+    :param rows: {post_id: (게시글 감정, 댓글 감정 리스트)} 딕셔너리
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", newline='', encoding="utf8") as fw:
+        writer = csv.writer(fw)
+        writer.writerow(EMOTION_HEADER)
+        for pid, (post_emotion, reply_emotions) in rows.items():
+            writer.writerow([pid, post_emotion, "|".join(reply_emotions)])
+        fw.flush()
+        os.fsync(fw.fileno())
+    os.replace(tmp_path, path)
+
+
+def softmax_probs(logits) -> np.ndarray:
+    """
+    로짓을 float16 확률 벡터로 변환합니다.
+
+    :param logits: (N, 라벨 수) 로짓
+    :return: (N, 라벨 수) float16 배열
+    """
+    logits = np.asarray(logits, dtype=np.float32).reshape(-1, NUM_EMOTIONS)
+    exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return (exp / exp.sum(axis=1, keepdims=True)).astype(np.float16)
+
+
+class EmotionProbabilityStore:
+    def __init__(self, root: str):
+        """
+        게시글/댓글 감정 확률 벡터 저장소를 초기화합니다.
+
+        결과는 part-XXXXXX.npz 파일 단위로 추가되며 각 파일은 다음 배열을 담습니다.
+        - post_ids (N,) int64, post_probs (N, 5) float16
+        - reply_post_ids (M,) int64, reply_probs (M, 5) float16 (게시글 내 reply.csv 순서)
+
+        같은 게시글이 여러 파일에 있으면 나중 파일이 우선합니다.
+
+        :param root: 저장 디렉토리
+        """
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def parts(self) -> list:
+        return sorted(glob.glob(os.path.join(self.root, "part-*.npz")))
+
+    def _next_part_path(self) -> str:
+        parts = self.parts()
+        last = int(os.path.basename(parts[-1])[5:-4]) if parts else 0
+        return os.path.join(self.root, f"part-{last + 1:06d}.npz")
+
+    def _write_part(self, path: str, post_ids, post_probs, reply_post_ids, reply_probs) -> None:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                post_ids=np.asarray(post_ids, dtype=np.int64),
+                post_probs=np.asarray(post_probs, dtype=np.float16).reshape(-1, NUM_EMOTIONS),
+                reply_post_ids=np.asarray(reply_post_ids, dtype=np.int64),
+                reply_probs=np.asarray(reply_probs, dtype=np.float16).reshape(-1, NUM_EMOTIONS),
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def append(self, entries: dict) -> None:
+        """
+        게시글 묶음의 확률 벡터를 새 파일로 기록합니다.
+
+        :param entries: {post_id: (게시글 확률 (5,), 댓글 확률 (k, 5))} 딕셔너리
+        """
+        if entries:
+            self._write_part(self._next_part_path(), *_flatten(entries))
+
+    def load(self) -> dict:
+        """
+        저장된 확률 벡터를 모두 읽습니다.
+
+        :return: {post_id: (게시글 확률 (5,), 댓글 확률 (k, 5))} 딕셔너리
+        """
+        entries = {}
+        for path in self.parts():
+            try:
+                data = np.load(path)
+                post_ids, post_probs = data["post_ids"], data["post_probs"]
+                reply_post_ids, reply_probs = data["reply_post_ids"], data["reply_probs"]
+            except (OSError, ValueError, KeyError) as e:
+                # 원자적 교체 이전에 중단된 파일은 무시
+                print(f"[WARNING] Skipping unreadable emotion part {path}: {e}")
+                continue
+            # reply_post_ids 는 게시글 순서대로 연속해서 기록됩니다.
+            counts = dict(zip(*np.unique(reply_post_ids, return_counts=True)))
+            offset = 0
+            for pid, probs in zip(post_ids.tolist(), post_probs):
+                n = int(counts.get(pid, 0))
+                entries[pid] = (probs, reply_probs[offset:offset + n])
+                offset += n
+        return entries
+
+    def compact(self, entries: dict) -> None:
+        """
+        모든 결과를 하나의 파일로 합치고 이전 파일을 삭제합니다.
+
+        :param entries: load() 형식의 전체 결과
+        """
+        parts = self.parts()
+        if len(parts) <= 1:
+            return
+        self._write_part(self._next_part_path(), *_flatten(entries))
+        for path in parts:
+            os.remove(path)
+
+
+def _flatten(entries: dict) -> tuple:
+    post_ids = list(entries)
+    post_probs = [entries[pid][0] for pid in post_ids]
+    reply_post_ids, reply_probs = [], []
+    for pid in post_ids:
+        probs = entries[pid][1]
+        reply_post_ids.extend([pid] * len(probs))
+        reply_probs.extend(probs)
+    return post_ids, post_probs, reply_post_ids, reply_probs
+
+
+def derive_emotion_rows(entries: dict, labels: dict) -> dict:
+    """
+    확률 벡터에서 emotions.csv 행을 만듭니다.
+
+    :param entries: {post_id: (게시글 확률, 댓글 확률)} 딕셔너리
+    :param labels: {라벨 인덱스: 라벨 이름} 딕셔너리
+    :return: write_emotion_rows 에 넘길 {post_id: (게시글 감정, 댓글 감정 리스트)} 딕셔너리
+    """
+    rows = {}
+    for pid, (post_probs, reply_probs) in entries.items():
+        reply_idx = np.asarray(reply_probs).reshape(-1, NUM_EMOTIONS).argmax(axis=1).tolist()
+        rows[pid] = (labels[int(np.argmax(post_probs))], [labels[i] for i in reply_idx])
+    return rows
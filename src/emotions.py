@@ -0,0 +1,175 @@
+import os
+import random
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from config import EMOTION_BACKEND, TOKEN_CACHE_DIR
+from corpus import load_corpus
+from emotion_cache import EmotionCache
+from emotion_backend import check_parity, TorchBackend
+from emotion_classifier import EMOTION_BATCH_SIZE, EMOTION_LABELS, init_worker, classify_in_worker, load_kobert_tokenizer
+from model_registry import registry
+from token_cache import TokenCache
+from emotion_store import EmotionProbabilityStore, softmax_probs, derive_emotion_rows, write_emotion_rows
+
+# emotions.csv 에 한 번에 기록할 게시글 수
+EMOTION_CHUNK_SIZE = 500
+
+
+def get_emotions(texts, batch_size: int = EMOTION_BATCH_SIZE, cache: EmotionCache = None, token_ids: list = None) -> list:
+    return registry.get("kobert").get_emotions(texts, batch_size, cache, token_ids)
+
+
+def get_emotion(text: str) -> str:
+    return get_emotions([text])[0]
+
+
+def check_emotion_parity(sample_size: int = 512, batch_size: int = EMOTION_BATCH_SIZE,
+                         contents_path: str = None, reply_path: str = None) -> dict:
+    """
+    현재 감정 분류 백엔드와 fp32 PyTorch 모델의 라벨 일치율을 코퍼스 표본으로 측정합니다.
+
+    :param sample_size: 표본 텍스트 수
+    :param batch_size: 배치 크기
+    :param contents_path: 게시글 CSV 경로
+    :param reply_path: 댓글 CSV 경로
+    :return: check_parity 결과 딕셔너리
+    """
+    classifier = registry.get("kobert")
+    corpus = load_corpus(None, contents_path, reply_path)
+    texts = corpus.contents_df["contents"].tolist() + corpus.replies_df["reply_content"].tolist()
+    texts = random.Random(0).sample(texts, min(sample_size, len(texts)))
+    batches = [
+        classifier.tokenizer(texts[i:i + batch_size], padding=True, truncation=True, return_tensors="pt")
+        for i in range(0, len(texts), batch_size)
+    ]
+    backend = classifier.backend
+    result = check_parity(TorchBackend(classifier.model, classifier.device), backend, batches)
+    print(f"[INFO] Emotion backend parity ({backend.name} vs torch fp32): "
+          f"agreement={result['agreement']:.2%} on {result['samples']} texts, "
+          f"max logit diff={result['max_logit_diff']:.4f}, "
+          f"throughput {result['reference_texts_per_sec']:.1f} -> {result['candidate_texts_per_sec']:.1f} texts/s")
+    return result
+
+
+def parse_emotion(contents_path: str = None, reply_path: str = None, out_path: str = None,
+                  incremental: bool = True, chunk_size: int = EMOTION_CHUNK_SIZE, workers: int = 1) -> None:
+    """
+    코퍼스의 게시글/댓글 감정을 분류하여 emotions.csv 에 저장합니다.
+
+    softmax 확률 벡터가 chunk_size 게시글 단위로 emotions.csv 옆 emotion_probs 디렉토리에 기록되고
+    디스크에 동기화되므로, 중단된 실행은 다음 실행에서 남은 게시글부터 이어서 처리합니다.
+    emotions.csv 는 저장된 확률 벡터에서 다시 만들어집니다.
+
+    :param contents_path: 게시글 CSV 경로 (기본값: resource/contents.csv)
+    :param reply_path: 댓글 CSV 경로 (기본값: resource/reply.csv)
+    :param out_path: 결과 CSV 경로 (기본값: resource/emotions.csv)
+    :param incremental: True 이면 새 게시글과 댓글이 늘어난 게시글만 처리, False 이면 처음부터 다시 처리
+    :param chunk_size: 한 번에 분류하고 기록할 게시글 수
+    :param workers: 분류 프로세스 수 (2 이상이면 게시글 묶음을 프로세스 풀에 나누어 분류)
+    """
+    base = os.path.dirname(__file__)
+    corpus = load_corpus(base, contents_path, reply_path)
+    out_path = out_path or os.path.join(base, "resource/emotions.csv")
+    store = EmotionProbabilityStore(os.path.join(os.path.dirname(os.path.abspath(out_path)), "emotion_probs"))
+
+    if not incremental:
+        for path in store.parts():
+            os.remove(path)
+    done = store.load()
+
+    # 새 게시글과 기록 이후 댓글이 늘어난 게시글만 처리
+    pending = {}
+    for row, pid, reply_rows in corpus.iter_post_rows():
+        if pid in pending:
+            continue
+        if pid not in done or len(done[pid][1]) < len(reply_rows):
+            pending[pid] = (row, reply_rows)
+    print(f"[INFO] {len(pending)}/{len(corpus)} posts need emotion analysis ({len(done)} already saved)")
+
+    # 토크나이저 지문이 같으면 이전 실행의 토큰화 결과를 메모리 맵으로 재사용
+    post_texts = corpus.contents_df["contents"].tolist()
+    reply_texts = corpus.replies_df["reply_content"].tolist()
+    # 여러 프로세스로 분류할 때는 워커가 각자 분류기를 로드하므로, 부모는 토크나이저만 로드합니다.
+    if registry.is_loaded("kobert"):
+        tokenizer = registry.get("kobert").tokenizer
+    else:
+        tokenizer = load_kobert_tokenizer()
+    token_cache = TokenCache(TOKEN_CACHE_DIR, tokenizer)
+    tokens = {
+        "posts": token_cache.section("posts", post_texts),
+        "replies": token_cache.section("replies", reply_texts),
+    }
+
+    pending_ids = list(pending)
+    chunks = []
+    for start in range(0, len(pending_ids), chunk_size):
+        chunk_ids = pending_ids[start:start + chunk_size]
+        refs = [("posts", pending[pid][0]) for pid in chunk_ids]
+        for pid in chunk_ids:
+            refs.extend(("replies", int(r)) for r in pending[pid][1])
+        texts = [post_texts[r] if name == "posts" else reply_texts[r] for name, r in refs]
+        chunks.append((chunk_ids, texts, refs))
+
+    cache = None
+    executor = None
+    if workers > 1 and len(chunks) > 1:
+        # 워커마다 분류기를 한 번 로드하고, 코어를 나누어 intra-op 스레드를 설정
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        ctx = multiprocessing.get_context("spawn")
+        executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=ctx,
+            initializer=init_worker,
+            initargs=(EMOTION_BACKEND, threads, {name: t.prefix for name, t in tokens.items()}),
+        )
+        print(f"[INFO] Classifying with {workers} workers x {threads} threads")
+        results = executor.map(classify_in_worker, [texts for _, texts, _ in chunks], [refs for _, _, refs in chunks])
+    elif chunks:
+        classifier = registry.get("kobert")
+        cache = classifier.open_cache()
+        results = (
+            (classifier.classify(texts, cache=cache, token_ids=[tokens[name][r] for name, r in refs])[1], 0, 0)
+            for _, texts, refs in chunks
+        )
+    else:
+        results = []
+
+    worker_hits = worker_misses = 0
+    saved = 0
+    for (chunk_ids, texts, _), (logits, hits, misses) in zip(chunks, results):
+        worker_hits += hits
+        worker_misses += misses
+        probs = softmax_probs(logits)
+        entries = {}
+        offset = len(chunk_ids)
+        for i, pid in enumerate(chunk_ids):
+            n_replies = len(pending[pid][1])
+            entries[pid] = (probs[i], probs[offset:offset + n_replies])
+            offset += n_replies
+        store.append(entries)
+        done.update(entries)
+        saved += len(chunk_ids)
+        print(f"[INFO] Saved {saved}/{len(pending_ids)} posts ({len(texts)} texts in this chunk)")
+    if executor is not None:
+        executor.shutdown()
+        print(f"[INFO] Emotion cache (workers): hits={worker_hits} misses={worker_misses}")
+    if cache is not None:
+        print(f"[INFO] Emotion cache: {cache.report()}")
+        cache.close()
+
+    # 부분 파일을 하나로 합치고 확률 벡터에서 emotions.csv 를 다시 생성
+    store.compact(done)
+    rows = derive_emotion_rows(done, EMOTION_LABELS)
+    write_emotion_rows(out_path, rows)
+    print(f"Saved emotion probabilities to {store.root}")
+    print(f"Saved emotions to {out_path}")
+
+    # Print overall emotion counts
+    emotion_counter = {label: 0 for label in EMOTION_LABELS.values()}
+    for pe, re_emotions in rows.values():
+        emotion_counter[pe] += 1
+        for emo in re_emotions:
+            emotion_counter[emo] += 1
+    print("Emotion counts:")
+    for emotion, count in emotion_counter.items():
+        print(f"{emotion}: {count}")
@@ -0,0 +1,124 @@
+import os
+import json
+import re
+import random
+import pandas as pd
+
+from corpus import load_corpus
+from model_registry import registry
+
+
+def generate_post(user_prompt: str, emotions_path: str = None, contents_path: str = None, reply_path: str = None) -> None:
+    base = os.path.dirname(__file__)
+    emotions_path = emotions_path or os.path.join(base, "resource/emotions.csv")
+    
+    if not os.path.exists(emotions_path):
+        print("[ERROR] emotions.csv not found. Please run emotion analysis first.")
+        return
+
+    # Determine the dominant mood
+    emotions_df = pd.read_csv(emotions_path)
+    all_emotions = emotions_df['post_emotion'].tolist()
+    for r_emotions in emotions_df['reply_emotions'].dropna():
+        all_emotions.extend(r_emotions.split('|'))
+    
+    dominant_emotion = pd.Series(all_emotions).mode()[0]
+    print(f"[INFO] Dominant mood of the community is '{dominant_emotion}'.")
+
+    # Load existing posts and replies to provide as examples
+    corpus = load_corpus(base, contents_path, reply_path)
+    contents_df = corpus.contents_df
+
+    example_text = "다음은 이 커뮤니티의 실제 게시글과 댓글의 예시입니다. 이 스타일과 분위기를 참고하여 글을 작성해주세요.\\n\\n"
+    
+    # Sample 2 posts to use as few-shot examples
+    num_samples = min(2, len(contents_df))
+    if num_samples > 0:
+        for i, (_, post) in enumerate(contents_df.sample(n=num_samples).iterrows(), 1):
+            example_text += f"--- 예시 {i} ---\\n"
+            example_text += f"게시글: {post['contents']}\\n"
+            
+            for r_idx, reply in enumerate(corpus.replies_of(post['id']), 1):
+                example_text += f"댓글 {r_idx}: {reply}\\n"
+            example_text += f"--- 예시 끝 ---\\n\\n"
+
+    # Create a prompt for the LLM
+    LLM_tokenizer, LLM_model = registry.get("llama")
+    num_replies = random.randint(1, 3)
+    instruction = (
+        f"당신은 온라인 커뮤니티의 분위기를 잘 파악하여 사람들을 {user_prompt}로 이끌어야 합니다. "
+        f"이 커뮤니티의 전반적인 분위기는 '{dominant_emotion}'입니다. "
+        f"{example_text}"
+        f"이제, 이 분위기를 잘 살려서 다음 주제에 대한 새로운 게시글 1개와 그에 대한 댓글 {num_replies}개를 작성해주세요. "
+        f"응답은 반드시 JSON 형식이어야 하며, 키는 'new_post'와 'new_replies' (댓글 {num_replies}개를 담은 리스트)를 포함해야 합니다.\\n\\n"
+        f"주제: {user_prompt}"
+    )
+
+    messages = [{"role": "user", "content": instruction}]
+
+    prompt_string = LLM_tokenizer.apply_chat_template(
+        messages,
+        tokenize=False,
+        add_generation_prompt=True
+    )
+    inputs = LLM_tokenizer(
+        prompt_string,
+        return_tensors="pt",
+        padding=True,
+        truncation=True,
+        max_length=4096,
+        return_attention_mask=True
+    )
+
+    inputs_on_device = {k: v.to(LLM_model.device) for k, v in inputs.items()}
+
+    terminators = [
+        LLM_tokenizer.eos_token_id,
+        LLM_tokenizer.convert_tokens_to_ids("<|eot_id|>")
+    ]
+
+    outputs = LLM_model.generate(
+        **inputs_on_device,
+        pad_token_id=LLM_tokenizer.pad_token_id,
+        max_new_tokens=1024,
+        eos_token_id=terminators,
+        do_sample=True,
+        temperature=0.7,
+        top_p=0.9,
+    )
+
+    input_length = inputs_on_device['input_ids'].shape[1]
+    raw = LLM_tokenizer.decode(outputs[0][input_length:], skip_special_tokens=True)
+    
+    print("\n--- 생성된 글 ---")
+    try:
+        json_match = re.search(r'\{.*\}', raw, re.DOTALL)
+        if json_match:
+            json_str = json_match.group(0)
+            parsed_json = json.loads(json_str)
+            
+            if 'new_post' in parsed_json:
+                print(f"게시글: {parsed_json['new_post']}\n")
+            if 'new_replies' in parsed_json and isinstance(parsed_json['new_replies'], list):
+                for i, reply in enumerate(parsed_json['new_replies'], 1):
+                    print(f"댓글 {i}: {reply}")
+        else:
+            print("생성된 내용에서 JSON 형식을 찾지 못했습니다. 원본 응답:")
+            print(raw)
+            
+    except json.JSONDecodeError:
+        print("생성된 JSON을 파싱하는 데 실패했습니다. 원본 응답:")
+        print(raw)
+    print("----------------\n")
+
+def interactive_post_generation(**paths):
+    print("\n[INFO] 지금부터 프롬프트를 입력하여 게시글 생성을 시작할 수 있습니다.")
+    print("[INFO] 종료하려면 'exit' 또는 'quit'을 입력하세요.")
+    while True:
+        user_prompt = input("게시글 주제를 입력하세요 > ")
+        if user_prompt.lower() in ['exit', 'quit']:
+            print("프로그램을 종료합니다.")
+            break
+        if not user_prompt:
+            continue
+        generate_post(user_prompt, **paths)
@@ -0,0 +1,151 @@
+import torch
+
+# 응답 앞부분은 프롬프트에 미리 채워 두고, 모델은 리스트 내용부터 생성합니다.
+SUBJECTS_JSON_PREFILL = '{"subjects": ['
+
+# {"subjects": ["주제1", "주제2"]} 의 리스트 부분을 받아들이는 문자 단위 오토마타 상태
+DEAD = -1
+LIST_START = 0    # '[' 직후: 공백, '"', ']'
+IN_STRING = 1     # 문자열 내부
+ESCAPE = 2        # 문자열 내부 '\' 직후
+AFTER_STRING = 3  # 닫는 '"' 직후: 공백, ',', ']'
+AFTER_COMMA = 4   # ',' 직후: 공백, '"'
+AFTER_LIST = 5    # ']' 직후: 공백, '}'
+DONE = 6          # '}' 까지 닫힘: EOS 만 허용
+NUM_STATES = 7
+
+_WHITESPACE = " \t\n\r"
+_transitions = {
+    LIST_START: {'"': IN_STRING, ']': AFTER_LIST},
+    AFTER_STRING: {',': AFTER_COMMA, ']': AFTER_LIST},
+    AFTER_COMMA: {'"': IN_STRING},
+    AFTER_LIST: {'}': DONE},
+}
+
+# 토크나이저별 전이 테이블 캐시
+_tables = {}
+
+
+def step(state: int, ch: str) -> int:
+    """
+    문자 하나를 읽은 뒤의 상태를 반환합니다.
+
+    :param state: 현재 상태
+    :param ch: 다음 문자
+    :return: 다음 상태 (허용되지 않으면 DEAD)
+    """
+    if state == IN_STRING:
+        if ch == '"':
+            return AFTER_STRING
+        if ch == '\\':
+            return ESCAPE
+        return DEAD if ord(ch) < 0x20 else IN_STRING
+    if state == ESCAPE:
+        return IN_STRING if ch in '"\\/bfnrtu' else DEAD
+    if state in _transitions:
+        if ch in _WHITESPACE:
+            return state
+        return _transitions[state].get(ch, DEAD)
+    return DEAD
+
+
+def advance(state: int, text: str) -> int:
+    """
+    문자열 전체를 읽은 뒤의 상태를 반환합니다.
+
+    토큰 하나가 여러 구조 문자를 포함할 수 있으므로 (예: '"]}') 문자 단위로 진행합니다.
+    바이트 단위 토큰이 디코딩된 '�' 는 일반 문자로 취급되어 문자열 안에서만 허용됩니다.
+
+    :param state: 시작 상태
+    :param text: 토큰 문자열
+    :return: 마지막 상태 (중간에 허용되지 않는 문자가 있으면 DEAD)
+    """
+    for ch in text:
+        state = step(state, ch)
+        if state == DEAD:
+            return DEAD
+    return state
+
+
+def build_table(token_texts: list, special_ids, eos_ids, vocab_size: int) -> list:
+    """
+    (상태, 토큰) → 다음 상태 전이 테이블을 만듭니다.
+
+    특수 토큰과 빈 토큰은 어느 상태에서도 허용하지 않고, EOS 는 DONE 상태에서만 허용합니다.
+
+    :param token_texts: 토큰 ID 순서의 디코딩된 토큰 문자열
+    :param special_ids: 특수 토큰 ID 집합
+    :param eos_ids: 종료 토큰 ID 목록
+    :param vocab_size: 모델 로짓 차원 (토크나이저 어휘보다 클 수 있음)
+    :return: NUM_STATES x vocab_size 리스트
+    """
+    special_ids = set(special_ids)
+    table = [[DEAD] * vocab_size for _ in range(NUM_STATES)]
+    for token_id, text in enumerate(token_texts[:vocab_size]):
+        if token_id in special_ids or not text:
+            continue
+        for state in range(DONE):
+            table[state][token_id] = advance(state, text)
+    for token_id in eos_ids:
+        if token_id is not None and token_id < vocab_size:
+            table[DONE][token_id] = DONE
+    return table
+
+
+class SubjectsJsonProcessor:
+    def __init__(self, table: torch.Tensor, rows: list):
+        """
+        생성 토큰을 {"subjects": [...]} 형식으로 제한하는 logits processor 입니다.
+
+        generate 호출마다 새로 만들어야 합니다. 첫 호출의 입력 길이를 프롬프트 길이로 보고,
+        이후에는 행별로 생성된 토큰을 따라 상태를 진행시킨 뒤 다음 상태가 DEAD 인 토큰을 막습니다.
+        보조(assisted) 디코딩에서는 거절된 후보 위치가 다른 토큰으로 다시 호출되므로,
+        이전에 처리한 토큰과 공통인 접두사까지만 상태를 재사용합니다.
+
+        :param table: get_transition_table 이 반환한 (NUM_STATES, vocab) int8 텐서
+        :param rows: 같은 테이블의 리스트 형태 (토큰 단위 상태 진행용)
+        """
+        self.table = table
+        self.rows = rows
+        self.prompt_len = None
+        self.history = None  # 행별 (처리한 토큰 리스트, 각 위치의 상태 리스트)
+
+    def _states(self, input_ids: torch.LongTensor) -> list:
+        if self.prompt_len is None:
+            self.prompt_len = input_ids.shape[1]
+            self.history = [([], [LIST_START]) for _ in range(input_ids.shape[0])]
+        states = []
+        for (tokens, path), generated in zip(self.history, input_ids[:, self.prompt_len:].tolist()):
+            keep = min(len(tokens), len(generated))
+            if tokens[:keep] != generated[:keep]:
+                keep = next(i for i, (a, b) in enumerate(zip(tokens, generated)) if a != b)
+            del tokens[keep:], path[keep + 1:]
+            for token in generated[keep:]:
+                state = self.rows[path[-1]][token] if path[-1] != DEAD else DEAD
+                # 이미 끝난 행이나 예상치 못한 토큰은 DONE 으로 보내 EOS 만 나오게 합니다.
+                tokens.append(token)
+                path.append(DONE if state == DEAD else state)
+            states.append(path[-1])
+        return states
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor) -> torch.FloatTensor:
+        states = torch.tensor(self._states(input_ids), dtype=torch.long)
+        allowed = self.table[states, :scores.shape[-1]].to(scores.device) != DEAD
+        return scores.masked_fill(~allowed, float("-inf"))
+
+
+def get_transition_table(tokenizer, vocab_size: int, eos_ids: list) -> tuple:
+    """
+    토크나이저별 전이 테이블을 한 번만 만들어 반환합니다.
+
+    :param tokenizer: Llama 토크나이저
+    :param vocab_size: 모델 로짓 차원
+    :param eos_ids: 종료 토큰 ID 목록
+    :return: ((NUM_STATES, vocab_size) int8 텐서, 같은 내용의 리스트) 튜플
+    """
+    key = (tokenizer.name_or_path, vocab_size, tuple(eos_ids))
+    if key not in _tables:
+        token_texts = tokenizer.batch_decode([[i] for i in range(len(tokenizer))])
+        table = build_table(token_texts, tokenizer.all_special_ids, eos_ids, vocab_size)
+        _tables[key] = (torch.tensor(table, dtype=torch.int8), table)
+    return _tables[key]
@@ -0,0 +1,83 @@
+import gc
+import sys
+import resource
+import torch
+
+# LLM_QUANTIZATION 설정값
+#   none: bf16/fp32 가중치 그대로 사용
+#   int8: nn.Linear 가중치를 int8 로 동적 양자화 (CPU 전용)
+LLM_QUANTIZATIONS = ["none", "int8"]
+
+
+def quantize_int8(model):
+    """
+    디코더 레이어와 lm_head 의 nn.Linear 를 int8 동적 양자화 모듈로 제자리에서 교체합니다.
+
+    동적 양자화는 fp32 가중치에서만 동작하므로 레이어를 하나씩 fp32 로 올린 뒤 바로 양자화합니다.
+    lm_head 는 가중치의 fp32 복사본을 만들어 바로 양자화하므로, 임베딩과 가중치를 공유해도 임베딩은 bf16 으로 남습니다.
+    전체 모델을 fp32 로 바꾼 뒤 양자화하면 3B 모델 기준 12GB 이상이 필요하지만,
+    이 방식은 bf16 모델 크기에 레이어 하나 (마지막에는 lm_head 하나, 3B 기준 약 1.5GB) 분량만 더 사용합니다.
+
+    :param model: CPU 에 올라간 Hugging Face causal LM (bf16 또는 fp32)
+    :return: 양자화된 모델 (같은 객체)
+    """
+    for layer in model.model.layers:
+        layer.float()
+        torch.ao.quantization.quantize_dynamic(layer, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+        gc.collect()
+    model.model.norm.float()
+    # 임베딩은 bf16 으로 두고 출력만 fp32 로 바꿔 양자화된 레이어에 넘깁니다.
+    model.get_input_embeddings().register_forward_hook(lambda module, inputs, output: output.float())
+
+    head = model.get_output_embeddings()
+    fp32_head = torch.nn.Linear(head.in_features, head.out_features, bias=head.bias is not None, device="meta")
+    fp32_head.weight = torch.nn.Parameter(head.weight.detach().float(), requires_grad=False)
+    if head.bias is not None:
+        fp32_head.bias = torch.nn.Parameter(head.bias.detach().float(), requires_grad=False)
+    # quantize_dynamic 은 하위 모듈만 교체하므로 Sequential 로 감싸서 양자화합니다.
+    qhead = torch.ao.quantization.quantize_dynamic(torch.nn.Sequential(fp32_head), {torch.nn.Linear},
+                                                   dtype=torch.qint8)[0]
+    del fp32_head
+    model.set_output_embeddings(qhead)
+    model.config.tie_word_embeddings = False
+    model.config.torch_dtype = torch.float32
+    gc.collect()
+    return model.eval()
+
+
+def model_memory_bytes(model) -> int:
+    """
+    모델 가중치가 차지하는 메모리를 계산합니다. 양자화 모듈의 packed 가중치도 포함합니다.
+
+    :param model: PyTorch 모델
+    :return: 바이트 수
+    """
+    seen = set()
+    total = 0
+    for tensor in list(model.parameters()) + list(model.buffers()):
+        if tensor.data_ptr() not in seen:
+            seen.add(tensor.data_ptr())
+            total += tensor.numel() * tensor.element_size()
+    for module in model.modules():
+        if isinstance(module, torch.ao.nn.quantized.dynamic.Linear):
+            weight, bias = module._weight_bias()
+            total += weight.numel() * weight.element_size()
+            if bias is not None:
+                total += bias.numel() * bias.element_size()
+    return total
+
+
+def peak_rss_bytes() -> int:
+    """
+    현재 프로세스의 최대 상주 메모리(RSS)를 반환합니다.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS 는 바이트, Linux 는 KB 단위
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def memory_report(model, name: str) -> str:
+    gb = 1024 ** 3
+    return (f"{name}: weights {model_memory_bytes(model) / gb:.2f} GB, "
+            f"process peak RSS {peak_rss_bytes() / gb:.2f} GB")
+
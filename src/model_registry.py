@@ -0,0 +1,157 @@
+import gc
+import time
+import logging
+import threading
+import torch
+
+LLAMA_MODEL_ID = 'Bllossom/llama-3.2-Korean-Bllossom-3B'
+
+
+class ModelRegistry:
+    def __init__(self):
+        """
+        모델을 처음 사용할 때 로드하는 레지스트리를 초기화합니다.
+        """
+        self._loaders = {}
+        self._models = {}
+        self._load_times = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, loader) -> None:
+        """
+        모델 로더를 등록합니다.
+
+        :param name: 모델 이름
+        :param loader: 인자 없이 호출하면 모델 객체를 반환하는 함수
+        """
+        self._loaders[name] = loader
+
+    def get(self, name: str):
+        """
+        모델을 반환합니다. 아직 로드되지 않았으면 지금 로드합니다.
+
+        :param name: 모델 이름
+        :return: 로더가 반환한 모델 객체
+        """
+        with self._lock:
+            if name not in self._models:
+                if name not in self._loaders:
+                    raise KeyError(f"Unknown model: {name}")
+                start = time.perf_counter()
+                self._models[name] = self._loaders[name]()
+                self._load_times[name] = time.perf_counter() - start
+                logging.info(f"모델 '{name}' 로드 완료 ({self._load_times[name]:.1f}s)")
+            return self._models[name]
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def unload(self, name: str) -> None:
+        """
+        로드된 모델을 메모리에서 내립니다.
+
+        :param name: 모델 이름
+        """
+        with self._lock:
+            if self._models.pop(name, None) is None:
+                return
+            self._load_times.pop(name, None)
+            gc.collect()
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+            logging.info(f"모델 '{name}' 언로드 완료")
+
+    def resident(self) -> dict:
+        """
+        현재 메모리에 올라와 있는 모델과 로드에 걸린 시간을 반환합니다.
+
+        :return: {모델 이름: 로드 시간(초)} 딕셔너리
+        """
+        return dict(self._load_times)
+
+    def report(self) -> str:
+        if not self._models:
+            return "no models loaded"
+        return ", ".join(f"{name} (loaded in {t:.1f}s)" for name, t in self._load_times.items())
+
+
+_device = None
+
+
+def get_device():
+    global _device
+    if _device is None:
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+            torch.cuda.reset_peak_memory_stats()
+        _device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        print(f"[INFO] Using device: {_device}")
+    return _device
+
+
+def load_kobert_classifier():
+    from config import EMOTION_BACKEND
+    from emotion_classifier import EmotionClassifier
+    return EmotionClassifier(get_device(), EMOTION_BACKEND)
+
+
+def load_sentence_encoder():
+    from topic_clusters import SentenceEncoder
+    return SentenceEncoder(get_device())
+
+
+def load_draft_model():
+    from assisted_decoding import load_draft_model as load
+    return load()
+
+
+def load_causal_lm(model_id: str, torch_dtype=torch.bfloat16, quantization: str = "none") -> tuple:
+    """
+    causal LM 과 토크나이저를 로드합니다.
+
+    :param model_id: Hugging Face 모델 ID
+    :param torch_dtype: 양자화하지 않을 때의 가중치 dtype
+    :param quantization: "none" 또는 "int8" (CPU 전용 int8 동적 양자화)
+    :return: (tokenizer, model) 튜플
+    """
+    from transformers import AutoTokenizer, AutoModelForCausalLM
+    from llm_quantization import LLM_QUANTIZATIONS, quantize_int8, memory_report
+    from prepared_models import load_prepared
+    if quantization not in LLM_QUANTIZATIONS:
+        raise ValueError(f"Unknown LLM quantization: {quantization} (choose from {', '.join(LLM_QUANTIZATIONS)})")
+
+    tokenizer = AutoTokenizer.from_pretrained(model_id)
+    tokenizer.pad_token = tokenizer.eos_token
+    # `main.py prepare` 로 변환해 둔 가중치가 있으면 메모리 맵으로 바로 올립니다.
+    dtype = torch.bfloat16 if quantization == "int8" else torch_dtype
+    model = load_prepared("llama", AutoModelForCausalLM, model_id, dtype)
+    if model is not None:
+        if quantization == "int8":
+            quantize_int8(model)
+        else:
+            model.to(get_device())
+    elif quantization == "int8":
+        # 양자화는 CPU 에서만 동작하므로 device_map 없이 bf16 으로 올린 뒤 레이어별로 변환합니다.
+        model = AutoModelForCausalLM.from_pretrained(model_id, torch_dtype=torch.bfloat16, low_cpu_mem_usage=True)
+        quantize_int8(model)
+    else:
+        model = AutoModelForCausalLM.from_pretrained(
+            model_id,
+            torch_dtype=torch_dtype,
+            device_map="auto",
+        )
+    model.config.pad_token_id = tokenizer.pad_token_id
+    logging.info(memory_report(model, f"{model_id} ({quantization})"))
+    return tokenizer, model
+
+
+def load_llama():
+    from config import LLM_QUANTIZATION
+    return load_causal_lm(LLAMA_MODEL_ID, torch.bfloat16, LLM_QUANTIZATION)
+
+
+registry = ModelRegistry()
+registry.register("kobert", load_kobert_classifier)
+registry.register("llama", load_llama)
+registry.register("sentence-encoder", load_sentence_encoder)
+registry.register("llama-draft", load_draft_model)
@@ -0,0 +1,63 @@
+import copy
+import hashlib
+import logging
+import time
+import torch
+
+# (모델 경로, 접두사 해시) → PrefixCache
+_prefix_caches = {}
+
+
+class PrefixCache:
+    def __init__(self, tokenizer, model, text: str):
+        """
+        모든 프롬프트가 공유하는 접두사(채팅 템플릿 머리말 + 지시문)의 past_key_values 를 미리 계산합니다.
+
+        :param tokenizer: Llama 토크나이저
+        :param model: Llama 모델
+        :param text: 공유 접두사 문자열
+        """
+        self.text = text
+        ids = tokenizer(text, return_tensors="pt", add_special_tokens=False)["input_ids"]
+        self.input_ids = ids.to(model.device)
+        start = time.perf_counter()
+        with torch.inference_mode():
+            outputs = model(input_ids=self.input_ids, use_cache=True)
+        self.past_key_values = outputs.past_key_values
+        logging.info(f"접두사 KV 캐시 생성 완료 ({len(self)} tokens, {time.perf_counter() - start:.2f}s)")
+
+    def __len__(self) -> int:
+        return self.input_ids.shape[1]
+
+    def for_batch(self, batch_size: int):
+        """
+        generate 에 넘길 캐시 사본을 배치 크기만큼 복제하여 반환합니다.
+
+        generate 는 캐시를 제자리에서 늘리므로 원본은 건드리지 않고 매번 복사합니다.
+
+        :param batch_size: 배치 크기
+        :return: past_key_values 사본
+        """
+        cache = copy.deepcopy(self.past_key_values)
+        if hasattr(cache, "batch_repeat_interleave"):
+            cache.batch_repeat_interleave(batch_size)
+            return cache
+        # 구버전 transformers 의 튜플 형식 캐시
+        return tuple(tuple(t.repeat_interleave(batch_size, dim=0) for t in layer) for layer in cache)
+
+
+def get_prefix_cache(tokenizer, model, text: str) -> PrefixCache:
+    """
+    모델과 접두사 문자열별로 한 번만 계산한 PrefixCache 를 반환합니다.
+
+    지시문이나 채팅 템플릿이 바뀌면 해시가 달라지므로 새로 계산합니다.
+
+    :param tokenizer: Llama 토크나이저
+    :param model: Llama 모델
+    :param text: 공유 접두사 문자열
+    :return: PrefixCache
+    """
+    key = (getattr(model, "name_or_path", id(model)), hashlib.sha256(text.encode("utf8")).hexdigest())
+    if key not in _prefix_caches:
+        _prefix_caches[key] = PrefixCache(tokenizer, model, text)
+    return _prefix_caches[key]
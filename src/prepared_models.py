@@ -0,0 +1,227 @@
+import os
+import re
+import json
+import mmap
+import time
+import struct
+import logging
+import torch
+
+from config import MODEL_CACHE_DIR
+
+# 준비된 모델을 저장할 디렉토리 (모델 이름별 하위 디렉토리)
+PREPARED_DIR = os.path.join(MODEL_CACHE_DIR, "prepared")
+WEIGHTS_FILE = "model.safetensors"
+MANIFEST_FILE = "manifest.json"
+# 상태 dict 에 없는 (persistent=False) 버퍼는 이 접두사로 저장합니다.
+BUFFER_PREFIX = "__buffer__."
+
+_DTYPES = {
+    "F64": torch.float64, "F32": torch.float32, "F16": torch.float16, "BF16": torch.bfloat16,
+    "I64": torch.int64, "I32": torch.int32, "I16": torch.int16, "I8": torch.int8, "U8": torch.uint8,
+    "BOOL": torch.bool,
+}
+
+
+def prepared_path(name: str) -> str:
+    return os.path.join(PREPARED_DIR, name)
+
+
+def read_manifest(name: str) -> dict:
+    path = os.path.join(prepared_path(name), MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf8") as f:
+        return json.load(f)
+
+
+def cached_commit_hash(source_id: str, revision: str) -> str:
+    """
+    리비전이 가리키는 커밋 해시를 네트워크 없이 Hugging Face 캐시의 refs 파일에서 찾습니다.
+
+    :param source_id: 원본 Hugging Face 모델 ID
+    :param revision: 브랜치, 태그 또는 커밋 해시
+    :return: 커밋 해시 (캐시에 없으면 None)
+    """
+    if re.fullmatch(r"[0-9a-f]{40}", revision):
+        return revision
+    from huggingface_hub.constants import HF_HUB_CACHE
+    path = os.path.join(HF_HUB_CACHE, "models--" + source_id.replace("/", "--"), "refs", revision)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf8") as f:
+        return f.read().strip() or None
+
+
+def save_prepared(name: str, model, source_id: str, revision: str = None) -> str:
+    """
+    모델을 최종 dtype 그대로 safetensors 로 저장합니다.
+
+    공유 가중치(tied weights)는 한 번만 저장하고 별칭으로 기록하며,
+    상태 dict 에 없는 버퍼(rotary inv_freq 등)도 함께 저장하여 로드 시 다시 계산하지 않습니다.
+
+    :param name: 준비된 모델 이름 (kobert, llama)
+    :param model: 저장할 Hugging Face 모델
+    :param source_id: 원본 Hugging Face 모델 ID (로드 시 일치 여부 확인)
+    :param revision: from_pretrained 에 넘긴 리비전 (실제 커밋 해시와 함께 기록하여 로드 시 확인)
+    :return: 저장 디렉토리
+    """
+    from safetensors.torch import save_file
+
+    out_dir = prepared_path(name)
+    os.makedirs(out_dir, exist_ok=True)
+    tensors, aliases, seen = {}, {}, {}
+    state = model.state_dict()
+    for key, tensor in state.items():
+        ptr = (tensor.data_ptr(), tensor.dtype, tuple(tensor.shape))
+        if ptr in seen and tensor.numel():
+            aliases[key] = seen[ptr]
+            continue
+        seen[ptr] = key
+        tensors[key] = tensor.detach().cpu().contiguous()
+    for key, buffer in model.named_buffers():
+        if key not in state:
+            tensors[BUFFER_PREFIX + key] = buffer.detach().cpu().contiguous()
+
+    tmp_path = os.path.join(out_dir, WEIGHTS_FILE + ".tmp")
+    save_file(tensors, tmp_path)
+    os.replace(tmp_path, os.path.join(out_dir, WEIGHTS_FILE))
+    model.config.save_pretrained(out_dir)
+    dtype = next(model.parameters()).dtype
+    with open(os.path.join(out_dir, MANIFEST_FILE), "w", encoding="utf8") as f:
+        json.dump({"source": source_id, "revision": revision,
+                   "commit": getattr(model.config, "_commit_hash", None),
+                   "dtype": str(dtype).replace("torch.", ""), "aliases": aliases,
+                   "model_class": type(model).__name__}, f, indent=2)
+    return out_dir
+
+
+def read_safetensors_mmap(path: str) -> dict:
+    """
+    safetensors 파일을 메모리 맵으로 열어 복사 없이 텐서를 만듭니다.
+
+    ACCESS_COPY(쓰기 시 복사) 매핑을 사용하므로 읽기만 하는 동안에는 페이지 캐시를 그대로 공유하며,
+    같은 파일을 여는 여러 프로세스가 물리 메모리를 나눠 씁니다.
+
+    :param path: safetensors 파일 경로
+    :return: {이름: 텐서} 딕셔너리
+    """
+    with open(path, "rb") as f:
+        header_len = struct.unpack("<Q", f.read(8))[0]
+        header = json.loads(f.read(header_len))
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    base = 8 + header_len
+    tensors = {}
+    for key, info in header.items():
+        if key == "__metadata__":
+            continue
+        dtype = _DTYPES[info["dtype"]]
+        start, end = info["data_offsets"]
+        shape = info["shape"]
+        numel = 1
+        for dim in shape:
+            numel *= dim
+        if numel == 0:
+            tensors[key] = torch.empty(shape, dtype=dtype)
+            continue
+        tensors[key] = torch.frombuffer(mm, dtype=dtype, count=numel, offset=base + start).view(shape)
+    return tensors
+
+
+def _set_buffer(model, name: str, tensor: torch.Tensor) -> None:
+    module_name, _, buffer_name = name.rpartition(".")
+    module = model.get_submodule(module_name) if module_name else model
+    module._buffers[buffer_name] = tensor
+
+
+def load_prepared(name: str, model_cls, source_id: str, dtype: torch.dtype = None, revision: str = None):
+    """
+    준비된 모델이 있으면 메모리 맵으로 로드합니다.
+
+    모델 골격은 meta 장치에 만들고 (가중치 초기화 없음), 가중치는 메모리 맵 텐서를 그대로 할당합니다.
+
+    :param name: 준비된 모델 이름
+    :param model_cls: AutoModelForCausalLM 등 from_config 를 가진 클래스
+    :param source_id: 원본 Hugging Face 모델 ID (준비할 때와 다르면 사용하지 않음)
+    :param dtype: 필요한 가중치 dtype (준비할 때와 다르면 사용하지 않음, None 이면 확인하지 않음)
+    :param revision: 필요한 리비전 (준비할 때와 다르거나, 캐시의 현재 커밋 해시가 기록과 다르면 사용하지 않음)
+    :return: 모델 (준비된 모델이 없거나 원본/dtype/리비전이 다르면 None)
+    """
+    from transformers import AutoConfig
+
+    manifest = read_manifest(name)
+    if manifest is None or manifest.get("source") != source_id:
+        return None
+    if dtype is not None and getattr(torch, manifest["dtype"]) != dtype:
+        return None
+    if revision is not None:
+        commit = manifest.get("commit")
+        current = cached_commit_hash(source_id, revision)
+        if manifest.get("revision") != revision or commit is None or (current is not None and current != commit):
+            logging.warning(f"준비된 모델 '{name}' 이 {source_id}@{revision} 과 다른 커밋에서 만들어져 사용하지 않습니다. "
+                            f"`main.py prepare` 로 다시 준비하세요.")
+            return None
+    start = time.perf_counter()
+    out_dir = prepared_path(name)
+    config = AutoConfig.from_pretrained(out_dir)
+    dtype = getattr(torch, manifest["dtype"])
+    with torch.device("meta"):
+        model = model_cls.from_config(config, torch_dtype=dtype)
+
+    tensors = read_safetensors_mmap(os.path.join(out_dir, WEIGHTS_FILE))
+    buffers = {k[len(BUFFER_PREFIX):]: tensors.pop(k) for k in list(tensors) if k.startswith(BUFFER_PREFIX)}
+    for alias, key in manifest.get("aliases", {}).items():
+        tensors[alias] = tensors[key]
+    # 허브에서 받은 모델과 같이 커밋 해시를 설정해 두면 변환 결과/분류 캐시 키가 같은 값을 씁니다.
+    model.config._commit_hash = manifest.get("commit")
+    model.load_state_dict(tensors, strict=False, assign=True)
+    for key, buffer in buffers.items():
+        _set_buffer(model, key, buffer)
+
+    missing = [n for n, t in list(model.named_parameters()) + list(model.named_buffers()) if t.is_meta]
+    if missing:
+        logging.warning(f"준비된 모델 '{name}' 에 없는 가중치가 있어 사용하지 않습니다: {missing[:5]}")
+        return None
+    logging.info(f"준비된 모델 '{name}' 메모리 맵 로드 완료 ({time.perf_counter() - start:.2f}s)")
+    return model.eval()
+
+
+def _load_source(name: str):
+    """
+    prepare 명령에서 원본 모델을 from_pretrained 로 로드합니다.
+
+    :return: (모델, 모델 클래스, 원본 ID, 리비전) 튜플
+    """
+    from transformers import AutoModelForCausalLM, AutoModelForSequenceClassification
+    if name == "kobert":
+        from emotion_classifier import EMOTION_MODEL_ID, EMOTION_MODEL_REVISION
+        return AutoModelForSequenceClassification.from_pretrained(EMOTION_MODEL_ID, revision=EMOTION_MODEL_REVISION), \
+            AutoModelForSequenceClassification, EMOTION_MODEL_ID, EMOTION_MODEL_REVISION
+    if name == "llama":
+        from model_registry import LLAMA_MODEL_ID
+        model = AutoModelForCausalLM.from_pretrained(LLAMA_MODEL_ID, torch_dtype=torch.bfloat16, low_cpu_mem_usage=True)
+        return model, AutoModelForCausalLM, LLAMA_MODEL_ID, None
+    raise ValueError(f"Unknown model: {name} (choose from kobert, llama)")
+
+
+def prepare_models(names: list) -> None:
+    """
+    모델을 최종 dtype 의 safetensors 로 변환하고, 변환 전후 로드 시간을 비교해 출력합니다.
+
+    :param names: 준비할 모델 이름 목록 (kobert, llama)
+    """
+    for name in names:
+        start = time.perf_counter()
+        model, model_cls, source_id, revision = _load_source(name)
+        source_seconds = time.perf_counter() - start
+        out_dir = save_prepared(name, model, source_id, revision)
+        del model
+
+        start = time.perf_counter()
+        prepared = load_prepared(name, model_cls, source_id, revision=revision)
+        prepared_seconds = time.perf_counter() - start
+        if prepared is None:
+            print(f"[ERROR] Failed to load prepared model '{name}' from {out_dir}")
+            continue
+        print(f"[INFO] Prepared '{name}' in {out_dir}: from_pretrained {source_seconds:.2f}s "
+              f"→ memory-mapped load {prepared_seconds:.2f}s")
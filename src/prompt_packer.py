@@ -0,0 +1,140 @@
+POST_START = "--- 게시글 시작 (ID: {post_id}) ---\\n"
+POST_CONTINUED = "--- 게시글 시작 (ID: {post_id}, 이어서) ---\\n"
+POST_LINE = "게시글: {content}\\n"
+REPLY_LINE = "댓글: {reply}\\n"
+POST_END = "--- 게시글 끝 (ID: {post_id}) ---\\n\\n"
+
+
+class PackedBatch:
+    def __init__(self):
+        """
+        하나의 프롬프트에 들어갈 게시글 묶음입니다.
+        """
+        self.parts = []
+        self.post_ids = []
+        self.tokens = 0
+
+    def add(self, post_id: int, text: str, tokens: int) -> None:
+        self.parts.append(text)
+        if not self.post_ids or self.post_ids[-1] != post_id:
+            self.post_ids.append(post_id)
+        self.tokens += tokens
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
+    def __len__(self) -> int:
+        return len(self.parts)
+
+
+class PromptPacker:
+    def __init__(self, tokenizer, budget: int):
+        """
+        게시글과 댓글을 토큰 수 기준으로 프롬프트에 채워 넣는 패커를 초기화합니다.
+
+        토큰 수는 줄 단위로 세어 더하므로 실제 프롬프트와 몇 토큰 차이가 날 수 있습니다.
+
+        :param tokenizer: add_special_tokens 인자를 받는 Hugging Face 토크나이저
+        :param budget: 게시글 묶음에 쓸 수 있는 최대 토큰 수 (지시문 제외)
+        """
+        self.tokenizer = tokenizer
+        self.budget = budget
+        self.trimmed = 0
+        self.dropped_tokens = 0
+        self.split_posts = 0
+
+    def _encode(self, texts: list) -> list:
+        return self.tokenizer(texts, add_special_tokens=False)["input_ids"]
+
+    def _trim(self, template: str, field: str, value: str, limit: int, post_id: int) -> tuple:
+        """
+        한 줄이 limit 토큰을 넘으면 값을 잘라 limit 에 맞춥니다.
+
+        :return: (줄 텍스트, 토큰 수) 튜플
+        """
+        line = template.format(**{field: value})
+        tokens = len(self._encode([line])[0])
+        if tokens <= limit:
+            return line, tokens
+        overhead = tokens - len(self._encode([value])[0])
+        keep = max(0, limit - overhead)
+        ids = self._encode([value])[0]
+        cut = self.tokenizer.decode(ids[:keep], skip_special_tokens=True)
+        line = template.format(**{field: cut})
+        self.trimmed += 1
+        self.dropped_tokens += len(ids) - keep
+        print(f"[WARNING] Trimmed {field} of post {post_id}: kept {keep}/{len(ids)} tokens")
+        return line, len(self._encode([line])[0])
+
+    def _frame_tokens(self, post_id: int) -> int:
+        start, cont, end = (POST_START.format(post_id=post_id), POST_CONTINUED.format(post_id=post_id),
+                            POST_END.format(post_id=post_id))
+        start_n, cont_n, end_n = (len(ids) for ids in self._encode([start, cont, end]))
+        return max(start_n, cont_n) + end_n
+
+    def min_budget(self, post_ids) -> int:
+        """
+        주어진 게시글을 (본문을 잘라서라도) 하나씩 담을 수 있는 가장 작은 예산을 반환합니다.
+
+        :param post_ids: 게시글 ID 목록
+        :return: 토큰 수
+        """
+        return max((self._frame_tokens(post_id) for post_id in post_ids), default=0) + 1
+
+    def post_blocks(self, post_id: int, content: str, replies: list) -> list:
+        """
+        게시글 하나를 예산에 맞는 블록 목록으로 나눕니다.
+
+        예산을 넘는 스레드는 댓글 경계에서 여러 블록으로 나누고, 이어지는 블록에는 "이어서" 머리말을 붙입니다.
+        한 줄만으로 예산을 넘는 본문/댓글은 잘라내고 잘린 토큰 수를 기록합니다.
+
+        :return: [(블록 텍스트, 토큰 수)] 리스트
+        """
+        start, cont, end = (POST_START.format(post_id=post_id), POST_CONTINUED.format(post_id=post_id),
+                            POST_END.format(post_id=post_id))
+        start_n, cont_n, end_n = (len(ids) for ids in self._encode([start, cont, end]))
+        frame_n = max(start_n, cont_n) + end_n
+        if frame_n >= self.budget:
+            raise ValueError(f"Token budget {self.budget} is too small for a single post header")
+
+        line, n = self._trim(POST_LINE, "content", content, self.budget - frame_n, post_id)
+        blocks = []
+        parts, used = [start, line], start_n + n + end_n
+        reply_lines = [REPLY_LINE.format(reply=reply) for reply in replies]
+        reply_counts = [len(ids) for ids in self._encode(reply_lines)] if reply_lines else []
+        for reply, line, n in zip(replies, reply_lines, reply_counts):
+            if n > self.budget - frame_n:
+                line, n = self._trim(REPLY_LINE, "reply", reply, self.budget - frame_n, post_id)
+            if used + n > self.budget:
+                parts.append(end)
+                blocks.append(("".join(parts), used))
+                parts, used = [cont], cont_n + end_n
+            parts.append(line)
+            used += n
+        parts.append(end)
+        blocks.append(("".join(parts), used))
+        if len(blocks) > 1:
+            self.split_posts += 1
+            print(f"[INFO] Split post {post_id} ({len(replies)} replies) into {len(blocks)} prompt blocks")
+        return blocks
+
+    def pack(self, posts) -> list:
+        """
+        게시글을 순서대로 예산이 찰 때까지 채워 프롬프트 묶음을 만듭니다.
+
+        :param posts: (post_id, 본문, 댓글 리스트) 이터러블
+        :return: PackedBatch 리스트
+        """
+        batches = [PackedBatch()]
+        for post_id, content, replies in posts:
+            for text, tokens in self.post_blocks(post_id, content, replies):
+                if batches[-1] and batches[-1].tokens + tokens > self.budget:
+                    batches.append(PackedBatch())
+                batches[-1].add(post_id, text, tokens)
+        return [batch for batch in batches if batch]
+
+    def report(self) -> str:
+        return (f"{self.split_posts} posts split, {self.trimmed} lines trimmed, "
+                f"{self.dropped_tokens} tokens dropped")
+
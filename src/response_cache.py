@@ -0,0 +1,116 @@
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+
+
+class ResponseCache:
+    def __init__(self, root: str):
+        """
+        크롤러가 받은 원본 응답을 압축해 저장하는 내용 주소(content-addressed) 캐시를 초기화합니다.
+
+        본문은 sha256 해시를 이름으로 하는 zlib 압축 파일 (objects/ab/cdef....z) 에 한 번만 저장하고,
+        SQLite 색인에 (요청, 받은 시각) → 본문 해시를 기록합니다.
+        같은 페이지를 여러 번 받아도 내용이 같으면 파일은 하나이며, 시각별 기록은 모두 남습니다.
+
+        :param root: 캐시 디렉토리
+        """
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.raw_bytes = 0
+        self.compressed_bytes = 0
+
+        self.conn = sqlite3.connect(os.path.join(root, "index.db"), timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                request TEXT,
+                fetched REAL,
+                url TEXT,
+                digest TEXT,
+                size INTEGER,
+                PRIMARY KEY (request, fetched)
+            )
+        ''')
+        self.conn.commit()
+
+    @staticmethod
+    def request_key(url: str, data: dict = None) -> str:
+        """
+        요청(URL 과 POST form 데이터)의 키를 계산합니다.
+
+        :param url: 요청 URL
+        :param data: POST form 데이터 (GET 이면 None)
+        :return: sha256 16진수 문자열
+        """
+        payload = json.dumps([url, sorted(data.items()) if data else None], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf8")).hexdigest()
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest[2:] + ".z")
+
+    def put(self, url: str, data: dict, body: str, fetched: float = None) -> str:
+        """
+        응답 본문을 저장합니다.
+
+        :param url: 요청 URL
+        :param data: POST form 데이터 (GET 이면 None)
+        :param body: 응답 본문
+        :param fetched: 받은 시각 (기본값: 현재 시각)
+        :return: 본문 sha256 해시
+        """
+        raw = body.encode("utf8")
+        digest = hashlib.sha256(raw).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            compressed = zlib.compress(raw, 6)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)
+            self.raw_bytes += len(raw)
+            self.compressed_bytes += len(compressed)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO responses (request, fetched, url, digest, size) VALUES (?, ?, ?, ?, ?)",
+            (self.request_key(url, data), fetched if fetched is not None else time.time(), url, digest, len(raw)),
+        )
+        self.conn.commit()
+        self.stored += 1
+        return digest
+
+    def get(self, url: str, data: dict = None, as_of: float = None) -> str:
+        """
+        저장된 응답 본문을 조회합니다.
+
+        :param url: 요청 URL
+        :param data: POST form 데이터 (GET 이면 None)
+        :param as_of: 이 시각 이전에 받은 응답 중 가장 최근 것을 반환 (None 이면 가장 최근 것)
+        :return: 응답 본문 (없으면 None)
+        """
+        row = self.conn.execute(
+            "SELECT digest FROM responses WHERE request = ? AND fetched <= ? ORDER BY fetched DESC LIMIT 1",
+            (self.request_key(url, data), as_of if as_of is not None else float("inf")),
+        ).fetchone()
+        if row is None or not os.path.exists(self._object_path(row[0])):
+            self.misses += 1
+            return None
+        self.hits += 1
+        with open(self._object_path(row[0]), "rb") as f:
+            return zlib.decompress(f.read()).decode("utf8")
+
+    def report(self) -> str:
+        entries = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        text = f"hits={self.hits} misses={self.misses} stored={self.stored} entries={entries}"
+        if self.raw_bytes:
+            text += f" (new objects {self.raw_bytes / 1024:.0f} KB → {self.compressed_bytes / 1024:.0f} KB)"
+        return text
+
+    def close(self) -> None:
+        self.conn.close()
@@ -0,0 +1,81 @@
+import os
+import csv
+import numpy as np
+
+from emotion_store import EmotionProbabilityStore, read_emotion_rows, EMOTION_LABELS, NUM_EMOTIONS
+
+LABEL_INDEX = {label: idx for idx, label in EMOTION_LABELS.items()}
+# 갈등 점수에 포함하는 부정 감정 (Angry, Fear, Sad)
+NEGATIVE_EMOTIONS = [0, 1, 4]
+
+
+def _one_hot(labels: list) -> np.ndarray:
+    probs = np.zeros((len(labels), NUM_EMOTIONS), dtype=np.float32)
+    for i, label in enumerate(labels):
+        probs[i, LABEL_INDEX[label]] = 1.0
+    return probs
+
+
+def load_emotion_entries(emotions_path: str) -> dict:
+    """
+    게시글별 감정 확률을 읽습니다. 확률 저장소가 없으면 emotions.csv 라벨을 원-핫 벡터로 사용합니다.
+
+    :param emotions_path: emotions.csv 경로 (확률 저장소는 같은 디렉토리의 emotion_probs)
+    :return: {post_id: (게시글 확률 (5,), 댓글 확률 (k, 5))} 딕셔너리
+    """
+    probs_dir = os.path.join(os.path.dirname(os.path.abspath(emotions_path)), "emotion_probs")
+    if os.path.isdir(probs_dir):
+        entries = EmotionProbabilityStore(probs_dir).load()
+        if entries:
+            return entries
+    return {
+        pid: (_one_hot([post_emotion])[0], _one_hot(reply_emotions))
+        for pid, (post_emotion, reply_emotions) in read_emotion_rows(emotions_path).items()
+    }
+
+
+def compute_scores(entries: dict) -> list:
+    """
+    게시글별 갈등 점수를 계산합니다.
+
+    갈등 점수는 게시글과 댓글의 부정 감정(Angry, Fear, Sad) 확률 합의 평균입니다.
+
+    :param entries: load_emotion_entries 결과
+    :return: (post_id, 댓글 수, 갈등 점수, 댓글 중 Angry 비율) 튜플 목록
+    """
+    scores = []
+    for pid, (post_probs, reply_probs) in entries.items():
+        probs = np.vstack([np.asarray(post_probs, dtype=np.float32).reshape(1, -1),
+                           np.asarray(reply_probs, dtype=np.float32).reshape(-1, NUM_EMOTIONS)])
+        negative = probs[:, NEGATIVE_EMOTIONS].sum(axis=1)
+        replies = probs[1:]
+        angry_share = float((replies.argmax(axis=1) == 0).mean()) if len(replies) else 0.0
+        scores.append((pid, len(replies), float(negative.mean()), angry_share))
+    return scores
+
+
+def score_posts(emotions_path: str = None, out_path: str = None) -> None:
+    """
+    감정 분석 결과로 게시글별 갈등 점수를 계산하여 scores.csv 에 저장합니다.
+
+    :param emotions_path: emotions.csv 경로 (기본값: resource/emotions.csv)
+    :param out_path: 결과 CSV 경로 (기본값: resource/scores.csv)
+    """
+    base = os.path.dirname(__file__)
+    emotions_path = emotions_path or os.path.join(base, "resource/emotions.csv")
+    out_path = out_path or os.path.join(base, "resource/scores.csv")
+
+    entries = load_emotion_entries(emotions_path)
+    if not entries:
+        print("[ERROR] No emotion results found. Please run emotion analysis first.")
+        return
+    scores = compute_scores(entries)
+    with open(out_path, "w", newline='', encoding="utf8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["post_id", "replies", "conflict_score", "angry_reply_share"])
+        for pid, n_replies, score, angry_share in scores:
+            writer.writerow([pid, n_replies, f"{score:.4f}", f"{angry_share:.4f}"])
+
+    mean_score = sum(s[2] for s in scores) / len(scores)
+    print(f"[INFO] Scored {len(scores)} posts. Mean conflict score: {mean_score:.4f}")
+    print(f"[INFO] Saved scores to {out_path}")
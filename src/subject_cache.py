@@ -0,0 +1,91 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+
+
+class SubjectCache:
+    def __init__(self, db_file: str, model_id: str, prompt_version: int, settings: dict = None):
+        """
+        게시글 묶음별 주제 추출 결과를 디스크에 저장하는 캐시를 초기화합니다.
+
+        묶음이 끝날 때마다 결과가 저장되므로 중단된 실행을 다시 시작하면 끝난 묶음은 건너뜁니다.
+        키는 묶음 텍스트, 모델 ID, 프롬프트 버전, 생성 설정을 함께 해시한 값이므로
+        이 중 하나라도 바뀌면 기존 결과를 재사용하지 않습니다.
+
+        :param db_file: SQLite 파일 경로
+        :param model_id: LLM 모델 식별자
+        :param prompt_version: 지시문/프롬프트 형식 버전
+        :param settings: 결과에 영향을 주는 생성 설정 (max_new_tokens, temperature 등)
+        """
+        self.db_file = db_file
+        self.namespace = json.dumps(
+            {"model": model_id, "prompt_version": prompt_version, "settings": settings or {}},
+            sort_keys=True,
+        )
+        self.hits = 0
+        self.misses = 0
+
+        db_dir = os.path.dirname(os.path.abspath(db_file))
+        os.makedirs(db_dir, exist_ok=True)
+        self.conn = sqlite3.connect(db_file, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS subject_batches (
+                key TEXT PRIMARY KEY,
+                post_ids TEXT,
+                subjects TEXT,
+                created REAL
+            )
+        ''')
+        self.conn.commit()
+
+    def key(self, batch_text: str) -> str:
+        """
+        게시글 묶음 텍스트의 캐시 키를 계산합니다.
+
+        :param batch_text: 프롬프트에 들어가는 게시글 묶음 텍스트
+        :return: sha256 16진수 문자열
+        """
+        h = hashlib.sha256(self.namespace.encode("utf8"))
+        h.update(b"\0")
+        h.update(batch_text.encode("utf8"))
+        return h.hexdigest()
+
+    def get(self, key: str):
+        """
+        묶음의 저장된 주제 리스트를 조회합니다.
+
+        :param key: 캐시 키
+        :return: 주제 리스트 (없으면 None)
+        """
+        row = self.conn.execute("SELECT subjects FROM subject_batches WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, post_ids: list, subjects: list) -> None:
+        """
+        묶음의 주제 리스트를 저장합니다. 바로 커밋하므로 이후 중단되어도 결과가 남습니다.
+
+        :param key: 캐시 키
+        :param post_ids: 묶음에 포함된 게시글 ID 목록
+        :param subjects: 추출한 주제 리스트
+        """
+        self.conn.execute(
+            "INSERT OR REPLACE INTO subject_batches (key, post_ids, subjects, created) VALUES (?, ?, ?, ?)",
+            (key, json.dumps([int(p) for p in post_ids]), json.dumps(subjects, ensure_ascii=False), time.time()),
+        )
+        self.conn.commit()
+
+    def report(self) -> str:
+        entries = self.conn.execute("SELECT COUNT(*) FROM subject_batches").fetchone()[0]
+        total = self.hits + self.misses
+        hit_rate = self.hits / total if total else 0.0
+        return f"hits={self.hits} misses={self.misses} hit_rate={hit_rate:.1%} entries={entries}"
+
+    def close(self) -> None:
+        self.conn.close()
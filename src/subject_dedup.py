@@ -0,0 +1,172 @@
+import re
+import csv
+import struct
+import hashlib
+import unicodedata
+from collections import Counter, defaultdict
+
+# MinHash 서명 길이와 LSH 밴드 구성 (NUM_PERM = BANDS * ROWS)
+# 32 x 3 이면 유사도 0.5 쌍은 약 99%, 0.2 쌍은 약 23% 확률로 후보가 됩니다.
+NUM_PERM = 96
+LSH_BANDS = 32
+LSH_ROWS = 3
+# 같은 주제로 합칠 최소 문자 n-gram Jaccard 유사도
+MERGE_THRESHOLD = 0.5
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def normalize_subject(subject: str) -> str:
+    """
+    비교를 위해 주제 문자열을 정규화합니다.
+
+    NFKC 정규화, 소문자 변환 후 공백과 문장부호를 모두 제거하므로
+    "파이썬 질문", "파이썬질문", "파이썬 질문!" 은 같은 문자열이 됩니다.
+
+    :param subject: 원본 주제
+    :return: 정규화된 주제
+    """
+    text = unicodedata.normalize("NFKC", str(subject)).lower()
+    return re.sub(r"[\W_]+", "", text)
+
+
+def shingles(text: str, n: int = 2) -> set:
+    """
+    문자 n-gram 집합을 반환합니다. 한글은 음절 하나의 정보량이 많으므로 기본값은 2-gram 입니다.
+
+    :param text: 정규화된 문자열
+    :param n: n-gram 길이
+    :return: n-gram 집합 (n 보다 짧으면 문자열 자체)
+    """
+    if len(text) <= n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def jaccard(a: set, b: set) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def _permutations(num_perm: int) -> list:
+    # 실행마다 같은 서명이 나오도록 시드를 고정한 해시 계수
+    params = []
+    for i in range(num_perm):
+        digest = hashlib.blake2b(f"minhash-{i}".encode(), digest_size=16).digest()
+        a, b = struct.unpack("<QQ", digest)
+        params.append((a % (_MERSENNE_PRIME - 1) + 1, b % _MERSENNE_PRIME))
+    return params
+
+
+_PERMUTATIONS = _permutations(NUM_PERM)
+
+
+def _gram_hashes(gram: str) -> tuple:
+    h = struct.unpack("<I", hashlib.blake2b(gram.encode("utf8"), digest_size=4).digest())[0]
+    return tuple(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for a, b in _PERMUTATIONS)
+
+
+def minhash(grams: set, memo: dict = None) -> tuple:
+    """
+    n-gram 집합의 MinHash 서명을 계산합니다.
+
+    주제들은 같은 n-gram 을 많이 공유하므로 memo 에 n-gram 별 해시값을 저장해 재사용합니다.
+
+    :param grams: n-gram 집합
+    :param memo: {n-gram: 해시값 튜플} 딕셔너리 (선택적)
+    :return: 길이 NUM_PERM 튜플
+    """
+    if not grams:
+        return (_MAX_HASH,) * NUM_PERM
+    memo = {} if memo is None else memo
+    rows = []
+    for gram in grams:
+        if gram not in memo:
+            memo[gram] = _gram_hashes(gram)
+        rows.append(memo[gram])
+    return rows[0] if len(rows) == 1 else tuple(map(min, *rows))
+
+
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, x: int) -> int:
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, x: int, y: int) -> None:
+        rx, ry = self.find(x), self.find(y)
+        if rx != ry:
+            self.parent[max(rx, ry)] = min(rx, ry)
+
+
+def merge_subjects(subjects: list, threshold: float = MERGE_THRESHOLD) -> list:
+    """
+    거의 같은 주제를 하나로 합치고 등장 횟수를 셉니다.
+
+    1. 정규화한 문자열이 같은 주제는 바로 합칩니다.
+    2. 나머지는 문자 2-gram MinHash 를 LSH 밴드로 나눠, 같은 버킷에 들어간 쌍만
+       실제 Jaccard 유사도를 계산합니다. 따라서 전체 쌍을 비교하지 않습니다.
+    3. 유사도가 threshold 이상인 쌍을 union-find 로 묶습니다.
+
+    묶음의 대표 주제는 가장 많이 나온 원본 문자열입니다 (동률이면 사전순).
+
+    :param subjects: 원본 주제 목록 (중복 포함, 문자열이 아닌 항목은 무시)
+    :param threshold: 합칠 최소 Jaccard 유사도
+    :return: (대표 주제, 등장 횟수, 원본 주제 변형 리스트) 튜플 목록, 등장 횟수 내림차순
+    """
+    # 자유 생성이나 이전 캐시 결과에는 숫자, 리스트 같은 값이 섞일 수 있으므로 문자열만 셉니다.
+    raw_counts = Counter(s.strip() for s in subjects if isinstance(s, str) and s.strip())
+    groups = defaultdict(list)
+    for raw in raw_counts:
+        groups[normalize_subject(raw) or raw].append(raw)
+
+    keys = list(groups)
+    grams = [shingles(key) for key in keys]
+    uf = _UnionFind(len(keys))
+    buckets = defaultdict(list)
+    memo = {}
+    for idx, gram in enumerate(grams):
+        signature = minhash(gram, memo)
+        for band in range(LSH_BANDS):
+            buckets[(band, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS])].append(idx)
+
+    checked = set()
+    for members in buckets.values():
+        for i, x in enumerate(members):
+            for y in members[i + 1:]:
+                if (x, y) in checked:
+                    continue
+                checked.add((x, y))
+                if uf.find(x) != uf.find(y) and jaccard(grams[x], grams[y]) >= threshold:
+                    uf.union(x, y)
+
+    clusters = defaultdict(list)
+    for idx, key in enumerate(keys):
+        clusters[uf.find(idx)].extend(groups[key])
+
+    merged = []
+    for variants in clusters.values():
+        variants.sort(key=lambda v: (-raw_counts[v], v))
+        merged.append((variants[0], sum(raw_counts[v] for v in variants), variants))
+    merged.sort(key=lambda m: (-m[1], m[0]))
+    return merged
+
+
+def write_subject_rows(path: str, merged: list) -> None:
+    """
+    subjects.csv 를 (subject, count, variants) 열로 저장합니다.
+
+    :param path: 결과 CSV 경로
+    :param merged: merge_subjects 형식의 (대표 주제, 등장 횟수, 변형 리스트) 튜플 목록
+    """
+    with open(path, "w", newline='', encoding="utf8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["subject", "count", "variants"])
+        for subject, count, variants in merged:
+            writer.writerow([subject, count, "|".join(v for v in variants if v != subject)])
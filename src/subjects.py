@@ -0,0 +1,344 @@
+import os
+import json
+import re
+import time
+import torch
+from transformers import LogitsProcessorList
+
+from corpus import load_corpus
+from model_registry import registry, LLAMA_MODEL_ID
+from config import (SUBJECT_PROMPT_TOKENS, SUBJECT_GEN_BATCH_SIZE, SUBJECT_MAX_RETRIES, SUBJECT_CACHE_PATH,
+                    LLM_QUANTIZATION, SUBJECT_DRAFT_MODEL)
+from prompt_packer import PromptPacker
+from prefix_cache import get_prefix_cache
+from subject_cache import SubjectCache
+from subject_dedup import merge_subjects, write_subject_rows
+from assisted_decoding import AssistStats, ForwardCounter, assist_kwargs
+from llm_quantization import memory_report
+from json_constraint import SUBJECTS_JSON_PREFILL, SubjectsJsonProcessor, get_transition_table
+
+
+SUBJECT_INSTRUCTION = "다음은 여러 커뮤니티 게시글과 댓글 내용의 묶음이야. 각 게시글의 주제를 알려줘. 응답은 반드시 JSON 형식이어야 해. JSON 형식은 {\"subjects\": [\"주제1\", \"주제2\"]}와 같이 모든 주제를 하나의 리스트에 담아 응답해줘. 응답에는 JSON 외의 다른 내용이 포함되어서는 안 돼.\\n\\n"
+
+
+# 지시문이나 프롬프트 형식을 바꾸면 올려서 주제 캐시를 무효화합니다.
+SUBJECT_PROMPT_VERSION = 1
+SUBJECT_GENERATION_SETTINGS = {
+    "max_new_tokens": 1024,  # Increased tokens for batch summary
+    "do_sample": True,
+    "temperature": 0.6,
+    "top_p": 0.9,
+}
+
+
+def build_prompt(tokenizer, batch_text: str, constrained: bool = False) -> str:
+    messages = [{"role": "user", "content": SUBJECT_INSTRUCTION + batch_text}]
+    prompt = tokenizer.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
+    # 제한 디코딩에서는 응답의 JSON 앞부분을 미리 채워 둡니다.
+    return prompt + SUBJECTS_JSON_PREFILL if constrained else prompt
+
+
+def prompt_prefix(tokenizer) -> str:
+    """
+    모든 프롬프트가 공유하는 앞부분(채팅 템플릿 머리말 + 지시문)을 반환합니다.
+
+    :param tokenizer: Llama 토크나이저
+    :return: 게시글 묶음 텍스트 앞까지의 프롬프트 문자열
+    """
+    marker = "\x00BATCH\x00"
+    return build_prompt(tokenizer, marker).split(marker)[0]
+
+
+def count_generated_tokens(new_tokens: torch.Tensor, terminators: list) -> int:
+    """
+    행마다 첫 종료 토큰 (eos/eot) 앞까지의 생성 토큰 수를 더합니다.
+    먼저 끝난 행 뒤에 붙는 종료 토큰과 패딩은 세지 않으므로 배치 크기와 관계없이 tokens/s 가 같은 기준이 됩니다.
+
+    :param new_tokens: (배치, 생성 길이) 생성 토큰
+    :param terminators: 종료 토큰 ID 목록
+    :return: 생성 토큰 수
+    """
+    ids = torch.tensor([t for t in terminators if t is not None], dtype=new_tokens.dtype, device=new_tokens.device)
+    finished = torch.isin(new_tokens, ids).cumsum(dim=1) > 0
+    return int((~finished).sum())
+
+
+def generate_batch(tokenizer, model, prompts: list, token_budget: int, prefix_cache=None,
+                   constrained: bool = False, assist: str = None, stats: AssistStats = None) -> tuple:
+    """
+    여러 프롬프트를 왼쪽 패딩으로 묶어 한 번의 generate 로 생성하고 행마다 따로 디코딩합니다.
+
+    :param tokenizer: Llama 토크나이저
+    :param model: Llama 모델
+    :param prompts: 채팅 템플릿이 적용된 프롬프트 리스트
+    :param token_budget: 프롬프트 최대 토큰 수 (초과 시 경고만 출력)
+    :param prefix_cache: 공유 접두사의 PrefixCache (주면 접두사 이후 부분만 prefill)
+    :param constrained: 출력을 {"subjects": [...]} 형식으로 제한하고 객체가 닫히면 종료할지 여부
+                        (프롬프트는 build_prompt(..., constrained=True) 로 만들어야 합니다)
+    :param assist: 보조 디코딩 방식 (prompt-lookup, draft; 프롬프트는 하나씩 넘겨야 합니다)
+    :param stats: 생성 토큰 수, 시간, forward 횟수를 누적할 AssistStats (선택적)
+    :return: (행별 생성 텍스트 리스트, 생성된 토큰 수) 튜플
+    """
+    if prefix_cache is not None:
+        for prompt in prompts:
+            if not prompt.startswith(prefix_cache.text):
+                raise ValueError("Prompt does not start with the cached prefix")
+        prompts = [prompt[len(prefix_cache.text):] for prompt in prompts]
+
+    # 디코더 전용 모델은 프롬프트 끝이 정렬되어야 하므로 왼쪽에 패딩합니다.
+    padding_side = tokenizer.padding_side
+    tokenizer.padding_side = "left"
+    try:
+        inputs = tokenizer(
+            prompts,
+            return_tensors="pt",
+            padding=True,
+            add_special_tokens=False,
+            return_attention_mask=True
+        )
+    finally:
+        tokenizer.padding_side = padding_side
+
+    terminators = [
+        tokenizer.eos_token_id,
+        tokenizer.convert_tokens_to_ids("<|eot_id|>")
+    ]
+
+    generate_kwargs = {}
+    if constrained:
+        table, rows = get_transition_table(tokenizer, model.config.vocab_size, terminators)
+        generate_kwargs["logits_processor"] = LogitsProcessorList([SubjectsJsonProcessor(table, rows)])
+    if prefix_cache is not None:
+        # [접두사][pad...][접미사] 순서가 되며, pad 는 attention_mask 로 가리고
+        # position_ids 는 attention_mask 누적합으로 계산되어 접두사 다음부터 이어집니다.
+        n = len(prompts)
+        inputs["input_ids"] = torch.cat([prefix_cache.input_ids.cpu().expand(n, -1), inputs["input_ids"]], dim=1)
+        inputs["attention_mask"] = torch.cat(
+            [torch.ones((n, len(prefix_cache)), dtype=inputs["attention_mask"].dtype), inputs["attention_mask"]], dim=1)
+        generate_kwargs["past_key_values"] = prefix_cache.for_batch(n)
+
+    prompt_lengths = inputs["attention_mask"].sum(dim=1).tolist()
+    for length in prompt_lengths:
+        if length > token_budget:
+            print(f"[WARNING] Prompt is {length} tokens, over the {token_budget} budget")
+
+    inputs_on_device = {k: v.to(model.device) for k, v in inputs.items()}
+    generate_kwargs.update(assist_kwargs(assist))
+
+    start = time.perf_counter()
+    with torch.inference_mode(), ForwardCounter(model, generate_kwargs.get("assistant_model")) as counter:
+        outputs = model.generate(
+            **inputs_on_device,
+            pad_token_id=tokenizer.pad_token_id,
+            eos_token_id=terminators,
+            **SUBJECT_GENERATION_SETTINGS,
+            **generate_kwargs,
+        )
+    seconds = time.perf_counter() - start
+
+    input_length = inputs_on_device['input_ids'].shape[1]
+    new_tokens = outputs[:, input_length:]
+    raws = [tokenizer.decode(row, skip_special_tokens=True) for row in new_tokens]
+    if constrained:
+        raws = [SUBJECTS_JSON_PREFILL + raw for raw in raws]
+    generated = count_generated_tokens(new_tokens, terminators)
+    if stats is not None:
+        stats.add(generated, counter, seconds)
+    return raws, generated
+
+
+def next_retry_budget(packer: PromptPacker, post_ids: list) -> int:
+    """
+    실패한 게시글을 다시 묶을 예산을 정합니다. 예산을 절반으로 줄이되 게시글 머리말이 들어갈 크기 밑으로는 줄이지 않습니다.
+
+    :param packer: 이번 시도에 사용한 PromptPacker
+    :param post_ids: 다시 시도할 게시글 ID 목록
+    :return: 다음 예산 (더 줄일 수 없으면 None)
+    """
+    budget = max(packer.budget // 2, packer.min_budget(post_ids))
+    return budget if budget < packer.budget else None
+
+
+def parse_subjects(raw: str, batch_no: int) -> list:
+    """
+    생성 결과에서 {"subjects": [...]} JSON 을 찾아 주제 리스트를 반환합니다.
+
+    :param raw: 생성 텍스트
+    :param batch_no: 로그에 표시할 묶음 번호
+    :return: 주제 문자열 리스트 (실패 시 None)
+    """
+    try:
+        # More robust JSON extraction
+        json_match = re.search(r'\{.*\}', raw, re.DOTALL)
+        if json_match:
+            json_str = json_match.group(0)
+            parsed_json = json.loads(json_str)
+            if isinstance(parsed_json, dict) and isinstance(parsed_json.get('subjects'), list):
+                subjects = [s.strip() for s in parsed_json['subjects'] if isinstance(s, str) and s.strip()]
+                if len(subjects) < len(parsed_json['subjects']):
+                    print(f"[WARNING] Dropped {len(parsed_json['subjects']) - len(subjects)} non-string or empty subjects in batch {batch_no}")
+                return subjects
+            print(f"[WARNING] 'subjects' key not found or not a list in JSON for batch {batch_no}")
+        else:
+            print(f"[ERROR] No JSON object found in the output for batch {batch_no}: {raw}")
+
+    except json.JSONDecodeError as e:
+        print(f"[ERROR] Failed to parse JSON for batch {batch_no}. Error: {e}. Raw output: {raw}")
+    return None
+
+
+def benchmark_decoding(assist: str, samples: int = 4, contents_path: str = None, reply_path: str = None,
+                       token_budget: int = None) -> None:
+    """
+    앞쪽 게시글 묶음 몇 개로 일반 디코딩과 보조 디코딩의 속도와 후보 수락률을 비교합니다.
+
+    두 방식 모두 한 프롬프트씩, 같은 제한 디코딩/접두사 캐시 설정으로 생성합니다.
+    assist 가 None 이면 일반 디코딩 속도와 모델 메모리만 측정합니다 (LLM_QUANTIZATION 비교용).
+
+    :param assist: 보조 디코딩 방식 (prompt-lookup, draft, None)
+    :param samples: 비교에 사용할 묶음 수
+    :param contents_path: 게시글 CSV 경로
+    :param reply_path: 댓글 CSV 경로
+    :param token_budget: 프롬프트 한 개의 최대 토큰 수
+    """
+    LLM_tokenizer, LLM_model = registry.get("llama")
+    corpus = load_corpus(None, contents_path, reply_path)
+    token_budget = token_budget or SUBJECT_PROMPT_TOKENS
+    overhead = len(LLM_tokenizer(build_prompt(LLM_tokenizer, "", True), add_special_tokens=False)["input_ids"])
+    batches = PromptPacker(LLM_tokenizer, token_budget - overhead).pack(corpus.iter_posts())[:samples]
+    prefix_cache = get_prefix_cache(LLM_tokenizer, LLM_model, prompt_prefix(LLM_tokenizer))
+
+    print(f"[INFO] {memory_report(LLM_model, f'{LLAMA_MODEL_ID} ({LLM_QUANTIZATION})')}")
+    results = []
+    for mode in ((None, assist) if assist else (None,)):
+        stats = AssistStats(mode)
+        for batch in batches:
+            generate_batch(LLM_tokenizer, LLM_model, [build_prompt(LLM_tokenizer, batch.text, True)], token_budget,
+                           prefix_cache, True, mode, stats)
+        print(f"[INFO] {stats.report()}")
+        results.append(stats)
+
+    if len(results) < 2:
+        return
+    baseline, assisted = results
+    if baseline.seconds and assisted.seconds:
+        speedup = (assisted.tokens / assisted.seconds) / max(baseline.tokens / baseline.seconds, 1e-9)
+        print(f"[INFO] {assist} speedup over baseline: {speedup:.2f}x on {len(batches)} batches")
+
+
+def separate_subjects(contents_path: str = None, reply_path: str = None, out_path: str = None,
+                      token_budget: int = None, gen_batch_size: int = None, use_prefix_cache: bool = True,
+                      constrained: bool = True, use_cache: bool = True, assist: str = None) -> None:
+    """
+    LLM 으로 게시글 묶음의 주제를 추출하여 subjects.csv 에 저장합니다.
+
+    게시글은 고정 개수가 아니라 토큰 예산에 맞춰 프롬프트에 채워 넣습니다.
+
+    :param contents_path: 게시글 CSV 경로 (기본값: resource/contents.csv)
+    :param reply_path: 댓글 CSV 경로 (기본값: resource/reply.csv)
+    :param out_path: 결과 CSV 경로 (기본값: resource/subjects.csv)
+    :param token_budget: 프롬프트 한 개의 최대 토큰 수 (기본값: config.SUBJECT_PROMPT_TOKENS)
+    :param gen_batch_size: generate 한 번에 함께 처리할 프롬프트 수 (기본값: config.SUBJECT_GEN_BATCH_SIZE)
+    :param use_prefix_cache: 공유 지시문의 KV 캐시를 한 번만 계산해 재사용할지 여부
+    :param constrained: 출력을 {"subjects": [...]} 형식으로 제한하여 생성할지 여부
+    :param use_cache: 묶음별 결과를 캐시에 저장하고 이미 처리한 묶음은 건너뛸지 여부
+    :param assist: 보조 디코딩 방식 (prompt-lookup, draft; None 이면 일반 디코딩)
+    """
+    base = os.path.dirname(__file__)
+    LLM_tokenizer, LLM_model = registry.get("llama")
+    corpus = load_corpus(base, contents_path, reply_path)
+    token_budget = token_budget or SUBJECT_PROMPT_TOKENS
+    gen_batch_size = gen_batch_size or SUBJECT_GEN_BATCH_SIZE
+    if assist and gen_batch_size != 1:
+        print(f"[INFO] Assisted decoding ({assist}) supports one prompt per generate call; using --gen-batch 1")
+        gen_batch_size = 1
+    stats = AssistStats(assist)
+
+    # 지시문과 채팅 템플릿이 차지하는 토큰을 뺀 나머지를 게시글에 사용
+    overhead = len(LLM_tokenizer(build_prompt(LLM_tokenizer, "", constrained), add_special_tokens=False)["input_ids"])
+    posts = {post_id: (post_id, content, replies) for post_id, content, replies in corpus.iter_posts()}
+    packer = PromptPacker(LLM_tokenizer, token_budget - overhead)
+    batches = packer.pack(posts.values())
+
+    all_subjects = []
+    print(f"[INFO] Packed {len(corpus)} posts into {len(batches)} prompts "
+          f"(budget {token_budget} tokens, {overhead} for instructions; {packer.report()}).")
+
+    prefix_cache = get_prefix_cache(LLM_tokenizer, LLM_model, prompt_prefix(LLM_tokenizer)) if use_prefix_cache else None
+    # 양자화나 보조 디코딩 방식이 다르면 출력이 달라질 수 있으므로 캐시를 따로 씁니다.
+    settings = dict(SUBJECT_GENERATION_SETTINGS, constrained=constrained, quantization=LLM_QUANTIZATION,
+                    assist=assist, draft_model=SUBJECT_DRAFT_MODEL if assist == "draft" else None)
+    cache = SubjectCache(SUBJECT_CACHE_PATH, LLAMA_MODEL_ID, SUBJECT_PROMPT_VERSION, settings) if use_cache else None
+
+    start = time.perf_counter()
+    generated = 0
+    failed = []
+    for attempt in range(SUBJECT_MAX_RETRIES + 1):
+        failed = []
+        if cache is not None:
+            # 이전 실행에서 끝난 묶음은 저장된 결과를 사용
+            pending = []
+            for batch in batches:
+                subjects = cache.get(cache.key(batch.text))
+                if subjects is None:
+                    pending.append(batch)
+                else:
+                    all_subjects.extend(subjects)
+            if len(pending) < len(batches):
+                print(f"[INFO] Reusing cached subjects for {len(batches) - len(pending)}/{len(batches)} batches")
+            batches = pending
+
+        for g in range(0, len(batches), gen_batch_size):
+            group = batches[g:g + gen_batch_size]
+            for i, batch in enumerate(group, start=g + 1):
+                print(f"[INFO] Processing batch {i}/{len(batches)} ({len(batch.post_ids)} posts, ~{batch.tokens + overhead} tokens)")
+
+            prompts = [build_prompt(LLM_tokenizer, batch.text, constrained) for batch in group]
+            raws, new_tokens = generate_batch(LLM_tokenizer, LLM_model, prompts, token_budget, prefix_cache,
+                                              constrained, assist, stats)
+            generated += new_tokens
+
+            for i, (batch, raw) in enumerate(zip(group, raws), start=g + 1):
+                print(f"[DEBUG] Raw output for batch {i}: {raw}")
+                subjects = parse_subjects(raw, i)
+                if subjects is None:
+                    failed.extend(batch.post_ids)
+                else:
+                    all_subjects.extend(subjects)
+                    if cache is not None:
+                        cache.put(cache.key(batch.text), batch.post_ids, subjects)
+
+        failed = list(dict.fromkeys(failed))
+        if not failed or attempt == SUBJECT_MAX_RETRIES:
+            break
+        # 실패한 게시글은 예산을 절반으로 줄여 더 작은 묶음으로 다시 시도
+        budget = next_retry_budget(packer, failed)
+        if budget is None:
+            print(f"[WARNING] Token budget {packer.budget} cannot be reduced further; not retrying {len(failed)} posts")
+            break
+        packer = PromptPacker(LLM_tokenizer, budget)
+        batches = packer.pack(posts[post_id] for post_id in failed)
+        print(f"[INFO] Retrying {len(failed)} posts in {len(batches)} prompts with a {packer.budget}-token budget "
+              f"(retry {attempt + 1}/{SUBJECT_MAX_RETRIES})")
+
+    if failed:
+        print(f"[WARNING] No subjects extracted for {len(failed)} posts after {attempt} retries: {failed}")
+
+    if cache is not None:
+        print(f"[INFO] Subject cache: {cache.report()}")
+        cache.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"[INFO] Generated {generated} tokens in {elapsed:.1f}s ({generated / max(elapsed, 1e-9):.1f} tokens/s, "
+          f"{gen_batch_size} prompts per generate call)")
+    if assist:
+        print(f"[INFO] {stats.report()}")
+
+    # 거의 같은 주제를 합치고 등장 횟수와 함께 저장
+    merged = merge_subjects(all_subjects)
+    output_path = out_path or os.path.join(base, "resource/subjects.csv")
+    write_subject_rows(output_path, merged)
+
+    print(f"[INFO] Merged {len(all_subjects)} raw subjects into {len(merged)} subjects "
+          f"({len(set(all_subjects))} distinct before merging).")
+    print(f"[INFO] All batches processed. Unique subjects saved to {output_path}")
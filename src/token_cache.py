@@ -0,0 +1,153 @@
+import os
+import json
+import hashlib
+import logging
+import numpy as np
+
+# 한 번에 토크나이저에 넘길 행 수
+TOKENIZE_CHUNK_ROWS = 2048
+
+
+def tokenizer_fingerprint(tokenizer) -> str:
+    """
+    토크나이저의 지문을 계산합니다. 어휘, 특수 토큰, 최대 길이가 같으면 같은 값을 반환합니다.
+
+    :param tokenizer: Hugging Face 토크나이저
+    :return: sha256 16진수 문자열의 앞 16자리
+    """
+    h = hashlib.sha256()
+    h.update(type(tokenizer).__name__.encode("utf8"))
+    h.update(str(getattr(tokenizer, "name_or_path", "")).encode("utf8"))
+    h.update(str(getattr(tokenizer, "model_max_length", "")).encode("utf8"))
+    h.update(json.dumps(getattr(tokenizer, "special_tokens_map", {}), sort_keys=True, ensure_ascii=False).encode("utf8"))
+    for token, idx in sorted(tokenizer.get_vocab().items(), key=lambda kv: kv[1]):
+        h.update(f"{idx}\t{token}\n".encode("utf8"))
+    return h.hexdigest()[:16]
+
+
+def _text_hashes(texts: list) -> np.ndarray:
+    return np.array(
+        [int.from_bytes(hashlib.blake2b(str(t).encode("utf8"), digest_size=8).digest(), "little") for t in texts],
+        dtype=np.uint64,
+    )
+
+
+def _save_array(path: str, arr: np.ndarray) -> None:
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, arr)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class TokenizedTexts:
+    def __init__(self, prefix: str):
+        """
+        메모리 맵으로 저장된 토큰 ID 묶음을 엽니다.
+
+        :param prefix: 섹션 파일 경로 접두사 (<prefix>.ids.int32, <prefix>.offsets.npy)
+        """
+        self.prefix = prefix
+        self.offsets = np.load(prefix + ".offsets.npy")
+        if self.offsets[-1] > 0:
+            self.ids = np.memmap(prefix + ".ids.int32", dtype=np.int32, mode="r")
+            if self.offsets[-1] > len(self.ids):
+                raise ValueError(f"token cache offsets exceed {prefix}.ids.int32 ({self.offsets[-1]} > {len(self.ids)})")
+        else:
+            self.ids = np.zeros(0, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row: int) -> np.ndarray:
+        return self.ids[self.offsets[row]:self.offsets[row + 1]]
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+
+class TokenCache:
+    def __init__(self, cache_dir: str, tokenizer):
+        """
+        코퍼스 토큰화 결과를 디스크에 저장하는 캐시를 초기화합니다.
+
+        결과는 토크나이저 지문별 디렉토리에 저장되므로 토크나이저가 바뀌면 자동으로 새로 만듭니다.
+
+        :param cache_dir: 캐시 루트 디렉토리
+        :param tokenizer: Hugging Face 토크나이저
+        """
+        self.tokenizer = tokenizer
+        self.fingerprint = tokenizer_fingerprint(tokenizer)
+        self.dir = os.path.join(cache_dir, self.fingerprint)
+        os.makedirs(self.dir, exist_ok=True)
+        meta_path = os.path.join(self.dir, "meta.json")
+        if not os.path.exists(meta_path):
+            with open(meta_path, "w", encoding="utf8") as f:
+                json.dump({
+                    "tokenizer": str(getattr(tokenizer, "name_or_path", "")),
+                    "fingerprint": self.fingerprint,
+                }, f, ensure_ascii=False)
+
+    def prefix(self, section: str) -> str:
+        return os.path.join(self.dir, section)
+
+    def section(self, section: str, texts: list) -> TokenizedTexts:
+        """
+        텍스트 목록의 토큰 ID 를 준비합니다.
+
+        이미 토큰화된 앞부분 행은 해시가 같으면 재사용하고, 바뀐 행부터 끝까지만 다시 토큰화합니다.
+        크롤러는 CSV 끝에 행을 추가하므로 보통 새 행만 토큰화합니다.
+
+        :param section: 섹션 이름 (예: "posts", "replies")
+        :param texts: 행 순서대로의 텍스트 목록
+        :return: TokenizedTexts 객체
+        """
+        prefix = self.prefix(section)
+        ids_path, offsets_path, hashes_path = prefix + ".ids.int32", prefix + ".offsets.npy", prefix + ".hashes.npy"
+        hashes = _text_hashes(texts)
+
+        # 재사용 가능한 앞부분 행 수 계산
+        reuse = 0
+        stored_rows = -1
+        offsets = np.zeros(1, dtype=np.int64)
+        if os.path.exists(offsets_path) and os.path.exists(hashes_path) and os.path.exists(ids_path):
+            old_offsets = np.load(offsets_path)
+            old_hashes = np.load(hashes_path)
+            stored_rows = len(old_offsets) - 1
+            n = min(len(old_hashes), stored_rows, len(hashes))
+            # 오프셋이 가리키는 토큰이 파일에 모두 있는 행까지만 재사용합니다.
+            n = min(n, int(np.searchsorted(old_offsets, os.path.getsize(ids_path) // 4, side="right")) - 1)
+            mismatch = np.nonzero(old_hashes[:n] != hashes[:n])[0]
+            reuse = int(mismatch[0]) if len(mismatch) else n
+            offsets = old_offsets[:reuse + 1]
+
+        if reuse < len(texts):
+            logging.info(f"토큰 캐시 '{section}': {reuse}행 재사용, {len(texts) - reuse}행 토큰화")
+            # ids 파일을 자르기 전에 색인을 재사용하는 행까지로 줄여 두면,
+            # 중간에 중단되어도 오프셋이 잘렸거나 다시 쓰는 중인 영역을 가리키지 않습니다.
+            if stored_rows > reuse:
+                _save_array(offsets_path, offsets)
+                _save_array(hashes_path, hashes[:reuse])
+            new_offsets = [offsets]
+            end = int(offsets[-1])
+            with open(ids_path, "r+b" if os.path.exists(ids_path) else "wb") as f:
+                f.truncate(end * 4)
+                f.seek(end * 4)
+                for start in range(reuse, len(texts), TOKENIZE_CHUNK_ROWS):
+                    chunk = [str(t) for t in texts[start:start + TOKENIZE_CHUNK_ROWS]]
+                    encoded = self.tokenizer(chunk, truncation=True)["input_ids"]
+                    lengths = np.fromiter((len(ids) for ids in encoded), dtype=np.int64, count=len(encoded))
+                    flat = np.fromiter((t for ids in encoded for t in ids), dtype=np.int32, count=int(lengths.sum()))
+                    f.write(flat.tobytes())
+                    new_offsets.append(end + np.cumsum(lengths))
+                    end += int(lengths.sum())
+                f.flush()
+                os.fsync(f.fileno())
+            offsets = np.concatenate(new_offsets)
+        if reuse < len(texts) or stored_rows != len(texts):
+            # 오프셋을 먼저 기록해야 중단되어도 해시가 오프셋보다 앞서지 않습니다.
+            _save_array(offsets_path, offsets)
+            _save_array(hashes_path, hashes)
+        return TokenizedTexts(prefix)
@@ -0,0 +1,165 @@
+import os
+import csv
+import time
+from collections import Counter
+import numpy as np
+import torch
+
+from config import SUBJECT_EMBED_MODEL
+from corpus import load_corpus
+from model_registry import registry
+from subject_dedup import write_subject_rows
+
+# 문장 임베딩 배치 크기 (CPU 기준)
+EMBED_BATCH_SIZE = 64
+# 게시글 + 댓글을 자를 최대 토큰 수
+EMBED_MAX_LENGTH = 256
+# 군집 이름으로 쓸 키워드 수
+TOPIC_KEYWORDS = 3
+
+
+class SentenceEncoder:
+    def __init__(self, device, model_id: str = SUBJECT_EMBED_MODEL):
+        """
+        한국어 문장 인코더를 초기화합니다. 문장 임베딩은 마지막 은닉 상태의 평균입니다.
+
+        :param device: 모델을 올릴 장치
+        :param model_id: Hugging Face 모델 ID
+        """
+        from transformers import AutoTokenizer, AutoModel
+        self.device = device
+        self.tokenizer = AutoTokenizer.from_pretrained(model_id)
+        self.model = AutoModel.from_pretrained(model_id).to(device).eval()
+
+    def encode(self, texts: list, batch_size: int = EMBED_BATCH_SIZE, max_length: int = EMBED_MAX_LENGTH) -> np.ndarray:
+        """
+        텍스트 목록을 L2 정규화된 임베딩으로 변환합니다.
+
+        감정 분류와 같이 토큰 길이 순으로 정렬하여 배치마다 해당 배치의 최대 길이까지만 패딩합니다.
+
+        :param texts: 텍스트 목록
+        :param batch_size: 한 번의 forward 에 넣을 텍스트 수
+        :param max_length: 텍스트별 최대 토큰 수
+        :return: 입력 순서와 같은 순서의 (N, 차원) float32 배열
+        """
+        seqs = self.tokenizer(list(texts), truncation=True, max_length=max_length)["input_ids"]
+        pad_id = self.tokenizer.pad_token_id or 0
+        order = sorted(range(len(seqs)), key=lambda i: len(seqs[i]))
+
+        embeddings = np.zeros((len(seqs), self.model.config.hidden_size), dtype=np.float32)
+        with torch.inference_mode():
+            for start in range(0, len(order), batch_size):
+                idxs = order[start:start + batch_size]
+                width = max(len(seqs[i]) for i in idxs)
+                input_ids = torch.full((len(idxs), width), pad_id, dtype=torch.long)
+                attention_mask = torch.zeros((len(idxs), width), dtype=torch.long)
+                for row, i in enumerate(idxs):
+                    n = len(seqs[i])
+                    input_ids[row, :n] = torch.as_tensor(seqs[i], dtype=torch.long)
+                    attention_mask[row, :n] = 1
+                hidden = self.model(input_ids=input_ids.to(self.device),
+                                    attention_mask=attention_mask.to(self.device)).last_hidden_state
+                mask = attention_mask.to(hidden.device).unsqueeze(-1).to(hidden.dtype)
+                pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+                pooled = torch.nn.functional.normalize(pooled, dim=-1)
+                embeddings[idxs] = pooled.float().cpu().numpy()
+        return embeddings
+
+
+def default_num_clusters(num_posts: int) -> int:
+    """
+    게시글 수에 맞는 기본 군집 수 (√(N/2), 2~100) 를 반환합니다.
+    """
+    return int(min(100, max(2, round((num_posts / 2) ** 0.5))))
+
+
+def cluster_embeddings(embeddings: np.ndarray, n_clusters: int, seed: int = 0) -> np.ndarray:
+    """
+    임베딩을 mini-batch k-means 로 군집화합니다.
+
+    :param embeddings: (N, 차원) 배열
+    :param n_clusters: 군집 수 (게시글 수보다 크면 게시글 수로 줄임)
+    :param seed: 난수 시드
+    :return: (N,) 군집 번호 배열
+    """
+    from sklearn.cluster import MiniBatchKMeans
+    n_clusters = max(1, min(n_clusters, len(embeddings)))
+    kmeans = MiniBatchKMeans(n_clusters=n_clusters, batch_size=1024, n_init=3, random_state=seed)
+    return kmeans.fit_predict(embeddings)
+
+
+def cluster_keywords(texts: list, labels, top_k: int = TOPIC_KEYWORDS) -> dict:
+    """
+    군집별 텍스트를 하나의 문서로 묶어 TF-IDF 상위 단어를 군집 키워드로 뽑습니다.
+
+    :param texts: 텍스트 목록
+    :param labels: texts 와 같은 순서의 군집 번호
+    :param top_k: 군집별 키워드 수
+    :return: {군집 번호: 키워드 리스트} 딕셔너리
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    clusters = sorted(set(int(c) for c in labels))
+    docs = {c: [] for c in clusters}
+    for text, c in zip(texts, labels):
+        docs[int(c)].append(text)
+    vectorizer = TfidfVectorizer(max_features=50000, sublinear_tf=True)
+    try:
+        matrix = vectorizer.fit_transform([" ".join(docs[c]) for c in clusters])
+    except ValueError:
+        # 모든 문서가 비어 있거나 불용어뿐인 경우
+        return {c: [] for c in clusters}
+    vocab = vectorizer.get_feature_names_out()
+    keywords = {}
+    for row, c in enumerate(clusters):
+        scores = matrix[row].toarray().ravel()
+        top = [i for i in np.argsort(-scores)[:top_k] if scores[i] > 0]
+        keywords[c] = [str(vocab[i]) for i in top]
+    return keywords
+
+
+def discover_topics(contents_path: str = None, reply_path: str = None, out_path: str = None,
+                    clusters_path: str = None, n_clusters: int = None) -> None:
+    """
+    게시글 임베딩을 군집화하여 주제를 찾고 subjects.csv 와 게시글별 군집 CSV 를 저장합니다.
+
+    LLM 주제 추출보다 훨씬 빠르므로 전체 코퍼스에 자주 실행하는 용도입니다.
+
+    :param contents_path: 게시글 CSV 경로 (기본값: resource/contents.csv)
+    :param reply_path: 댓글 CSV 경로 (기본값: resource/reply.csv)
+    :param out_path: 주제 CSV 경로 (기본값: resource/subjects.csv)
+    :param clusters_path: 게시글별 군집 CSV 경로 (기본값: resource/post_clusters.csv)
+    :param n_clusters: 군집 수 (기본값: √(게시글 수 / 2))
+    """
+    base = os.path.dirname(__file__)
+    out_path = out_path or os.path.join(base, "resource/subjects.csv")
+    clusters_path = clusters_path or os.path.join(base, "resource/post_clusters.csv")
+    corpus = load_corpus(base, contents_path, reply_path)
+    if len(corpus) == 0:
+        print("[ERROR] No posts found. Please run crawling first.")
+        return
+
+    post_ids, texts = [], []
+    for post_id, content, replies in corpus.iter_posts():
+        post_ids.append(post_id)
+        texts.append(" ".join([content] + replies))
+
+    start = time.perf_counter()
+    embeddings = registry.get("sentence-encoder").encode(texts)
+    print(f"[INFO] Encoded {len(texts)} posts in {time.perf_counter() - start:.1f}s")
+
+    n_clusters = n_clusters or default_num_clusters(len(texts))
+    labels = cluster_embeddings(embeddings, n_clusters)
+    keywords = cluster_keywords(texts, labels)
+    subjects = {c: ", ".join(words) or f"주제 {c}" for c, words in keywords.items()}
+
+    sizes = Counter(labels.tolist())
+    write_subject_rows(out_path, sorted(((subjects[c], n, []) for c, n in sizes.items()), key=lambda m: (-m[1], m[0])))
+
+    with open(clusters_path, "w", newline='', encoding="utf8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["post_id", "cluster", "subject"])
+        for post_id, c in zip(post_ids, labels.tolist()):
+            writer.writerow([post_id, c, subjects[c]])
+
+    print(f"[INFO] Clustered {len(texts)} posts into {len(subjects)} topics in {time.perf_counter() - start:.1f}s")
+    print(f"[INFO] Topics saved to {out_path}, post clusters saved to {clusters_path}")
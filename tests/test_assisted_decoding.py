@@ -0,0 +1,45 @@
+import unittest
+import torch
+from assisted_decoding import AssistStats, ForwardCounter, assist_kwargs
+
+class TestAssistedDecoding(unittest.TestCase):
+    def test_stats_report(self):
+        """
+        본 모델/초안 모델 forward 횟수로 수락된 후보 수와 수락률을 계산하는지 테스트합니다.
+        """
+        counter = ForwardCounter()
+        counter.counts = [10, 40]
+        stats = AssistStats("draft")
+        stats.add(30, counter, 2.0)
+        report = stats.report()
+        self.assertIn("15.0 tokens/s", report)
+        self.assertIn("3.00 tokens per target forward", report)
+        self.assertIn("20 draft tokens accepted (50.0% acceptance)", report)
+
+    def test_prompt_lookup_acceptance(self):
+        """
+        prompt-lookup 모드는 후보 생성기가 제안한 토큰 수를 세어 수락률을 보고하는지 테스트합니다.
+        """
+        from transformers import LlamaConfig, LlamaForCausalLM
+        torch.manual_seed(0)
+        config = LlamaConfig(vocab_size=64, hidden_size=32, intermediate_size=64, num_hidden_layers=1,
+                             num_attention_heads=2, num_key_value_heads=1)
+        model = LlamaForCausalLM(config).eval()
+        input_ids = torch.tensor([[5, 6, 7, 8, 5, 6, 7, 8, 5, 6, 7]])
+        stats = AssistStats("prompt-lookup")
+        with torch.inference_mode(), ForwardCounter(model) as counter:
+            output = model.generate(input_ids, max_new_tokens=8, do_sample=False, pad_token_id=0,
+                                    **assist_kwargs("prompt-lookup"))
+        stats.add(output.shape[1] - input_ids.shape[1], counter, 1.0)
+        self.assertGreater(counter.proposed, 0)
+        self.assertIn("proposed", stats.report())
+        self.assertIn("acceptance", stats.report())
+
+    def test_assist_kwargs(self):
+        self.assertEqual(assist_kwargs(None), {})
+        self.assertIn("prompt_lookup_num_tokens", assist_kwargs("prompt-lookup"))
+        with self.assertRaises(ValueError):
+            assist_kwargs("unknown")
+
+if __name__ == "__main__":
+    unittest.main()
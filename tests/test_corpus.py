@@ -0,0 +1,38 @@
+import os
+import tempfile
+import unittest
+from corpus import load_corpus
+
+class TestCorpus(unittest.TestCase):
+    def setUp(self):
+        """
+        테스트용 contents.csv / reply.csv 를 생성합니다.
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.tmp.name, "resource"))
+        with open(os.path.join(self.tmp.name, "resource/contents.csv"), "w", encoding="utf8") as f:
+            f.write("id,title,contents,date\n1,t1,첫 글,2025.06.10\n2,t2,,2025.06.11\n3,t3,셋째 글,2025.06.12\n")
+        with open(os.path.join(self.tmp.name, "resource/reply.csv"), "w", encoding="utf8") as f:
+            f.write("id,reply_id,reply_content,reply_date\n3,a,c1,06.12\n1,b,c2,06.10\n3,c,c3,06.12\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_iter_posts_groups_replies(self):
+        """
+        게시글별 댓글 묶음이 reply.csv 순서를 유지하는지 테스트합니다.
+        """
+        corpus = load_corpus(self.tmp.name)
+        posts = list(corpus.iter_posts())
+        self.assertEqual(posts, [(1, "첫 글", ["c2"]), (2, "", []), (3, "셋째 글", ["c1", "c3"])])
+
+    def test_iter_posts_range(self):
+        """
+        행 범위를 지정한 순회를 테스트합니다.
+        """
+        corpus = load_corpus(self.tmp.name)
+        self.assertEqual([p[0] for p in corpus.iter_posts(1, 10)], [2, 3])
+        self.assertEqual(corpus.replies_of(2), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+from crawl_state import CrawlState
+
+class TestCrawlState(unittest.TestCase):
+    def setUp(self):
+        """
+        임시 디렉토리에 크롤링 상태 DB 경로를 준비합니다.
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_file = os.path.join(self.tmp.name, "crawl.db")
+        self.out_dir = os.path.join(self.tmp.name, "out")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_seen_posts_persist_per_board(self):
+        """
+        기록한 게시글 번호가 다시 연 상태에 남고, 갤러리와 결과 디렉토리별로 분리되는지 테스트합니다.
+        """
+        state = CrawlState(self.db_file, "programming", self.out_dir)
+        state.add(["101", 102])
+        state.add(["101"])
+        state.close()
+
+        state = CrawlState(self.db_file, "programming", self.out_dir)
+        self.assertIn("101", state)
+        self.assertIn(102, state)
+        self.assertNotIn("103", state)
+        self.assertEqual(len(state), 2)
+        state.close()
+        self.assertEqual(len(CrawlState(self.db_file, "other", self.out_dir)), 0)
+        self.assertEqual(len(CrawlState(self.db_file, "programming", os.path.join(self.tmp.name, "elsewhere"))), 0)
+
+    def test_cursor_by_window(self):
+        """
+        커서가 갤러리와 기간별로 저장/삭제되는지 테스트합니다.
+        """
+        state = CrawlState(self.db_file, "programming", self.out_dir)
+        self.assertIsNone(state.cursor("2025.06.10", "2025.06.12"))
+        state.save_cursor("2025.06.10", "2025.06.12", 7)
+        state.close()
+
+        state = CrawlState(self.db_file, "programming", self.out_dir)
+        self.assertEqual(state.cursor("2025.06.10", "2025.06.12"), 7)
+        self.assertIsNone(state.cursor("2025.06.10", "2025.06.13"))
+        state.clear_cursor("2025.06.10", "2025.06.12")
+        self.assertIsNone(state.cursor("2025.06.10", "2025.06.12"))
+        state.close()
+
+    def test_import_csv_when_empty(self):
+        """
+        색인이 비어 있고 이 갤러리의 CSV 로 표시된 경우에만 기존 contents.csv 의 게시글 번호를 가져오는지 테스트합니다.
+        """
+        os.makedirs(self.out_dir)
+        with open(os.path.join(self.out_dir, "contents.csv"), "w", encoding="utf8") as f:
+            f.write('id,title,contents,date\n11,t,"여러 줄\n본문",2025.06.10\n12,t,c,2025.06.11\n')
+        state = CrawlState(self.db_file, "programming", self.out_dir)
+        # 출처를 알 수 없는 CSV 는 가져오지 않고, 표시도 하지 않습니다.
+        self.assertEqual(state.import_csv(), 0)
+        state.mark_board()
+        self.assertIsNone(state.csv_board())
+
+        with open(os.path.join(self.out_dir, "board.txt"), "w", encoding="utf8") as f:
+            f.write("programming\n")
+        self.assertEqual(CrawlState(self.db_file, "other", self.out_dir).import_csv(), 0)
+        self.assertEqual(state.import_csv(), 2)
+        self.assertIn("11", state)
+        self.assertEqual(state.import_csv(), 0)
+        state.close()
+
+    def test_mark_board_for_new_output(self):
+        """
+        CSV 가 없는 새 결과 디렉토리에만 갤러리를 표시하고, 다른 갤러리의 표시는 덮어쓰지 않는지 테스트합니다.
+        """
+        state = CrawlState(self.db_file, "programming", self.out_dir)
+        state.mark_board()
+        self.assertEqual(state.csv_board(), "programming")
+        other = CrawlState(self.db_file, "other", self.out_dir)
+        other.mark_board()
+        self.assertEqual(other.csv_board(), "programming")
+        other.close()
+        state.close()
+
+if __name__ == "__main__":
+    unittest.main()
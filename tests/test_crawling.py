@@ -0,0 +1,242 @@
+import os
+import csv
+import asyncio
+import tempfile
+import unittest
+import time
+from unittest import mock
+from crawl_parser import ListRow, Article, RawPage, parse_list_page, parse_article, parse_comment_json, parse_raw
+from crawl_backends import HostRateLimiter, SeleniumBackend
+from crawling import crawl_async, find_first_page
+from crawl_state import CrawlState
+
+RESOURCE_DIR = os.path.join(os.path.dirname(__file__), "..", "src", "resource")
+
+
+class FakeBackend:
+    def __init__(self, pages, fail=("13",), list_fail=()):
+        self.pages = pages
+        self.fail = fail
+        self.list_fail = list_fail
+        self.fetched = []
+        self.listed = []
+        self.closed = False
+
+    async def fetch_list(self, board_id, page):
+        self.listed.append(page)
+        if page in self.list_fail:
+            raise ConnectionError("list page unavailable")
+        return RawPage("parsed", None, None, self.pages[page - 1] if page <= len(self.pages) else [])
+
+    async def fetch_article(self, board_id, row):
+        self.fetched.append(row.gall_id)
+        if row.gall_id in self.fail:
+            raise ValueError("broken")
+        article = Article(f"본문 {row.gall_id}", [("ㅇㅇ", f"댓글 {row.gall_id}", "06.11 10:00:00")])
+        return RawPage("parsed", row.gall_id, None, article)
+
+    async def close(self):
+        self.closed = True
+
+
+class TestCrawling(unittest.TestCase):
+    def test_rate_limiter_spaces_requests_per_host(self):
+        """
+        같은 호스트 요청은 1 / rate 초 간격으로 예약되고, 다른 호스트는 따로 제한되는지 테스트합니다.
+        """
+        now = [100.0]
+        limiter = HostRateLimiter(2, clock=lambda: now[0])
+        self.assertEqual(limiter.reserve("https://a.com/1"), 0.0)
+        self.assertAlmostEqual(limiter.reserve("https://a.com/2"), 0.5)
+        self.assertAlmostEqual(limiter.reserve("https://a.com/3"), 1.0)
+        self.assertEqual(limiter.reserve("https://b.com/1"), 0.0)
+        now[0] = 110.0
+        self.assertEqual(limiter.reserve("https://a.com/4"), 0.0)
+        self.assertEqual(HostRateLimiter(0).reserve("https://a.com/1"), 0.0)
+
+    def test_selenium_restarts_only_dead_driver(self):
+        """
+        Selenium 대기 시간 초과는 드라이버를 유지하고, 세션이 죽은 경우에만 드라이버를 다시 만드는지 테스트합니다.
+        """
+        from selenium.common.exceptions import InvalidSessionIdException, TimeoutException, WebDriverException
+
+        class FakeDriver:
+            def __init__(self, error, alive):
+                self.error = error
+                self.alive = alive
+                self.quit_called = False
+
+            def get(self, url):
+                raise self.error
+
+            @property
+            def current_url(self):
+                if not self.alive:
+                    raise InvalidSessionIdException("invalid session id")
+                return "about:blank"
+
+            def quit(self):
+                self.quit_called = True
+
+        backend = SeleniumBackend(rate=0, timeout=1)
+        slow = FakeDriver(TimeoutException("timed out"), alive=True)
+        backend.driver = slow
+        with self.assertRaises(TimeoutException):
+            backend._get("https://a.com/1", None)
+        self.assertIs(backend.driver, slow)
+        self.assertFalse(slow.quit_called)
+
+        dead = FakeDriver(WebDriverException("connection refused"), alive=False)
+        backend.driver = dead
+        with self.assertRaises(WebDriverException):
+            backend._get("https://a.com/2", None)
+        self.assertIsNone(backend.driver)
+        self.assertTrue(dead.quit_called)
+
+    def test_parse_list_page(self):
+        """
+        저장된 목록 페이지에서 광고/설문/공지를 제외한 게시글 줄을 추출하는지 테스트합니다.
+        """
+        with open(os.path.join(RESOURCE_DIR, "main_page_html.txt"), encoding="utf8") as f:
+            rows = parse_list_page(f.read())
+        self.assertGreater(len(rows), 0)
+        self.assertEqual(rows[0].gall_id, "2864106")
+        self.assertEqual(rows[0].title, "일당백을 구하는 회사")
+        # 시각만 표시된 오늘 글은 title 속성의 날짜를 사용
+        self.assertEqual(rows[0].date, "25.06.13")
+        self.assertTrue(rows[0].href.startswith("/board/view/?id=programming&no=2864106"))
+        self.assertTrue(all(row.gall_id.isdigit() for row in rows))
+
+    def test_parse_article(self):
+        """
+        저장된 게시글 페이지에서 본문과 댓글(작성자, 내용, 작성일)을 추출하는지 테스트합니다.
+        """
+        with open(os.path.join(RESOURCE_DIR, "user_page_html.txt"), encoding="utf8") as f:
+            article = parse_article(f.read(), "2864098")
+        self.assertTrue(article.contents.strip())
+        self.assertIn(("루도그담당(211.184)", "이걸 붙네 까빙", "06.13 10:53:22"), article.replies)
+
+    def test_parse_comment_json(self):
+        """
+        댓글 API 응답에서 시스템 항목을 빼고 태그와 HTML 엔티티를 정리하는지 테스트합니다.
+        """
+        text = ('{"comments": [{"no": "91", "name": "ㅇㅇ", "memo": "<b>안녕</b> &amp; 반가워", "reg_date": "06.13 10:53:22"},'
+                ' {"no": "0", "name": "댓글돌이", "memo": "광고", "reg_date": ""}]}')
+        self.assertEqual(parse_comment_json(text), [("ㅇㅇ", "안녕 & 반가워", "06.13 10:53:22")])
+        self.assertEqual(parse_comment_json(""), [])
+
+    def test_parse_raw_uses_comment_api_response(self):
+        """
+        게시글 HTML 에 댓글이 렌더링되지 않았으면 함께 가져온 댓글 API 응답으로 댓글을 채우는지 테스트합니다.
+        """
+        html = '<html><body><div class="write_div">본문</div><div id="comment_wrap_7"></div></body></html>'
+        text = '{"comments": [{"no": "1", "name": "ㅇㅇ", "memo": "댓글", "reg_date": "06.13 10:00:00"}]}'
+        self.assertEqual(parse_raw(RawPage("article", "7", html, text)),
+                         Article("본문", [("ㅇㅇ", "댓글", "06.13 10:00:00")]))
+        self.assertEqual(parse_raw(RawPage("article", "7", html, None)), Article("본문", []))
+
+    def test_find_first_page(self):
+        """
+        갤로핑 + 이진 탐색이 조건이 처음 거짓인 페이지를 O(log n) 번의 확인으로 찾는지 테스트합니다.
+        """
+        for target in [1, 2, 3, 5, 8, 9, 100, 1000]:
+            probes = []
+
+            async def too_new(page):
+                probes.append(page)
+                return page < target
+
+            self.assertEqual(asyncio.run(find_first_page(too_new)), target)
+            self.assertEqual(len(probes), len(set(probes)))
+            self.assertLessEqual(len(probes), 2 * target.bit_length() + 1)
+
+    def test_crawl_async_seeks_first_page(self):
+        """
+        기간보다 최신인 목록 페이지를 하나씩 넘기지 않고 탐색으로 건너뛰는지 테스트합니다.
+        """
+        # 페이지 p 의 글은 모두 (2025.6.30 - p) 일에 작성됨
+        pages = [[ListRow(str(1000 - p), f"t{p}", f"25.06.{30 - p:02d}", f"/v/{p}")] for p in range(1, 29)]
+        backend = FakeBackend(pages)
+        with tempfile.TemporaryDirectory() as tmp:
+            count = asyncio.run(crawl_async(backend, "programming", time.strptime("2025.6.2", "%Y.%m.%d"),
+                                            time.strptime("2025.6.3", "%Y.%m.%d"), tmp, parse_workers=0))
+        self.assertEqual(count, 2)
+        self.assertEqual(backend.fetched, ["973", "972"])
+        self.assertLess(len(backend.listed), 15)
+        self.assertEqual(len(backend.listed), len(set(backend.listed)))
+
+    def test_crawl_async_resumes_from_state(self):
+        """
+        재실행 시 커서부터 이어서 조회하고, 이미 수집한 글은 요청하지 않으며 실패했던 글만 다시 받는지 테스트합니다.
+        """
+        pages = [
+            [ListRow("15", "t15", "25.06.13", "/v/15"), ListRow("14", "t14", "25.06.12", "/v/14")],
+            [ListRow("13", "t13", "25.06.11", "/v/13"), ListRow("12", "t12", "25.06.11", "/v/12")],
+            [ListRow("11", "t11", "25.06.09", "/v/11")],
+        ]
+        start, end = time.strptime("2025.6.10", "%Y.%m.%d"), time.strptime("2025.6.12", "%Y.%m.%d")
+        with tempfile.TemporaryDirectory() as tmp:
+            state = CrawlState(os.path.join(tmp, "crawl.db"), "programming", tmp)
+            first = FakeBackend(pages)
+            self.assertEqual(asyncio.run(crawl_async(first, "programming", start, end, tmp, parse_workers=0,
+                                                     state=state)), 2)
+            # 실패한 글이 있는 2페이지에서 커서가 멈춤
+            self.assertEqual(state.cursor("2025.06.10", "2025.06.12"), 2)
+
+            second = FakeBackend(pages, fail=())
+            self.assertEqual(asyncio.run(crawl_async(second, "programming", start, end, tmp, parse_workers=0,
+                                                     state=state)), 1)
+            self.assertEqual(second.fetched, ["13"])
+            self.assertNotIn(1, second.listed)
+            self.assertIsNone(state.cursor("2025.06.10", "2025.06.12"))
+            self.assertEqual(sorted(state.seen), [12, 13, 14])
+            state.close()
+
+    def test_crawl_async_stops_at_unreadable_list_page(self):
+        """
+        읽지 못한 목록 페이지는 다시 시도한 뒤 건너뛰지 않고 멈추며, 커서를 그 페이지에 남기는지 테스트합니다.
+        """
+        pages = [
+            [ListRow("15", "t15", "25.06.12", "/v/15")],
+            [ListRow("14", "t14", "25.06.11", "/v/14")],
+            [ListRow("13", "t13", "25.06.11", "/v/13")],
+        ]
+        start, end = time.strptime("2025.6.10", "%Y.%m.%d"), time.strptime("2025.6.12", "%Y.%m.%d")
+        with tempfile.TemporaryDirectory() as tmp, mock.patch("crawling.LIST_RETRY_DELAY", 0):
+            state = CrawlState(os.path.join(tmp, "crawl.db"), "programming", tmp)
+            backend = FakeBackend(pages, fail=(), list_fail=(2,))
+            count = asyncio.run(crawl_async(backend, "programming", start, end, tmp, parse_workers=0, state=state))
+            self.assertEqual(count, 1)
+            self.assertEqual(backend.fetched, ["15"])
+            self.assertNotIn(3, backend.listed)
+            self.assertEqual(backend.listed.count(2), 4)
+            self.assertEqual(state.cursor("2025.06.10", "2025.06.12"), 2)
+            state.close()
+
+    def test_crawl_async_writes_window(self):
+        """
+        기간 내 게시글만 목록 순서대로 기록하고, 기간 이전 페이지에서 멈추며, 실패한 글은 건너뛰는지 테스트합니다.
+        """
+        pages = [
+            [ListRow("15", "t15", "25.06.13", "/v/15"), ListRow("14", "t14", "25.06.12", "/v/14")],
+            [ListRow("13", "t13", "25.06.11", "/v/13"), ListRow("12", "t12", "25.06.11", "/v/12"),
+             ListRow("11", "t11", "25.06.09", "/v/11")],
+            [ListRow("10", "t10", "25.06.08", "/v/10")],
+        ]
+        backend = FakeBackend(pages)
+        with tempfile.TemporaryDirectory() as tmp:
+            count = asyncio.run(crawl_async(backend, "programming", time.strptime("2025.6.10", "%Y.%m.%d"),
+                                            time.strptime("2025.6.12", "%Y.%m.%d"), tmp, parse_workers=0))
+            with open(os.path.join(tmp, "contents.csv"), encoding="utf8") as f:
+                contents = list(csv.reader(f))
+            with open(os.path.join(tmp, "reply.csv"), encoding="utf8") as f:
+                replies = list(csv.reader(f))
+        self.assertEqual(count, 2)
+        self.assertEqual(backend.fetched, ["14", "13", "12"])
+        self.assertTrue(backend.closed)
+        self.assertEqual(contents, [["id", "title", "contents", "date"],
+                                    ["14", "t14", "본문 14", "2025.06.12"], ["12", "t12", "본문 12", "2025.06.11"]])
+        self.assertEqual([r[0] for r in replies[1:]], ["14", "12"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+from emotion_cache import EmotionCache
+
+class TestEmotionCache(unittest.TestCase):
+    def setUp(self):
+        """
+        임시 디렉토리에 캐시를 생성합니다.
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_file = os.path.join(self.tmp.name, "emotions.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_hit_and_miss(self):
+        """
+        저장한 결과를 정규화된 텍스트로 다시 조회할 수 있는지 테스트합니다.
+        """
+        cache = EmotionCache(self.db_file, "model-a", {2: 0.1})
+        cache.put_many([(cache.key("안녕  하세요"), "Happy", [0.0, 0.5, 1.0, 0.0, 0.0])])
+        found = cache.get_many([cache.key(" 안녕 하세요 "), cache.key("다른 글")])
+        self.assertEqual(len(found), 1)
+        label, logits = list(found.values())[0]
+        self.assertEqual(label, "Happy")
+        self.assertEqual(logits, [0.0, 0.5, 1.0, 0.0, 0.0])
+        self.assertEqual((cache.stats()["hits"], cache.stats()["misses"]), (1, 1))
+        cache.close()
+
+    def test_key_depends_on_model_and_bias(self):
+        """
+        모델이나 보정값이 다르면 키가 달라지는지 테스트합니다.
+        """
+        a = EmotionCache(self.db_file, "model-a", {2: 0.1})
+        b = EmotionCache(self.db_file, "model-a", {2: 0.2})
+        c = EmotionCache(self.db_file, "model-b", {2: 0.1})
+        self.assertEqual(len({a.key("글"), b.key("글"), c.key("글")}), 3)
+        for cache in (a, b, c):
+            cache.close()
+
+    def test_eviction(self):
+        """
+        최대 항목 수를 넘으면 오래된 항목이 삭제되는지 테스트합니다.
+        """
+        cache = EmotionCache(self.db_file, "model-a", max_entries=2)
+        for i in range(3):
+            cache.put_many([(cache.key(f"글 {i}"), "Sad", [0.0] * 5)])
+        self.assertEqual(cache.stats()["entries"], 2)
+        self.assertEqual(cache.stats()["evicted"], 1)
+        cache.close()
+
+if __name__ == "__main__":
+    unittest.main()
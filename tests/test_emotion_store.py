@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from emotion_store import (
+    read_emotion_rows, write_emotion_rows, softmax_probs, EmotionProbabilityStore, derive_emotion_rows
+)
+
+LABELS = {0: "Angry", 1: "Fear", 2: "Happy", 3: "Tender", 4: "Sad"}
+
+class TestEmotionStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "emotions.csv")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_write_and_read(self):
+        """
+        emotions.csv 를 쓰고 다시 읽을 수 있는지 테스트합니다.
+        """
+        write_emotion_rows(self.path, {1: ("Happy", []), 2: ("Sad", ["Angry", "Fear"])})
+        self.assertEqual(read_emotion_rows(self.path), {1: ("Happy", []), 2: ("Sad", ["Angry", "Fear"])})
+
+    def test_truncated_tail_is_dropped(self):
+        """
+        잘린 마지막 줄을 무시하고, 읽는 동안 파일을 수정하지 않는지 테스트합니다.
+        """
+        write_emotion_rows(self.path, {1: ("Happy", [])})
+        with open(self.path, "a", encoding="utf8") as f:
+            f.write("2,Sa")
+        size = os.path.getsize(self.path)
+        self.assertEqual(read_emotion_rows(self.path), {1: ("Happy", [])})
+        self.assertEqual(os.path.getsize(self.path), size)
+
+    def test_probability_store(self):
+        """
+        확률 벡터를 나누어 기록한 뒤 합쳐 읽고, 나중 기록이 우선하는지 테스트합니다.
+        """
+        store = EmotionProbabilityStore(os.path.join(self.tmp.name, "probs"))
+        probs = softmax_probs([[0, 0, 5, 0, 0], [5, 0, 0, 0, 0], [0, 0, 0, 0, 5]])
+        self.assertEqual(probs.dtype, np.float16)
+        store.append({1: (probs[0], probs[1:2]), 2: (probs[2], probs[:0])})
+        store.append({1: (probs[0], probs[1:3])})
+        entries = store.load()
+        self.assertEqual(sorted(entries), [1, 2])
+        self.assertEqual(entries[1][1].shape, (2, 5))
+
+        store.compact(entries)
+        self.assertEqual(len(store.parts()), 1)
+        rows = derive_emotion_rows(store.load(), LABELS)
+        self.assertEqual(rows, {1: ("Happy", ["Angry", "Sad"]), 2: ("Sad", [])})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import json
+import unittest
+from json_constraint import (SUBJECTS_JSON_PREFILL, DEAD, DONE, LIST_START, IN_STRING,
+                             advance, build_table)
+
+class TestJsonConstraint(unittest.TestCase):
+    def test_accepts_subjects_json(self):
+        """
+        채워 둔 앞부분 뒤에 올 수 있는 올바른 리스트가 DONE 에 도달하는지 테스트합니다.
+        """
+        for body in ['"파이썬", "취업"]}', ' ]}', '"따옴표 \\" 포함"]\n}']:
+            self.assertEqual(advance(LIST_START, body), DONE)
+            self.assertIn("subjects", json.loads(SUBJECTS_JSON_PREFILL + body))
+
+    def test_rejects_invalid_continuations(self):
+        """
+        스키마를 벗어나는 문자열을 거부하는지 테스트합니다.
+        """
+        self.assertEqual(advance(LIST_START, '파이썬'), DEAD)
+        self.assertEqual(advance(LIST_START, '"a" "b"'), DEAD)
+        self.assertEqual(advance(LIST_START, '"a"]}}'), DEAD)
+        self.assertEqual(advance(LIST_START, '"줄\n바꿈"'), DEAD)
+        self.assertEqual(advance(LIST_START, '"열린 문자열'), IN_STRING)
+
+    def test_build_table(self):
+        """
+        특수 토큰은 막고 EOS 는 DONE 에서만 허용하는지 테스트합니다.
+        """
+        texts = ['"', 'abc', '"]}', '<eos>', '']
+        table = build_table(texts, special_ids=[3], eos_ids=[3], vocab_size=6)
+        self.assertEqual(table[LIST_START][0], IN_STRING)
+        self.assertEqual(table[IN_STRING][1], IN_STRING)
+        self.assertEqual(table[IN_STRING][2], DONE)
+        self.assertEqual(table[LIST_START][3], DEAD)
+        self.assertEqual(table[DONE][3], DONE)
+        self.assertEqual(table[DONE][1], DEAD)
+        self.assertEqual(table[IN_STRING][4], DEAD)
+        self.assertEqual(table[IN_STRING][5], DEAD)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+import torch
+from llm_quantization import model_memory_bytes, peak_rss_bytes, quantize_int8
+
+class TestLlmQuantization(unittest.TestCase):
+    def test_model_memory_counts_quantized_weights(self):
+        """
+        int8 동적 양자화 후 가중치 메모리가 줄어들고, packed 가중치도 계산에 포함되는지 테스트합니다.
+        """
+        model = torch.nn.Sequential(torch.nn.Linear(256, 256), torch.nn.Linear(256, 256))
+        fp32_bytes = model_memory_bytes(model)
+        self.assertEqual(fp32_bytes, 2 * (256 * 256 + 256) * 4)
+        qmodel = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        int8_bytes = model_memory_bytes(qmodel)
+        self.assertGreater(int8_bytes, 2 * 256 * 256)
+        self.assertLess(int8_bytes, fp32_bytes / 3)
+
+    def test_quantize_int8_keeps_embedding_bf16(self):
+        """
+        임베딩을 공유하는 lm_head 를 양자화해도 임베딩은 bf16 으로 남고, 예측이 유지되는지 테스트합니다.
+        """
+        from transformers import LlamaConfig, LlamaForCausalLM
+        torch.manual_seed(0)
+        config = LlamaConfig(vocab_size=256, hidden_size=64, intermediate_size=128, num_hidden_layers=2,
+                             num_attention_heads=4, num_key_value_heads=2, tie_word_embeddings=True)
+        model = LlamaForCausalLM(config).to(torch.bfloat16).eval()
+        ids = torch.randint(0, 256, (2, 8))
+        with torch.inference_mode():
+            reference = model(ids).logits.float()
+            quantize_int8(model)
+            logits = model(ids).logits
+        self.assertEqual(model.get_input_embeddings().weight.dtype, torch.bfloat16)
+        self.assertIsInstance(model.get_output_embeddings(), torch.ao.nn.quantized.dynamic.Linear)
+        self.assertEqual(logits.dtype, torch.float32)
+        self.assertGreater((logits.argmax(-1) == reference.argmax(-1)).float().mean().item(), 0.9)
+
+    def test_peak_rss(self):
+        self.assertGreater(peak_rss_bytes(), 0)
+
+if __name__ == "__main__":
+    unittest.main()
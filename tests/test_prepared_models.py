@@ -0,0 +1,67 @@
+import os
+import json
+import struct
+import tempfile
+import unittest
+from unittest import mock
+import torch
+from prepared_models import read_safetensors_mmap, save_prepared, load_prepared
+
+class TestPreparedModels(unittest.TestCase):
+    def write_safetensors(self, path, tensors):
+        header, chunks, offset = {"__metadata__": {"format": "pt"}}, [], 0
+        names = {torch.float32: "F32", torch.bfloat16: "BF16", torch.int64: "I64"}
+        for key, tensor in tensors.items():
+            data = tensor.contiguous().view(torch.uint8).numpy().tobytes() if tensor.numel() else b""
+            header[key] = {"dtype": names[tensor.dtype], "shape": list(tensor.shape),
+                           "data_offsets": [offset, offset + len(data)]}
+            chunks.append(data)
+            offset += len(data)
+        raw = json.dumps(header).encode()
+        raw += b" " * (-len(raw) % 8)
+        with open(path, "wb") as f:
+            f.write(struct.pack("<Q", len(raw)) + raw + b"".join(chunks))
+
+    def test_read_safetensors_mmap(self):
+        """
+        헤더를 직접 해석해 메모리 맵으로 읽은 텐서가 저장한 값, dtype, 모양과 같은지 테스트합니다.
+        """
+        tensors = {
+            "weight": torch.arange(12, dtype=torch.float32).reshape(3, 4),
+            "half": torch.tensor([1.5, -2.0, 3.25], dtype=torch.bfloat16),
+            "ids": torch.tensor([[7], [9]], dtype=torch.int64),
+            "empty": torch.zeros((0, 4), dtype=torch.float32),
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model.safetensors")
+            self.write_safetensors(path, tensors)
+            loaded = read_safetensors_mmap(path)
+        self.assertEqual(set(loaded), set(tensors))
+        for key, tensor in tensors.items():
+            self.assertEqual(loaded[key].dtype, tensor.dtype)
+            self.assertEqual(loaded[key].shape, tensor.shape)
+            self.assertTrue(torch.equal(loaded[key], tensor))
+
+    def test_prepared_revision_is_checked(self):
+        """
+        준비할 때의 커밋 해시를 기록해 로드한 모델에 되돌려 주고, 리비전/커밋이 다르면 사용하지 않는지 테스트합니다.
+        """
+        from transformers import AutoModelForSequenceClassification, BertConfig, BertForSequenceClassification
+        config = BertConfig(vocab_size=32, hidden_size=16, num_hidden_layers=1, num_attention_heads=2,
+                            intermediate_size=32, num_labels=5)
+        model = BertForSequenceClassification(config).eval()
+        old, new = "a" * 40, "b" * 40
+        model.config._commit_hash = old
+        with tempfile.TemporaryDirectory() as tmp, mock.patch("prepared_models.PREPARED_DIR", tmp):
+            save_prepared("kobert", model, "org/model", "main")
+            with mock.patch("prepared_models.cached_commit_hash", return_value=old):
+                loaded = load_prepared("kobert", AutoModelForSequenceClassification, "org/model", revision="main")
+            self.assertIsNotNone(loaded)
+            self.assertEqual(loaded.config._commit_hash, old)
+            with mock.patch("prepared_models.cached_commit_hash", return_value=new):
+                self.assertIsNone(load_prepared("kobert", AutoModelForSequenceClassification, "org/model", revision="main"))
+            self.assertIsNone(load_prepared("kobert", AutoModelForSequenceClassification, "org/model", revision=new))
+            self.assertIsNotNone(load_prepared("kobert", AutoModelForSequenceClassification, "org/model", revision=None))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from prompt_packer import PromptPacker
+
+class FakeTokenizer:
+    """
+    공백 단위로 토큰화하는 테스트용 토크나이저입니다.
+    """
+    def __call__(self, texts, add_special_tokens=True):
+        return {"input_ids": [[len(w) for w in t.split()] for t in texts]}
+
+    def decode(self, ids, skip_special_tokens=False):
+        return " ".join("x" * i for i in ids)
+
+class TestPromptPacker(unittest.TestCase):
+    def test_fills_budget(self):
+        """
+        예산 안에서 여러 게시글을 한 프롬프트에 채우는지 테스트합니다.
+        """
+        packer = PromptPacker(FakeTokenizer(), 40)
+        posts = [(i, "짧은 글", ["댓글"]) for i in range(6)]
+        batches = packer.pack(posts)
+        self.assertLess(len(batches), len(posts))
+        self.assertEqual([pid for b in batches for pid in b.post_ids], list(range(6)))
+        for batch in batches:
+            self.assertLessEqual(batch.tokens, 40)
+        self.assertEqual(packer.dropped_tokens, 0)
+
+    def test_splits_long_thread(self):
+        """
+        예산을 넘는 스레드를 댓글 경계에서 나누고 댓글을 잃지 않는지 테스트합니다.
+        """
+        packer = PromptPacker(FakeTokenizer(), 30)
+        replies = [f"댓글{i} a b c" for i in range(10)]
+        blocks = packer.post_blocks(7, "본문", replies)
+        self.assertGreater(len(blocks), 1)
+        self.assertIn("이어서", blocks[1][0])
+        text = "".join(b[0] for b in blocks)
+        for reply in replies:
+            self.assertIn(reply, text)
+        self.assertTrue(all(n <= 30 for _, n in blocks))
+        self.assertEqual(packer.split_posts, 1)
+
+    def test_trims_oversized_line(self):
+        """
+        한 줄로 예산을 넘는 본문은 잘라내고 잘린 토큰 수를 기록하는지 테스트합니다.
+        """
+        packer = PromptPacker(FakeTokenizer(), 20)
+        blocks = packer.post_blocks(1, " ".join(["w"] * 50), [])
+        self.assertEqual(len(blocks), 1)
+        self.assertLessEqual(blocks[0][1], 20)
+        self.assertEqual(packer.trimmed, 1)
+        self.assertGreater(packer.dropped_tokens, 0)
+
+if __name__ == "__main__":
+    unittest.main()
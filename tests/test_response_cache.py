@@ -0,0 +1,87 @@
+import os
+import csv
+import time
+import asyncio
+import tempfile
+import unittest
+from response_cache import ResponseCache
+from crawl_backends import BASE, ReplayBackend
+from crawling import crawl_async
+
+LIST_HTML = """<html><body><table><tbody class="listwrap2">
+<tr class="ub-content"><td class="gall_num">공지</td><td class="gall_tit ub-word"><a href="/board/view/?id=p&no=1">공지</a></td>
+<td class="gall_date" title="2020-09-28 17:55:48">20.09.28</td></tr>
+<tr class="ub-content"><td class="gall_num">21</td><td class="gall_tit ub-word"><a href="/board/view/?id=p&no=21">둘째</a></td>
+<td class="gall_date" title="2025-06-11 09:00:00">09:00</td></tr>
+<tr class="ub-content"><td class="gall_num">20</td><td class="gall_tit ub-word"><a href="/board/view/?id=p&no=20">첫째</a></td>
+<td class="gall_date" title="2025-06-09 08:00:00">25.06.09</td></tr>
+</tbody></table></body></html>"""
+
+ARTICLE_HTML = """<html><body><input type="hidden" id="e_s_n_o" name="e_s_n_o" value="abc">
+<div class="write_div">본문 21</div><div id="comment_wrap_21"></div></body></html>"""
+
+COMMENTS_JSON = '{"comments": [{"no": "5", "name": "ㅇㅇ", "memo": "댓글", "reg_date": "06.11 10:00:00"}]}'
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        """
+        임시 디렉토리에 응답 캐시를 생성합니다.
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(os.path.join(self.tmp.name, "http"))
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_content_addressed_history(self):
+        """
+        같은 본문은 압축 파일 하나로 저장되고, 요청별로 받은 시각에 맞는 응답을 돌려주는지 테스트합니다.
+        """
+        first = self.cache.put("https://a/1", None, "<html>v1</html>", fetched=100.0)
+        same = self.cache.put("https://a/2", None, "<html>v1</html>", fetched=100.0)
+        self.cache.put("https://a/1", None, "<html>v2</html>", fetched=200.0)
+        self.assertEqual(first, same)
+        objects = [f for _, _, files in os.walk(self.cache.objects_dir) for f in files]
+        self.assertEqual(len(objects), 2)
+
+        self.assertEqual(self.cache.get("https://a/1"), "<html>v2</html>")
+        self.assertEqual(self.cache.get("https://a/1", as_of=150.0), "<html>v1</html>")
+        self.assertIsNone(self.cache.get("https://a/1", as_of=50.0))
+        self.assertIsNone(self.cache.get("https://a/3"))
+
+    def test_post_data_is_part_of_key(self):
+        """
+        POST form 데이터가 다르면 다른 요청으로 저장되는지 테스트합니다.
+        """
+        self.cache.put("https://a/c", {"no": "1"}, "one")
+        self.cache.put("https://a/c", {"no": "2"}, "two")
+        self.assertEqual(self.cache.get("https://a/c", {"no": "1"}), "one")
+        self.assertEqual(self.cache.get("https://a/c", {"no": "2"}), "two")
+        self.assertIsNone(self.cache.get("https://a/c"))
+
+    def test_replay_crawl_without_network(self):
+        """
+        캐시에 저장된 목록/게시글/댓글 API 응답만으로 수집 결과 CSV 를 다시 만드는지 테스트합니다.
+        """
+        board = "p"
+        self.cache.put(BASE + f"/board/lists/?id={board}&page=1", None, LIST_HTML)
+        self.cache.put(BASE + "/board/view/?id=p&no=21", None, ARTICLE_HTML)
+        self.cache.put(BASE + "/board/comment/", {"id": board, "no": "21", "cmt_id": board, "cmt_no": "21",
+                                                  "e_s_n_o": "abc", "comment_page": "1", "sort": "",
+                                                  "_GALLTYPE_": "G"}, COMMENTS_JSON)
+        out_dir = os.path.join(self.tmp.name, "out")
+        backend = ReplayBackend(self.cache)
+        count = asyncio.run(crawl_async(backend, board, time.strptime("2025.6.10", "%Y.%m.%d"),
+                                        time.strptime("2025.6.12", "%Y.%m.%d"), out_dir, parse_workers=0))
+        with open(os.path.join(out_dir, "contents.csv"), encoding="utf8") as f:
+            contents = list(csv.reader(f))
+        with open(os.path.join(out_dir, "reply.csv"), encoding="utf8") as f:
+            replies = list(csv.reader(f))
+        self.assertEqual(count, 1)
+        self.assertEqual(contents[1:], [["21", "둘째", "본문 21", "2025.06.11"]])
+        self.assertEqual(replies[1:], [["21", "ㅇㅇ", "댓글", "06.11 10:00:00"]])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,23 @@
+import unittest
+import numpy as np
+from scoring import compute_scores
+
+class TestScoring(unittest.TestCase):
+    def test_compute_scores(self):
+        """
+        부정 감정 확률 평균과 Angry 댓글 비율을 테스트합니다.
+        """
+        angry = [1, 0, 0, 0, 0]
+        happy = [0, 0, 1, 0, 0]
+        entries = {
+            1: (np.array(happy), np.array([angry, angry])),
+            2: (np.array(happy), np.zeros((0, 5))),
+        }
+        scores = {pid: rest for pid, *rest in compute_scores(entries)}
+        self.assertEqual(scores[1][0], 2)
+        self.assertAlmostEqual(scores[1][1], 2 / 3)
+        self.assertAlmostEqual(scores[1][2], 1.0)
+        self.assertEqual(scores[2], [0, 0.0, 0.0])
+
+if __name__ == "__main__":
+    unittest.main()
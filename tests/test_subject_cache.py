@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+from subject_cache import SubjectCache
+
+class TestSubjectCache(unittest.TestCase):
+    def setUp(self):
+        """
+        임시 디렉토리에 캐시를 생성합니다.
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_file = os.path.join(self.tmp.name, "subjects.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_resume_after_reopen(self):
+        """
+        저장한 묶음 결과를 다시 연 캐시에서 조회할 수 있는지 테스트합니다.
+        """
+        cache = SubjectCache(self.db_file, "llama", 1, {"temperature": 0.6})
+        cache.put(cache.key("묶음 1"), [1, 2], ["파이썬", "취업"])
+        cache.close()
+
+        cache = SubjectCache(self.db_file, "llama", 1, {"temperature": 0.6})
+        self.assertEqual(cache.get(cache.key("묶음 1")), ["파이썬", "취업"])
+        self.assertIsNone(cache.get(cache.key("묶음 2")))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        cache.close()
+
+    def test_key_depends_on_settings(self):
+        """
+        모델, 프롬프트 버전, 생성 설정이 바뀌면 키가 달라지는지 테스트합니다.
+        """
+        base = SubjectCache(self.db_file, "llama", 1, {"temperature": 0.6})
+        others = [
+            SubjectCache(self.db_file, "other", 1, {"temperature": 0.6}),
+            SubjectCache(self.db_file, "llama", 2, {"temperature": 0.6}),
+            SubjectCache(self.db_file, "llama", 1, {"temperature": 0.7}),
+        ]
+        for other in others:
+            self.assertNotEqual(base.key("묶음"), other.key("묶음"))
+            other.close()
+        base.close()
+
+if __name__ == "__main__":
+    unittest.main()
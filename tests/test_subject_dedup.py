@@ -0,0 +1,46 @@
+import os
+import csv
+import tempfile
+import unittest
+from subject_dedup import normalize_subject, merge_subjects, write_subject_rows
+
+class TestSubjectDedup(unittest.TestCase):
+    def test_normalize_subject(self):
+        """
+        공백, 문장부호, 대소문자 차이를 무시하는지 테스트합니다.
+        """
+        self.assertEqual(normalize_subject("파이썬 질문!"), normalize_subject("파이썬질문"))
+        self.assertEqual(normalize_subject("Python  Question"), "pythonquestion")
+
+    def test_merge_near_duplicates(self):
+        """
+        거의 같은 주제를 합치고 가장 많이 나온 표현을 대표로 쓰는지 테스트합니다.
+        """
+        merged = merge_subjects(["파이썬 질문", "파이썬 질문", "파이썬질문", "취업 고민", "취업고민 상담", "자바 질문"])
+        by_subject = {subject: (count, variants) for subject, count, variants in merged}
+        self.assertEqual(by_subject["파이썬 질문"], (3, ["파이썬 질문", "파이썬질문"]))
+        self.assertEqual(by_subject["취업 고민"][0], 2)
+        self.assertEqual(by_subject["자바 질문"], (1, ["자바 질문"]))
+        self.assertEqual(merged[0][0], "파이썬 질문")
+
+    def test_distinct_subjects_stay_separate(self):
+        merged = merge_subjects(["게임 추천", "부동산 시세", "", "  "])
+        self.assertEqual(sorted(m[0] for m in merged), ["게임 추천", "부동산 시세"])
+
+    def test_non_string_subjects_are_ignored(self):
+        """
+        자유 생성/캐시 결과에 섞인 숫자, 리스트, 딕셔너리, None 주제를 오류 없이 건너뛰는지 테스트합니다.
+        """
+        merged = merge_subjects(["게임 추천", 3, ["게임 추천"], {"a": 1}, None, " 게임 추천 "])
+        self.assertEqual(merged, [("게임 추천", 2, ["게임 추천"])])
+
+    def test_write_subject_rows(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "subjects.csv")
+            write_subject_rows(path, [("파이썬 질문", 3, ["파이썬 질문", "파이썬질문"])])
+            with open(path, encoding="utf8") as f:
+                rows = list(csv.reader(f))
+        self.assertEqual(rows, [["subject", "count", "variants"], ["파이썬 질문", "3", "파이썬질문"]])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import torch
+from prompt_packer import PromptPacker
+from subjects import count_generated_tokens, next_retry_budget, parse_subjects
+
+class FakeTokenizer:
+    """
+    공백 단위로 토큰화하는 테스트용 토크나이저입니다.
+    """
+    def __call__(self, texts, add_special_tokens=True):
+        return {"input_ids": [[len(w) for w in t.split()] for t in texts]}
+
+    def decode(self, ids, skip_special_tokens=False):
+        return " ".join("x" * i for i in ids)
+
+class TestSubjects(unittest.TestCase):
+    def test_count_generated_tokens_stops_at_terminator(self):
+        """
+        먼저 끝난 행의 종료 토큰과 그 뒤 패딩은 생성 토큰 수에 포함하지 않는지 테스트합니다.
+        """
+        eos, eot, pad = 1, 2, 0
+        new_tokens = torch.tensor([
+            [5, 6, 2, 0, 0],
+            [5, 6, 7, 8, 9],
+            [1, 1, 1, 1, 1],
+        ])
+        self.assertEqual(count_generated_tokens(new_tokens, [eos, eot]), 2 + 5 + 0)
+        self.assertEqual(count_generated_tokens(new_tokens, [None, eot]), 2 + 5 + 5)
+
+    def test_retry_budget_keeps_post_frame(self):
+        """
+        작은 예산에서 시작해도 재시도 예산이 게시글 머리말보다 작아지지 않고, 더 줄일 수 없으면 재시도를 멈추는지 테스트합니다.
+        """
+        tokenizer = FakeTokenizer()
+        packer = PromptPacker(tokenizer, 20)
+        floor = packer.min_budget([7])
+        self.assertGreater(floor, 10)
+        budget = next_retry_budget(packer, [7])
+        self.assertEqual(budget, floor)
+        retry = PromptPacker(tokenizer, budget)
+        batches = retry.pack([(7, "아주 긴 본문 " * 10, ["댓글 하나", "댓글 둘"])])
+        self.assertEqual([pid for b in batches for pid in b.post_ids], [7, 7, 7])
+        self.assertIsNone(next_retry_budget(retry, [7]))
+
+    def test_parse_subjects_keeps_strings(self):
+        """
+        JSON 주제 목록에서 문자열이 아닌 항목과 빈 문자열을 버리는지 테스트합니다.
+        """
+        raw = '{"subjects": ["게임 추천", 3, ["중첩"], {"a": 1}, null, " ", " 취업 "]}'
+        self.assertEqual(parse_subjects(raw, 1), ["게임 추천", "취업"])
+        self.assertIsNone(parse_subjects('[1, 2]', 1))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from token_cache import TokenCache
+
+class FakeTokenizer:
+    """
+    공백 단위로 토큰화하는 테스트용 토크나이저입니다.
+    """
+    name_or_path = "fake"
+    model_max_length = 16
+    special_tokens_map = {"cls_token": "[CLS]"}
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_vocab(self):
+        return {"[CLS]": 0}
+
+    def __call__(self, texts, truncation=True):
+        self.calls += len(texts)
+        return {"input_ids": [[0] + [len(w) for w in t.split()] for t in texts]}
+
+class TestTokenCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_roundtrip(self):
+        """
+        저장한 토큰 ID 를 행 단위로 다시 읽을 수 있는지 테스트합니다.
+        """
+        tok = FakeTokenizer()
+        tokens = TokenCache(self.tmp.name, tok).section("posts", ["a bb", "ccc", ""])
+        self.assertEqual(len(tokens), 3)
+        self.assertEqual(tokens[0].tolist(), [0, 1, 2])
+        self.assertEqual(tokens[1].tolist(), [0, 3])
+        self.assertEqual(tokens[2].tolist(), [0])
+        self.assertEqual(tokens.lengths.tolist(), [3, 2, 1])
+
+    def test_only_new_rows_are_tokenized(self):
+        """
+        행이 추가되면 새 행만 토큰화하는지 테스트합니다.
+        """
+        tok = FakeTokenizer()
+        TokenCache(self.tmp.name, tok).section("posts", ["a bb", "ccc"])
+        tokens = TokenCache(self.tmp.name, tok).section("posts", ["a bb", "ccc", "dddd e"])
+        self.assertEqual(tok.calls, 3)
+        self.assertEqual(tokens[2].tolist(), [0, 4, 1])
+
+    def test_changed_row_is_retokenized(self):
+        """
+        중간 행이 바뀌면 그 행부터 다시 토큰화하는지 테스트합니다.
+        """
+        tok = FakeTokenizer()
+        TokenCache(self.tmp.name, tok).section("posts", ["a", "b", "c"])
+        tokens = TokenCache(self.tmp.name, tok).section("posts", ["a", "bbb", "c"])
+        self.assertEqual(tok.calls, 5)
+        self.assertEqual([tokens[i].tolist() for i in range(3)], [[0, 1], [0, 3], [0, 1]])
+
+    def test_truncated_ids_file_is_not_reused(self):
+        """
+        ids 파일이 오프셋보다 짧으면 (기록 중 중단) 파일에 남은 행까지만 재사용하는지 테스트합니다.
+        """
+        tok = FakeTokenizer()
+        cache = TokenCache(self.tmp.name, tok)
+        cache.section("posts", ["a", "bb", "ccc"])
+        with open(cache.prefix("posts") + ".ids.int32", "r+b") as f:
+            f.truncate(3 * 4)
+        tokens = TokenCache(self.tmp.name, tok).section("posts", ["a", "bb", "ccc"])
+        self.assertEqual(tok.calls, 5)
+        self.assertEqual([tokens[i].tolist() for i in range(3)], [[0, 1], [0, 2], [0, 3]])
+        self.assertEqual(os.path.getsize(cache.prefix("posts") + ".ids.int32"), 6 * 4)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+import numpy as np
+from topic_clusters import cluster_embeddings, cluster_keywords, default_num_clusters
+
+class TestTopicClusters(unittest.TestCase):
+    def test_cluster_embeddings(self):
+        """
+        뚜렷하게 떨어진 두 묶음의 임베딩을 서로 다른 군집으로 나누는지 테스트합니다.
+        """
+        rng = np.random.default_rng(0)
+        a = rng.normal(0, 0.01, (10, 4)) + [1, 0, 0, 0]
+        b = rng.normal(0, 0.01, (10, 4)) + [0, 1, 0, 0]
+        labels = cluster_embeddings(np.vstack([a, b]).astype(np.float32), 2)
+        self.assertEqual(len(set(labels[:10])), 1)
+        self.assertEqual(len(set(labels[10:])), 1)
+        self.assertNotEqual(labels[0], labels[10])
+
+    def test_cluster_keywords(self):
+        """
+        군집별로 다른 군집과 구분되는 단어를 키워드로 뽑는지 테스트합니다.
+        """
+        texts = ["파이썬 문법 질문", "파이썬 버전 질문", "취업 면접 후기", "취업 연봉 질문"]
+        keywords = cluster_keywords(texts, [0, 0, 1, 1], top_k=1)
+        self.assertEqual(keywords, {0: ["파이썬"], 1: ["취업"]})
+
+    def test_default_num_clusters(self):
+        self.assertEqual(default_num_clusters(1), 2)
+        self.assertEqual(default_num_clusters(200), 10)
+        self.assertEqual(default_num_clusters(10 ** 6), 100)
+
+if __name__ == "__main__":
+    unittest.main()